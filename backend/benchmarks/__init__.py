@@ -0,0 +1,5 @@
+"""
+Offline performance benchmarks for the ElevateHire backend
+
+Run from the backend directory, e.g. ``python -m benchmarks.bench_skill_matcher``.
+"""
@@ -0,0 +1,116 @@
+"""
+Benchmark the candidate export in its JSON, CSV and NDJSON formats
+
+Usage:
+    python -m benchmarks.bench_candidate_export [--rows 500000] [--formats json csv ndjson]
+
+Fills a throwaway test database with synthetic candidates and calls the
+export view the way a client would, reporting time to first byte, total
+time, output size and the tracemalloc peak of each format. JSON builds the
+whole response in memory; CSV and NDJSON stream from a database iterator,
+so their peak should stay flat as --rows grows.
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from candidates.models import Candidate  # noqa: E402
+from candidates.views import CandidateViewSet  # noqa: E402
+
+from .corpus import SKILLS  # noqa: E402
+
+FIRST_NAMES = ['Jane', 'John', 'Priya', 'Chen', 'Maria', 'Ahmed', 'Olga', 'Kwame', 'Lucia', 'Tom']
+LAST_NAMES = ['Doe', 'Smith', 'Perera', 'Wang', 'Garcia', 'Khan', 'Ivanova', 'Mensah', 'Rossi', 'Brown']
+STATUSES = [choice for choice, _label in Candidate.STATUS_CHOICES]
+
+
+def populate(user, rows: int, seed: int, batch_size: int = 5000):
+    """Bulk insert synthetic candidates, skipping the per-save indexing work"""
+    rng = random.Random(seed)
+    batch = []
+    for i in range(rows):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        batch.append(Candidate(
+            first_name=first, last_name=last, full_name=f"{first} {last}",
+            email=f"{first.lower()}.{last.lower()}{i}@example.com", phone=f"+1555{i:07d}",
+            status=rng.choice(STATUSES), experience_years=rng.randint(0, 25),
+            skills=rng.sample(SKILLS, 5), extraction_confidence=round(rng.random(), 2),
+            extracted_text='', added_by=user,
+        ))
+        if len(batch) >= batch_size:
+            Candidate.objects.bulk_create(batch)
+            batch = []
+    Candidate.objects.bulk_create(batch)
+
+
+def export(user, export_format: str):
+    """Call the export view and consume its body, returning (first byte s, total s, bytes)"""
+    request = APIRequestFactory().get('/api/candidates/export/', {'format': export_format})
+    force_authenticate(request, user=user)
+
+    start = time.perf_counter()
+    # The router passes the action's renderers the same way
+    response = CandidateViewSet.as_view({'get': 'export'}, **CandidateViewSet.export.kwargs)(request)
+    if response.status_code != 200:
+        raise SystemExit(f"{export_format} export failed with status {response.status_code}")
+    if response.streaming:
+        first_byte = None
+        size = 0
+        for piece in response.streaming_content:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(piece)
+    else:
+        response.render()
+        first_byte = time.perf_counter() - start
+        size = len(response.content)
+    return first_byte, time.perf_counter() - start, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--formats', nargs='+', default=['json', 'csv', 'ndjson'])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = get_user_model().objects.create_user(
+            username='benchmark', email='benchmark@example.com', password='benchmark'
+        )
+        start = time.perf_counter()
+        populate(user, args.rows, args.seed)
+        print(f"Inserted {args.rows} candidates in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'format':>8} {'first byte s':>13} {'total s':>9} {'MB':>8} {'peak MB':>9}")
+        for export_format in args.formats:
+            first_byte, total, size = export(user, export_format)
+
+            tracemalloc.start()
+            try:
+                export(user, export_format)
+                _current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            print(f"{export_format:>8} {first_byte:>13.2f} {total:>9.2f} {size / 2**20:>8.1f} {peak / 2**20:>9.1f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark ranking every candidate for a job with the scoring matrix
+
+Usage:
+    python -m benchmarks.bench_candidate_ranking [--rows 500000] [--jobs 20] [--updates 100]
+
+Fills a throwaway test database with synthetic candidates, vectorizes them
+with the rebuild command's code path and loads the MatchingIndex, then
+ranks the candidates for random jobs and reports the median, p95 and worst
+ranking time. Ranking includes reading the job's terms from the database,
+the sparse matrix-vector product and picking the top results. Finally a
+batch of candidates is re-vectorized, as after a reparse, to time how
+quickly the index patches them in without a reload.
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+
+from candidates.models import Candidate  # noqa: E402
+from scoring.engine import SCORING_ENGINE_AVAILABLE, MatchingIndex  # noqa: E402
+from scoring.models import JobRequirement  # noqa: E402
+from scoring.vectors import CandidateVectorService  # noqa: E402
+
+from .corpus import SKILLS, build_cv_lines  # noqa: E402
+
+# Synthetic vocabulary on top of the corpus CV text, drawn with a Zipf-like skew like real CV words
+VOCABULARY = [f'term{i}' for i in range(50000)]
+# Cumulative, so drawing words does not re-sum 50k weights per CV
+VOCABULARY_CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def cv_text(rng: random.Random) -> str:
+    lines = build_cv_lines(rng, 'small', rng.choice(['classic', 'bulleted', 'dense']))
+    return '\n'.join(lines) + '\n' + ' '.join(rng.choices(VOCABULARY, cum_weights=VOCABULARY_CUM_WEIGHTS, k=40))
+
+
+def populate(user, rows: int, seed: int, batch_size: int = 5000):
+    """Bulk insert synthetic candidates, skipping the per-save indexing work"""
+    rng = random.Random(seed)
+    batch = []
+    for i in range(rows):
+        batch.append(Candidate(
+            full_name=f'Candidate {i}', email=f'candidate{i}@example.com', skills=rng.sample(SKILLS, rng.randint(3, 8)),
+            experience_years=rng.randint(0, 25), extracted_text=cv_text(rng), added_by=user,
+        ))
+        if len(batch) >= batch_size:
+            Candidate.objects.bulk_create(batch)
+            batch = []
+    Candidate.objects.bulk_create(batch)
+
+
+def random_job(user, rng: random.Random) -> JobRequirement:
+    skills = rng.sample(SKILLS, 5)
+    return JobRequirement.objects.create(
+        title='Senior Engineer', description=' '.join(rng.choices(VOCABULARY[:5000], k=30)),
+        required_skills=skills[:3], preferred_skills=skills[3:], min_experience_years=rng.randint(0, 10),
+        created_by=user,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--updates', type=int, default=100, help="Candidates re-vectorized for the incremental step")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if not SCORING_ENGINE_AVAILABLE:
+        raise SystemExit("Candidate ranking needs numpy and scipy")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = get_user_model().objects.create_user(
+            username='benchmark', email='benchmark@example.com', password='benchmark'
+        )
+        start = time.perf_counter()
+        populate(user, args.rows, args.seed)
+        print(f"Inserted {args.rows} candidates in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        CandidateVectorService.rebuild()
+        print(f"Vectorized them in {time.perf_counter() - start:.1f}s")
+
+        index = MatchingIndex()
+        start = time.perf_counter()
+        index.refresh()
+        matrix = index.matrix
+        size_mb = (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20
+        print(f"Loaded the index in {time.perf_counter() - start:.1f}s: "
+              f"{matrix.shape[0]} x {matrix.shape[1]}, {matrix.nnz} non-zeros, {size_mb:.0f}MB")
+
+        rng = random.Random(args.seed)
+        jobs = [random_job(user, rng) for _ in range(args.jobs)]
+        # Versions are only read when the check interval allows, as in a serving process
+        with override_settings(SCORING_INDEX_CHECK_SECONDS=3600):
+            timings = []
+            for job in jobs:
+                start = time.perf_counter()
+                index.rank(job, owner_id=user.pk, limit=20)
+                timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"Ranked {args.rows} candidates for {args.jobs} jobs: median {statistics.median(timings):.0f}ms, "
+              f"p95 {p95:.0f}ms, worst {timings[-1]:.0f}ms")
+
+        reparsed = list(Candidate.objects.order_by('?')[:args.updates])
+        for candidate in reparsed:
+            candidate.skills = rng.sample(SKILLS, 4)
+            candidate.extracted_text = cv_text(rng)
+        start = time.perf_counter()
+        CandidateVectorService.refresh(reparsed)
+        revectorized = time.perf_counter() - start
+        index.invalidate()
+        start = time.perf_counter()
+        index.rank(jobs[0], owner_id=user.pk, limit=20)
+        print(f"Re-vectorized {args.updates} candidates in {revectorized * 1000:.0f}ms; the next ranking patched "
+              f"them in and took {(time.perf_counter() - start) * 1000:.0f}ms")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
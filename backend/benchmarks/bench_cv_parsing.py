@@ -0,0 +1,186 @@
+"""
+Time each stage of CVParser.parse_cv over the synthetic corpus
+
+Usage:
+    python -m benchmarks.bench_cv_parsing [--repeat 5] [--output results.json]
+    python -m benchmarks.bench_cv_parsing --compare benchmarks/baseline.json [--tolerance 0.5]
+    python -m benchmarks.bench_cv_parsing --corpus /path/to/cvs
+
+Reports p50/p95 wall time per stage and the tracemalloc peak of a full
+parse_cv call, grouped by format and size. With --compare the run is checked
+against a saved baseline and exits with status 1 on a regression. Baselines
+are only comparable on the machine that recorded them.
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from candidates.cv_parser import CVParser
+
+from .corpus import generate_documents
+
+STAGES = ['extraction', 'contact_info', 'skills', 'sections', 'confidence']
+
+# Differences below this many milliseconds are treated as noise when comparing
+NOISE_FLOOR_MS = 1.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of values, q in [0, 100]"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def time_stages(parser: CVParser, file_path: str, file_content: bytes) -> Dict[str, float]:
+    """Parse once and return wall-clock milliseconds per stage, including 'total'"""
+    timings = parser.parse_cv(file_path, file_content)['parse_timings']
+    return {stage: values['wall_ms'] for stage, values in timings.items()}
+
+
+def peak_memory_kb(parser: CVParser, file_path: str, file_content: bytes) -> float:
+    """Peak traced allocation of one full parse_cv call"""
+    tracemalloc.start()
+    try:
+        parser.parse_cv(file_path, file_content)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def load_documents(corpus_dir: str) -> List[Tuple[str, Dict[str, str], bytes]]:
+    """Read real CVs from a directory, grouped by format only"""
+    documents = []
+    for path in sorted(Path(corpus_dir).iterdir()):
+        if path.suffix.lower() in ('.pdf', '.docx', '.txt'):
+            documents.append((path.name, {'format': path.suffix.lower().lstrip('.'), 'size': 'all'},
+                              path.read_bytes()))
+    return documents
+
+
+def run(documents, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Benchmark every document and summarise per 'format/size' group"""
+    parser = CVParser(hooks=[])
+    samples = defaultdict(lambda: defaultdict(list))
+    peaks = defaultdict(list)
+
+    for filename, attributes, content in documents:
+        group = f"{attributes['format']}/{attributes['size']}"
+
+        # Warm up lazy imports and regex caches before measuring
+        parser.parse_cv(filename, content)
+
+        for _ in range(repeat):
+            for stage, ms in time_stages(parser, filename, content).items():
+                samples[group][stage].append(ms)
+        peaks[group].append(peak_memory_kb(parser, filename, content))
+
+    results = {}
+    for group in sorted(samples):
+        results[group] = {
+            'documents': len(peaks[group]),
+            'stages': {
+                stage: {
+                    'p50_ms': round(percentile(values, 50), 3),
+                    'p95_ms': round(percentile(values, 95), 3),
+                }
+                for stage, values in samples[group].items()
+            },
+            'peak_memory_kb': round(max(peaks[group]), 1),
+        }
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Return a description of every p50 or peak memory regression beyond
+    tolerance. p95 is reported but not compared; with a handful of samples it
+    mostly measures scheduler noise.
+    """
+    regressions = []
+    for group, current in results.items():
+        previous = baseline.get(group)
+        if previous is None:
+            continue
+
+        for stage, stats in current['stages'].items():
+            old = previous['stages'].get(stage, {}).get('p50_ms')
+            new = stats['p50_ms']
+            if old is not None and new - old > NOISE_FLOOR_MS and new > old * (1 + tolerance):
+                regressions.append(f"{group} {stage} p50_ms: {old:.3f} -> {new:.3f}")
+
+        old_peak, new_peak = previous['peak_memory_kb'], current['peak_memory_kb']
+        if new_peak > old_peak * (1 + tolerance):
+            regressions.append(f"{group} peak_memory_kb: {old_peak:.1f} -> {new_peak:.1f}")
+
+    return regressions
+
+
+def print_table(results: Dict[str, Any]):
+    header = f"{'group':<12}" + ''.join(f"{stage:>22}" for stage in STAGES + ['total']) + f"{'peak KB':>10}"
+    print(header)
+    print(f"{'':<12}" + ''.join(f"{'p50 / p95 ms':>22}" for _ in STAGES + ['total']))
+    for group, summary in results.items():
+        row = f"{group:<12}"
+        for stage in STAGES + ['total']:
+            stats = summary['stages'][stage]
+            row += f"{stats['p50_ms']:>12.2f} /{stats['p95_ms']:>8.2f}"
+        print(row + f"{summary['peak_memory_kb']:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--corpus', help="Directory of real CVs instead of the synthetic corpus")
+    parser.add_argument('--per-combination', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON file to check the results against")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="Allowed relative slowdown before a stage counts as a regression")
+    args = parser.parse_args()
+
+    if args.corpus:
+        documents = load_documents(args.corpus)
+    else:
+        documents = generate_documents(args.seed, args.per_combination)
+
+    results = run(documents, args.repeat)
+    print_table(results)
+
+    if args.output:
+        report = {
+            'meta': {
+                'parser_version': CVParser.VERSION,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'seed': args.seed,
+                'per_combination': args.per_combination,
+                'repeat': args.repeat,
+                'corpus': args.corpus or 'synthetic',
+            },
+            'results': results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark streaming DOCX extraction against the python-docx object model
+
+Usage:
+    python -m benchmarks.bench_docx_extraction [--paragraphs 100 1000 10000] [--repeat 5]
+"""
+import argparse
+import io
+import random
+import time
+import tracemalloc
+
+import docx
+
+from candidates.docx_extractor import iter_docx_text
+
+from .corpus import OBJECTS, SKILLS, VERBS
+
+
+def legacy_extract(file_content: bytes) -> str:
+    """The python-docx extraction CVParser used before, body paragraphs only"""
+    document = docx.Document(io.BytesIO(file_content))
+    return '\n'.join(paragraph.text for paragraph in document.paragraphs).strip()
+
+
+def streaming_extract(file_content: bytes) -> str:
+    return '\n'.join(iter_docx_text(file_content)).strip()
+
+
+def build_docx(paragraphs: int, rng: random.Random) -> bytes:
+    """Word-generated CV with a contact header, a skills table and body paragraphs"""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = 'jane.doe@example.com | +1 555 0100'
+    document.add_heading('Jane Doe', level=1)
+
+    table = document.add_table(rows=4, cols=3)
+    for cell in table._cells:
+        cell.text = rng.choice(SKILLS)
+
+    for _ in range(paragraphs):
+        document.add_paragraph(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}.")
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(func, file_content: bytes, repeat: int):
+    """Best-of-N wall time in milliseconds and tracemalloc peak in KB"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(file_content)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(file_content)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--paragraphs', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'paragraphs':>10} {'KB':>7} {'legacy ms':>10} {'stream ms':>10} {'speedup':>8} "
+          f"{'legacy peak KB':>15} {'stream peak KB':>15}")
+
+    for paragraphs in args.paragraphs:
+        file_content = build_docx(paragraphs, random.Random(args.seed))
+
+        # Every body paragraph must come out, in order, among the extra header and table text
+        streamed = iter(streaming_extract(file_content).split('\n'))
+        if not all(line in streamed for line in legacy_extract(file_content).split('\n')):
+            raise SystemExit(f"Streaming extraction lost body text at {paragraphs} paragraphs")
+
+        legacy_ms, legacy_peak = measure(legacy_extract, file_content, args.repeat)
+        stream_ms, stream_peak = measure(streaming_extract, file_content, args.repeat)
+
+        print(f"{paragraphs:>10} {len(file_content) / 1024:>7.0f} {legacy_ms:>10.2f} {stream_ms:>10.2f} "
+              f"{legacy_ms / stream_ms:>7.1f}x {legacy_peak:>15.0f} {stream_peak:>15.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark SkillMatcher against the per-keyword regex loop it replaced
+
+Usage:
+    python -m benchmarks.bench_skill_matcher [--sizes 100 1000 10000] [--repeat 20]
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from candidates.cv_parser import CVParser
+from candidates.skill_matcher import SkillMatcher
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'vo', 'zen', 'dex', 'py', 'js', 'ops', 'net', 'db', 'ql']
+
+
+def legacy_extract_skills(skill_keywords: List[str], text: str) -> List[str]:
+    """The original substring test + per-hit regex loop"""
+    text_lower = text.lower()
+    found_skills = []
+
+    for skill in skill_keywords:
+        if skill.lower() in text_lower:
+            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+            if re.search(pattern, text_lower):
+                found_skills.append(skill.title())
+
+    return list(set(found_skills))
+
+
+def build_taxonomy(size: int, rng: random.Random) -> List[str]:
+    """Real skill keywords padded with deterministic synthetic ones"""
+    keywords = list(CVParser().skill_keywords)[:size]
+    seen = set(keywords)
+
+    while len(keywords) < size:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.2:
+            word += ' ' + ''.join(rng.choice(SYLLABLES) for _ in range(2))
+        if word not in seen:
+            seen.add(word)
+            keywords.append(word)
+
+    return keywords
+
+
+def build_text(keywords: List[str], rng: random.Random, words: int = 1200) -> str:
+    """Synthetic CV body mentioning a sample of the taxonomy"""
+    filler = ['developed', 'managed', 'team', 'project', 'using', 'with', 'and', 'the', 'delivered', 'systems']
+    mentioned = rng.sample(keywords, min(len(keywords), 40))
+    tokens = [rng.choice(filler) for _ in range(words)]
+    for skill in mentioned:
+        tokens.insert(rng.randrange(len(tokens)), skill.title())
+    return ' '.join(tokens)
+
+
+def time_call(func, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'skills':>8} {'compile ms':>11} {'legacy ms':>10} {'matcher ms':>11} {'speedup':>8}")
+
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        keywords = build_taxonomy(size, rng)
+        text = build_text(keywords, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(keywords)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        expected = sorted(legacy_extract_skills(keywords, text))
+        actual = sorted({keyword.title() for keyword in matcher.match(text.lower())})
+        if expected != actual:
+            raise SystemExit(f"Result mismatch at {size} skills: {set(expected) ^ set(actual)}")
+
+        legacy_ms = time_call(lambda: legacy_extract_skills(keywords, text), args.repeat)
+        matcher_ms = time_call(lambda: matcher.match(text.lower()), args.repeat)
+
+        print(f"{size:>8} {compile_ms:>11.2f} {legacy_ms:>10.3f} {matcher_ms:>11.3f} {legacy_ms / matcher_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Deterministic synthetic CV corpus in TXT, DOCX and PDF
+
+Usage:
+    python -m benchmarks.corpus OUTPUT_DIR [--per-combination 3] [--seed 7]
+
+Every (format, size, layout) combination gets ``--per-combination`` files.
+The same seed always produces the same documents, byte for byte.
+"""
+import argparse
+import io
+import random
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+FORMATS = ['txt', 'docx', 'pdf']
+
+# Number of jobs listed per CV; 'large' is roughly eight PDF pages
+SIZES = {
+    'small': 2,
+    'medium': 6,
+    'large': 60,
+}
+
+LAYOUTS = ['classic', 'bulleted', 'dense']
+
+FIRST_NAMES = ['Alice', 'Bongani', 'Chen', 'Daniela', 'Emeka', 'Farah', 'Goran', 'Hiroshi', 'Ines', 'Jamal']
+LAST_NAMES = ['Anders', 'Baptiste', 'Cohen', 'Dlamini', 'Esposito', 'Fernando', 'Gupta', 'Haddad', 'Ivanova']
+TITLES = ['Software Engineer', 'Senior Developer', 'Data Analyst', 'Lead Engineer', 'Project Manager', 'DevOps Specialist']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Enterprises', 'Hooli']
+SKILLS = [
+    'Python', 'Django', 'React', 'PostgreSQL', 'Docker', 'Kubernetes', 'AWS', 'Git', 'Jenkins', 'Java',
+    'TypeScript', 'Redis', 'Terraform', 'Pandas', 'NumPy', 'TensorFlow', 'Jira', 'Figma', 'SQL', 'Flask',
+]
+VERBS = ['Developed', 'Designed', 'Led', 'Implemented', 'Optimized', 'Maintained', 'Improved', 'Managed']
+OBJECTS = ['payment APIs', 'data pipelines', 'a React dashboard', 'CI/CD workflows', 'search indexing',
+           'customer onboarding', 'reporting services', 'infrastructure as code']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Fixed timestamp for zip members so DOCX output is reproducible
+ZIP_DATE_TIME = (2024, 1, 1, 0, 0, 0)
+
+
+def build_cv_lines(rng: random.Random, size: str, layout: str) -> List[str]:
+    """Build the text lines of one synthetic CV"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    bullet = '• ' if layout == 'bulleted' else ('- ' if layout == 'classic' else '')
+    gap = [] if layout == 'dense' else ['']
+
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{first.lower()}{last.lower()} | github.com/{first.lower()}{rng.randint(1, 99)}",
+        *gap,
+        'Summary',
+        f"{rng.choice(TITLES)} with {rng.randint(2, 20)} years of experience building reliable systems. "
+        f"Responsible for design, delivery and support of production services.",
+        *gap,
+        'Experience',
+    ]
+
+    year = 2024
+    for _ in range(SIZES[size]):
+        start_year = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} "
+                     f"({rng.choice(MONTHS)} {start_year} - {rng.choice(MONTHS)} {year})")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"{bullet}{rng.choice(VERBS)} {rng.choice(OBJECTS)} using "
+                         f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)}.")
+        lines.extend(gap)
+        year = start_year
+
+    lines += [
+        'Education',
+        f"B.S. Computer Science, State University, {year - 4} - {year}",
+        *gap,
+        'Skills',
+        ', '.join(rng.sample(SKILLS, rng.randint(5, 12))),
+        *gap,
+        'Certifications',
+        f"AWS Certified Developer {rng.randint(2015, 2023)}",
+        *gap,
+        'Languages',
+        'English',
+        rng.choice(['Spanish', 'French', 'German', 'Mandarin']),
+    ]
+    return lines
+
+
+def render_txt(lines: List[str]) -> bytes:
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def render_docx(lines: List[str]) -> bytes:
+    """Minimal WordprocessingML package, one paragraph per line"""
+    paragraphs = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines
+    )
+    parts = {
+        '[Content_Types].xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ),
+        '_rels/.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/>'
+            '</Relationships>'
+        ),
+        'word/document.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>'
+        ),
+    }
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in parts.items():
+            archive.writestr(zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME), content)
+    return buffer.getvalue()
+
+
+def render_pdf(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """Minimal PDF using the built-in Helvetica font, paginated by line count"""
+    def pdf_string(line: str) -> bytes:
+        text = line.replace('•', '-').encode('latin-1', 'replace')
+        return b'(' + text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+
+    for start in range(0, len(lines), lines_per_page):
+        page_lines = lines[start:start + lines_per_page]
+        stream = b'BT /F1 10 Tf 14 TL 50 800 Td ' + b' '.join(
+            pdf_string(line) + b' Tj T*' for line in page_lines
+        ) + b' ET'
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        page_ids.append(len(objects))
+
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % page_id for page_id in page_ids), len(page_ids))
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+RENDERERS = {
+    'txt': render_txt,
+    'docx': render_docx,
+    'pdf': render_pdf,
+}
+
+
+def generate_documents(seed: int = 7, per_combination: int = 3) -> List[Tuple[str, Dict[str, str], bytes]]:
+    """Return ``(filename, attributes, content)`` for every document in the corpus"""
+    documents = []
+    for file_format in FORMATS:
+        for size in SIZES:
+            for layout in LAYOUTS:
+                for index in range(per_combination):
+                    rng = random.Random(f"{seed}-{size}-{layout}-{index}")
+                    lines = build_cv_lines(rng, size, layout)
+                    filename = f"{size}_{layout}_{index}.{file_format}"
+                    attributes = {'format': file_format, 'size': size, 'layout': layout}
+                    documents.append((filename, attributes, RENDERERS[file_format](lines)))
+    return documents
+
+
+def write_corpus(output_dir: str, seed: int = 7, per_combination: int = 3) -> List[Path]:
+    """Write the corpus to output_dir and return the file paths"""
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for filename, _attributes, content in generate_documents(seed, per_combination):
+        path = output / filename
+        path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('output_dir')
+    parser.add_argument('--per-combination', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    paths = write_corpus(args.output_dir, args.seed, args.per_combination)
+    print(f"Wrote {len(paths)} CVs to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,13 +2,16 @@
 Admin configuration for candidates app
 """
 from django.contrib import admin
-from .models import Candidate, CandidateTag, CandidateActivity
+from .models import (
+    Candidate, CandidateTag, CandidateActivity, CVParseCacheEntry, SkillTaxonomy, CandidateMatch,
+    BulkUploadJob, BulkUploadItem
+)
 
 @admin.register(Candidate)
 class CandidateAdmin(admin.ModelAdmin):
     """Admin interface for Candidate model"""
-    list_display = ['full_name', 'email', 'status', 'created_at']
-    list_filter = ['status', 'created_at']
+    list_display = ['full_name', 'email', 'status', 'parse_status', 'parse_duration_ms', 'created_at']
+    list_filter = ['status', 'parse_status', 'created_at']
     search_fields = ['full_name', 'email', 'phone', 'skills']
     readonly_fields = ['id', 'created_at', 'updated_at']
     
@@ -57,4 +60,43 @@ class CandidateActivityAdmin(admin.ModelAdmin):
         if len(obj.description) > 100:
             return obj.description[:100] + '...'
         return obj.description
-    description_preview.short_description = "Description"
\ No newline at end of file
+    description_preview.short_description = "Description"
+
+@admin.register(CVParseCacheEntry)
+class CVParseCacheEntryAdmin(admin.ModelAdmin):
+    """Admin interface for CVParseCacheEntry model"""
+    list_display = ['content_hash', 'file_type', 'parser_version', 'size_bytes', 'hit_count', 'last_used_at']
+    list_filter = ['parser_version', 'file_type']
+    search_fields = ['content_hash']
+    readonly_fields = ['created_at', 'last_used_at']
+
+@admin.register(SkillTaxonomy)
+class SkillTaxonomyAdmin(admin.ModelAdmin):
+    """Admin interface for SkillTaxonomy model"""
+    list_display = ['name', 'category', 'aliases', 'is_active', 'updated_at']
+    list_filter = ['category', 'is_active']
+    search_fields = ['name']
+    readonly_fields = ['id', 'created_at', 'updated_at']
+
+@admin.register(CandidateMatch)
+class CandidateMatchAdmin(admin.ModelAdmin):
+    """Admin interface for CandidateMatch model"""
+    list_display = ['candidate_a', 'candidate_b', 'score', 'reasons', 'status', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['candidate_a__full_name', 'candidate_b__full_name']
+    raw_id_fields = ['candidate_a', 'candidate_b']
+    readonly_fields = ['created_at', 'updated_at']
+
+class BulkUploadItemInline(admin.TabularInline):
+    """Per-file results shown on a bulk upload job"""
+    model = BulkUploadItem
+    extra = 0
+    raw_id_fields = ['candidate']
+    readonly_fields = ['filename', 'status', 'error', 'extraction_confidence', 'possible_duplicates', 'updated_at']
+
+@admin.register(BulkUploadJob)
+class BulkUploadJobAdmin(admin.ModelAdmin):
+    """Admin interface for BulkUploadJob model"""
+    list_display = ['id', 'created_by', 'total_files', 'created_at']
+    readonly_fields = ['id', 'created_at']
+    inlines = [BulkUploadItemInline]
@@ -9,3 +9,15 @@ class CandidatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'candidates'
     verbose_name = 'Candidate Management'
+    
+    def ready(self):
+        """Point the global CV parser at the skill taxonomy and the extraction sandbox, once per process"""
+        try:
+            from .cv_parser import cv_parser
+        except ImportError:
+            return
+        from .extraction_sandbox import get_extraction_sandbox
+        from .skill_taxonomy import skill_source
+        
+        cv_parser.skill_source = skill_source
+        cv_parser.sandbox = get_extraction_sandbox(cv_parser)
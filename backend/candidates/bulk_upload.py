@@ -0,0 +1,257 @@
+"""
+Bulk CV upload: store many files or a zip archive, then parse each file on a worker
+"""
+import logging
+import os
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.db.models import Count
+from rest_framework.parsers import MultiPartParser
+
+from .duplicate_index import DuplicateIndex
+from .models import (
+    CV_FILE_SIZE_ERROR, MAX_CV_FILE_SIZE, BulkUploadItem, BulkUploadJob, Candidate, CandidateActivity,
+    candidate_cv_upload_path,
+)
+from .services import CandidateParsingService
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.txt'}
+
+
+class DiskMultiPartParser(MultiPartParser):
+    """
+    Multipart parser that writes every uploaded file to a temporary file,
+    however small, so a large batch is never held in memory.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']
+        request._request.upload_handlers = [TemporaryFileUploadHandler(request._request)]
+        return super().parse(stream, media_type, parser_context)
+
+
+class BulkUploadService:
+    """Create a BulkUploadJob from uploaded files and parse its CVs in the background"""
+
+    @staticmethod
+    def max_files() -> int:
+        return getattr(settings, 'CV_BULK_UPLOAD_MAX_FILES', 1000)
+
+    @staticmethod
+    def count_files(uploads: Iterable) -> int:
+        """Number of files in uploads, counting zip archives by their members without extracting them"""
+        total = 0
+        for upload in uploads:
+            if os.path.splitext(upload.name)[1].lower() == '.zip' and zipfile.is_zipfile(upload):
+                with zipfile.ZipFile(upload) as archive:
+                    total += sum(1 for info in archive.infolist() if not info.is_dir())
+            else:
+                total += 1
+        return total
+
+    @classmethod
+    def iter_cv_files(cls, uploads: Iterable) -> Iterator[Tuple[str, Optional[File], str]]:
+        """
+        Yield (filename, file, error) for each CV in uploads, opening zip
+        archives and reading their members one at a time. file is None when
+        the CV is rejected and error says why.
+        """
+        for upload in uploads:
+            if os.path.splitext(upload.name)[1].lower() == '.zip':
+                yield from cls._iter_zip(upload)
+            else:
+                yield (os.path.basename(upload.name), upload, cls._check(upload.name, upload.size))
+
+    @classmethod
+    def _iter_zip(cls, upload) -> Iterator[Tuple[str, Optional[File], str]]:
+        try:
+            archive = zipfile.ZipFile(upload)
+        except zipfile.BadZipFile:
+            yield (upload.name, None, 'Not a valid zip archive')
+            return
+
+        with archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or name.startswith('.') or info.filename.startswith('__MACOSX/'):
+                    continue
+                # file_size also bounds how much ZipExtFile will inflate
+                error = cls._check(name, info.file_size)
+                if error:
+                    yield (name, None, error)
+                    continue
+                with archive.open(info) as member:
+                    yield (name, File(member, name=name), '')
+
+    @staticmethod
+    def _check(name: str, size: int) -> str:
+        if os.path.splitext(name)[1].lower() not in ALLOWED_EXTENSIONS:
+            return f"File type not supported. Allowed types: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
+        if size > MAX_CV_FILE_SIZE:
+            return CV_FILE_SIZE_ERROR
+        return ''
+
+    @classmethod
+    def create_job(cls, uploads: Iterable, user=None) -> BulkUploadJob:
+        """
+        Copy every CV in uploads to storage and create a queued candidate for
+        each, then hand the files to Celery workers once committed. Storage
+        writes stream from the temporary upload files (or are a rename on
+        local storage), so no CV is read into memory here. If the job cannot
+        be created, the CVs already stored are deleted again.
+        """
+        job = BulkUploadJob(created_by=user)
+        items = []
+        candidates = []
+        stored_names = []
+
+        try:
+            for filename, cv_file, error in cls.iter_cv_files(uploads):
+                if error:
+                    items.append(BulkUploadItem(job=job, filename=filename[:255], status='rejected', error=error))
+                    continue
+
+                stored_name = default_storage.save(candidate_cv_upload_path(None, filename), cv_file)
+                stored_names.append(stored_name)
+                candidate = Candidate(
+                    cv_file=stored_name, cv_filename=filename[:255], parse_status='queued', added_by=user
+                )
+                candidate.refresh_match_keys()
+                candidates.append(candidate)
+                items.append(BulkUploadItem(job=job, filename=filename[:255], candidate=candidate))
+
+            with transaction.atomic():
+                job.total_files = len(items)
+                job.save()
+                Candidate.objects.bulk_create(candidates, batch_size=500)
+                CandidateActivity.objects.bulk_create([
+                    CandidateActivity(
+                        candidate=candidate,
+                        activity_type='cv_uploaded',
+                        description=f"Uploaded {candidate.cv_filename} in bulk upload {job.id}",
+                        metadata={'bulk_upload_job': str(job.id)},
+                        user=user
+                    )
+                    for candidate in candidates
+                ], batch_size=500)
+                BulkUploadItem.objects.bulk_create(items, batch_size=500)
+
+                item_ids = [item.pk for item in items if item.status == 'queued']
+                transaction.on_commit(lambda: cls.dispatch(item_ids))
+        except Exception:
+            # Nothing refers to the stored CVs once the rows are rolled back
+            for stored_name in stored_names:
+                default_storage.delete(stored_name)
+            raise
+
+        logger.info(f"Bulk upload {job.id}: {len(candidates)} CVs queued, {len(items) - len(candidates)} rejected")
+        return job
+
+    @classmethod
+    def dispatch(cls, item_ids):
+        """Fan the queued files out to Celery workers, or parse them here without a broker"""
+        from celery import group
+
+        from .tasks import parse_bulk_upload_item
+
+        if not getattr(settings, 'CV_PARSING_ASYNC', True):
+            for item_id in item_ids:
+                cls.process_item(item_id)
+            return
+
+        try:
+            group(parse_bulk_upload_item.s(item_id) for item_id in item_ids).apply_async()
+        except Exception as e:
+            # Parsing a whole batch here would hold the request for minutes; redispatch() retries them
+            BulkUploadItem.objects.filter(pk__in=item_ids, status='queued').update(status='pending')
+            logger.warning(f"Could not queue bulk upload parsing: {e}. Left {len(item_ids)} files pending.")
+
+    @classmethod
+    def redispatch(cls, items) -> int:
+        """Queue the pending files among items again, as after the broker was down, and return how many"""
+        with transaction.atomic():
+            item_ids = list(
+                items.filter(status='pending').select_for_update(skip_locked=True).values_list('pk', flat=True)
+            )
+            BulkUploadItem.objects.filter(pk__in=item_ids).update(status='queued')
+        if item_ids:
+            cls.dispatch(item_ids)
+        return len(item_ids)
+
+    @classmethod
+    def process_item(cls, item_id) -> Optional[BulkUploadItem]:
+        """Parse one uploaded CV and record its confidence and likely duplicates on the item"""
+        try:
+            item = BulkUploadItem.objects.select_related('candidate__added_by').get(pk=item_id)
+        except BulkUploadItem.DoesNotExist:
+            return None
+
+        candidate = item.candidate
+        if candidate is None:
+            item.status, item.error = 'failed', 'Candidate was deleted before its CV could be parsed'
+            item.save(update_fields=['status', 'error', 'updated_at'])
+            return item
+
+        try:
+            CandidateParsingService.parse_candidate(candidate)
+        except Exception as e:
+            # The failure is already recorded on the candidate
+            item.status, item.error = 'failed', str(e)
+        else:
+            item.status = 'failed' if candidate.parse_status == 'failed' else 'parsed'
+            item.error = candidate.parse_error
+            item.extraction_confidence = candidate.extraction_confidence
+            if item.status == 'parsed':
+                item.possible_duplicates = cls._duplicates(candidate)
+
+        item.save(update_fields=['status', 'error', 'extraction_confidence', 'possible_duplicates', 'updated_at'])
+        return item
+
+    @staticmethod
+    def _duplicates(candidate):
+        matches = DuplicateIndex.find_for(candidate, Candidate.objects.filter(added_by=candidate.added_by))
+        names = Candidate.objects.in_bulk([candidate_id for candidate_id, _score in matches])
+        return [
+            {
+                'candidate_id': str(candidate_id),
+                'full_name': names[candidate_id].display_name,
+                'similarity': score,
+            }
+            for candidate_id, score in matches if candidate_id in names
+        ]
+
+    @staticmethod
+    def summary(job: BulkUploadJob) -> Dict[str, Any]:
+        """Job progress and the per-file results recorded so far"""
+        counts = {status: 0 for status, _label in BulkUploadItem.STATUS_CHOICES}
+        counts.update(job.items.order_by().values_list('status').annotate(count=Count('id')))
+
+        results = [
+            {
+                'filename': item['filename'],
+                'status': item['status'],
+                'candidate_id': item['candidate_id'],
+                'extraction_confidence': item['extraction_confidence'],
+                'possible_duplicates': item['possible_duplicates'],
+                'error': item['error'],
+            }
+            for item in job.items.values(
+                'filename', 'status', 'candidate_id', 'extraction_confidence', 'possible_duplicates', 'error'
+            )
+        ]
+        return {
+            'job_id': job.id,
+            'status': 'processing' if counts['queued'] or counts['pending'] else 'completed',
+            'total_files': job.total_files,
+            'counts': counts,
+            'created_at': job.created_at,
+            'results': results,
+        }
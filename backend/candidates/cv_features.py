@@ -0,0 +1,112 @@
+"""
+Text statistics shared by CV confidence scoring and its breakdown
+"""
+import re
+from typing import Dict, Pattern
+
+# Professional vocabulary; the breakdown reports the first six
+PROFESSIONAL_KEYWORDS = [
+    'experience', 'project', 'develop', 'manage', 'lead', 'implement',
+    'design', 'analyze', 'collaborate', 'responsible', 'achieve',
+    'improve', 'optimize', 'create', 'maintain', 'support'
+]
+BREAKDOWN_KEYWORD_COUNT = 6
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+
+LOCATION_PATTERNS = [
+    re.compile(r'\b(city|state|country|address|location)\b', re.IGNORECASE),
+    re.compile(r'\b\d{5}\b', re.IGNORECASE),  # ZIP codes
+    re.compile(r'\b[A-Z]{2}\b', re.IGNORECASE),  # State abbreviations
+]
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+
+POSITION_PATTERNS = [
+    re.compile(r'\b(engineer|developer|manager|analyst|specialist|consultant|director)\b', re.IGNORECASE),
+    re.compile(r'\b(senior|junior|lead|principal|chief)\b', re.IGNORECASE),
+    re.compile(r'\b(software|web|data|system|network|security)\b', re.IGNORECASE),
+]
+
+BULLET_PATTERN = re.compile(r'[•\-\*]\s')
+
+# Dates counted towards the structure score
+STRUCTURE_DATE_PATTERNS = [
+    re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\b', re.IGNORECASE),
+    re.compile(r'\b\d{1,2}/\d{4}\b', re.IGNORECASE),
+    re.compile(r'\b\d{4}\s*-\s*\d{4}\b', re.IGNORECASE),
+    re.compile(r'\b\d{4}\s*-\s*present\b', re.IGNORECASE),
+]
+
+# Dates reported in the breakdown details
+BREAKDOWN_DATE_PATTERNS = [
+    re.compile(r'\b\d{4}\b', re.IGNORECASE),
+    STRUCTURE_DATE_PATTERNS[1],
+    STRUCTURE_DATE_PATTERNS[0],
+]
+
+DEGREE_PATTERNS = [
+    re.compile(r'\b(bachelor|master|phd|doctorate|diploma|certificate)\b', re.IGNORECASE),
+    re.compile(r'\b(b\.?s\.?|m\.?s\.?|b\.?a\.?|m\.?a\.?|ph\.?d\.?)\b', re.IGNORECASE),
+]
+
+
+class CVFeatures:
+    """
+    Character, word, section, date and keyword statistics for a CV text.
+
+    Computed once per text so that calculate_confidence and
+    get_confidence_breakdown never rescan it. Character classes are counted
+    with C-level ``map`` passes and every regex is precompiled and searched
+    at most once.
+    """
+
+    def __init__(self, text: str, section_patterns: Dict[str, Pattern]):
+        self.text_length = len(text)
+
+        # Character classes (alphanumeric and whitespace are disjoint)
+        self.letter_count = sum(map(str.isalpha, text))
+        alnum_count = sum(map(str.isalnum, text))
+        space_count = sum(map(str.isspace, text))
+        self.special_char_count = self.text_length - alnum_count - space_count
+
+        # Words
+        words = text.split()
+        self.word_count = len(words)
+        self.valid_word_count = sum(1 for word in words if len(word) > 1 and word.isalpha())
+        self.unique_word_count = len(set(words))
+
+        self.sentence_count = len(SENTENCE_SPLIT_PATTERN.split(text))
+
+        # Keywords
+        text_lower = text.lower()
+        keywords_found = [keyword in text_lower for keyword in PROFESSIONAL_KEYWORDS]
+        self.professional_keyword_count = sum(keywords_found)
+        self.breakdown_keyword_count = sum(keywords_found[:BREAKDOWN_KEYWORD_COUNT])
+
+        # Personal and professional indicators
+        self.has_location = any(pattern.search(text) for pattern in LOCATION_PATTERNS)
+        self.has_year = YEAR_PATTERN.search(text) is not None
+        self.position_matches = sum(1 for pattern in POSITION_PATTERNS if pattern.search(text))
+
+        # Structure
+        self.sections_found = sum(1 for pattern in section_patterns.values() if pattern.search(text))
+        self.has_bullets = BULLET_PATTERN.search(text) is not None
+        self.structure_date_matches = sum(1 for pattern in STRUCTURE_DATE_PATTERNS if pattern.search(text))
+        self.dates_found = sum(1 for pattern in BREAKDOWN_DATE_PATTERNS if pattern.search(text))
+        self.has_degree = any(pattern.search(text) for pattern in DEGREE_PATTERNS)
+
+    @property
+    def letter_ratio(self) -> float:
+        return self.letter_count / self.text_length if self.text_length else 0.0
+
+    @property
+    def special_char_ratio(self) -> float:
+        return self.special_char_count / self.text_length if self.text_length else 0.0
+
+    @property
+    def word_quality(self) -> float:
+        return self.valid_word_count / self.word_count if self.word_count else 0.0
+
+    @property
+    def uniqueness_ratio(self) -> float:
+        return self.unique_word_count / self.word_count if self.word_count else 0.0
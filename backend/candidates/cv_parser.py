@@ -1,34 +1,100 @@
 """
 CV Parsing utilities for extracting candidate information from uploaded CVs
 """
+import hashlib
 import re
 import io
+import os
 import logging
-from typing import Dict, List, Any, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from pathlib import Path
 
+from .cv_features import CVFeatures
+from .docx_extractor import iter_docx_text
+from .extraction_sandbox import ExtractionError
+from .parse_timing import LoggingParseHook, ParseHook, StageTimer, parse_histograms
+from .skill_matcher import SkillSet
+
 # PDF parsing
 try:
     import PyPDF2
     import pdfplumber
+    from pdfplumber.page import Page as PDFPlumberPage
+    from pdfminer.pdfpage import PDFPage
     PDF_AVAILABLE = True
 except ImportError:
     PDF_AVAILABLE = False
 
-# Word document parsing
-try:
-    import docx
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+def _reraise_memory_error(error: Exception):
+    """
+    Re-raise MemoryError, including one wrapped by pdfplumber, so that
+    running out of memory is never mistaken for an unreadable document.
+    """
+    seen = error
+    for _depth in range(10):  # exception chains may be cyclic
+        if seen is None:
+            return
+        if isinstance(seen, MemoryError):
+            raise MemoryError(str(seen)) from error
+        wrapped = [arg for arg in getattr(seen, 'args', ()) if isinstance(arg, BaseException)]
+        seen = seen.__cause__ or seen.__context__ or (wrapped[0] if wrapped else None)
+
+VALID_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_CLEANUP_PATTERN = re.compile(r'[^\d+]')
+EXPERIENCE_YEARS_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience', re.IGNORECASE),
+    re.compile(r'experience[:\s]*(\d+)\+?\s*years?', re.IGNORECASE),
+    re.compile(r'(\d+)\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry)', re.IGNORECASE),
+]
+
 class CVParser:
     """Parse and extract information from CV files"""
     
-    def __init__(self):
+    # Bump whenever a change alters parse_cv output; cached results are keyed on it
+    VERSION = '1.2'
+    
+    # Weight of each metric in the overall confidence score
+    CONFIDENCE_WEIGHTS = {
+        'text_quality': 0.25,
+        'contact_completeness': 0.20,
+        'personal_info': 0.15,
+        'professional_content': 0.20,
+        'structure_recognition': 0.10,
+        'data_validation': 0.10,
+    }
+    
+    # Skill groups used to reward a diverse skill set
+    SKILL_CATEGORIES = {
+        'programming': ['python', 'javascript', 'java', 'c++', 'c#'],
+        'frameworks': ['react', 'angular', 'django', 'spring'],
+        'databases': ['mysql', 'postgresql', 'mongodb'],
+        'cloud': ['aws', 'azure', 'gcp', 'docker'],
+        'tools': ['git', 'jenkins', 'jira']
+    }
+    
+    # Extraction limits for PDFs
+    MAX_PDF_PAGES = 50
+    MAX_TEXT_CHARS = 100_000
+    # Give up on PDFs whose first pages have no text layer (scans, images)
+    MAX_LEADING_EMPTY_PAGES = 3
+    
+    def __init__(self, max_pdf_pages: Optional[int] = None, max_text_chars: Optional[int] = None,
+                 early_stop_chars: Optional[int] = None, hooks: Optional[Iterable[ParseHook]] = None,
+                 sandbox=None, skill_source=None):
+        self.max_pdf_pages = max_pdf_pages or self.MAX_PDF_PAGES
+        self.max_text_chars = max_text_chars or self.MAX_TEXT_CHARS
+        # When set, stop reading pages once this much text has been gathered
+        self.early_stop_chars = early_stop_chars
+        # Notified with per-stage timings of every parse_cv call
+        self.hooks = list(hooks) if hooks is not None else [LoggingParseHook()]
+        # ExtractionSandbox running PDF/DOCX extraction out of process, if any
+        self.sandbox = sandbox
+        
         self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
         self.phone_pattern = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}')
         self.linkedin_pattern = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
@@ -70,6 +136,30 @@ class CVParser:
             'excel', 'powerbi', 'tableau', 'figma', 'adobe', 'photoshop', 'illustrator',
             'jira', 'confluence', 'slack', 'notion', 'trello'
         ]
+        # Anything with get() -> SkillSet; defaults to the keywords above
+        self.skill_source = skill_source or SkillSet.from_keywords(self.skill_keywords)
+    
+    def __getstate__(self):
+        # Copies sent to worker processes extract in-process and keep the
+        # skills current at pickling time rather than querying for updates
+        state = self.__dict__.copy()
+        state['sandbox'] = None
+        state['skill_source'] = self.skill_set
+        return state
+    
+    @property
+    def skill_set(self) -> SkillSet:
+        return self.skill_source.get()
+    
+    @property
+    def cache_version(self) -> str:
+        """Parser and skill set version that parse results depend on, plus any non-default extraction limits"""
+        version = f"{self.VERSION}+{self.skill_set.version}"
+        limits = (self.max_pdf_pages, self.max_text_chars, self.early_stop_chars)
+        if limits != (self.MAX_PDF_PAGES, self.MAX_TEXT_CHARS, None):
+            # A short digest keeps the version within CVParseCacheEntry.parser_version
+            version += '+' + hashlib.sha1(repr(limits).encode()).hexdigest()[:8]
+        return version
     
     def extract_text_from_pdf(self, file_content: bytes) -> str:
         """Extract text from PDF file"""
@@ -77,52 +167,110 @@ class CVParser:
             logger.warning("PDF parsing not available. Install PyPDF2 and pdfplumber.")
             return ""
         
-        text = ""
+        pages = []
+        total_chars = 0
+        limit = self.max_text_chars
+        if self.early_stop_chars:
+            limit = min(limit, self.early_stop_chars)
+        
+        for page_text in self.iter_pdf_pages(file_content):
+            if total_chars + len(page_text) > self.max_text_chars:
+                page_text = page_text[:self.max_text_chars - total_chars]
+            pages.append(page_text)
+            total_chars += len(page_text) + 1
+            if total_chars >= limit:
+                break
+        
+        return "\n".join(pages).strip()
+    
+    def iter_pdf_pages(self, file_content: bytes) -> Iterator[str]:
+        """
+        Yield the text of each PDF page, up to max_pdf_pages.
+        
+        Pages are created one at a time and their layout objects are released
+        as soon as the text has been read. If pdfplumber fails part way
+        through, PyPDF2 picks up from the page that failed.
+        """
+        if not PDF_AVAILABLE:
+            return
+        
+        pages_read = 0
+        empty_pages = 0
         
         try:
             # Try with pdfplumber first (better for complex layouts)
             with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
+                doctop = 0
+                for pdf_page in PDFPage.create_pages(pdf.doc):
+                    if pages_read >= self.max_pdf_pages:
+                        return
+                    
+                    page = PDFPlumberPage(pdf, pdf_page, page_number=pages_read + 1, initial_doctop=doctop)
+                    doctop += page.height
+                    try:
+                        page_text = page.extract_text() or ""
+                    finally:
+                        page.close()
+                    
+                    pages_read += 1
+                    empty_pages = 0 if page_text.strip() else empty_pages + 1
                     if page_text:
-                        text += page_text + "\n"
+                        yield page_text
+                    elif empty_pages == pages_read == self.MAX_LEADING_EMPTY_PAGES:
+                        logger.info("No text layer in leading PDF pages, stopping extraction")
+                        return
+            return
         except Exception as e:
-            logger.warning(f"pdfplumber failed: {e}. Trying PyPDF2...")
-            
-            try:
-                # Fallback to PyPDF2
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            except Exception as e:
-                logger.error(f"PyPDF2 also failed: {e}")
+            _reraise_memory_error(e)
+            logger.warning(f"pdfplumber failed on page {pages_read + 1}: {e}. Trying PyPDF2...")
         
-        return text.strip()
+        try:
+            # Fallback to PyPDF2 for the remaining pages
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+            for index in range(pages_read, min(len(pdf_reader.pages), self.max_pdf_pages)):
+                page_text = pdf_reader.pages[index].extract_text() or ""
+                if page_text:
+                    yield page_text
+        except Exception as e:
+            _reraise_memory_error(e)
+            logger.error(f"PyPDF2 also failed: {e}")
     
     def extract_text_from_docx(self, file_content: bytes) -> str:
-        """Extract text from DOCX file"""
-        if not DOCX_AVAILABLE:
-            logger.warning("DOCX parsing not available. Install python-docx.")
-            return ""
+        """
+        Extract text from DOCX file, including headers, footers, tables and
+        text boxes, within the same character limits as PDFs
+        """
+        limit = self.max_text_chars
+        if self.early_stop_chars:
+            limit = min(limit, self.early_stop_chars)
         
         try:
-            doc = Document(io.BytesIO(file_content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            paragraphs = []
+            total_chars = 0
+            for paragraph in iter_docx_text(file_content):
+                paragraphs.append(paragraph)
+                total_chars += len(paragraph) + 1
+                if total_chars >= limit:
+                    break
+            return "\n".join(paragraphs)[:self.max_text_chars].strip()
         except Exception as e:
+            _reraise_memory_error(e)
             logger.error(f"Error extracting text from DOCX: {e}")
             return ""
     
     def extract_text_from_file(self, file_path: str, file_content: bytes) -> str:
-        """Extract text from uploaded file based on extension"""
+        """
+        Extract text from uploaded file based on extension.
+        
+        With a sandbox, PDF and DOCX extraction runs in a child process and
+        failures raise ExtractionError.
+        """
         file_extension = Path(file_path).suffix.lower()
         
         if file_extension == '.pdf':
-            return self.extract_text_from_pdf(file_content)
+            return self._extract_binary('pdf', file_content)
         elif file_extension in ['.docx', '.doc']:
-            return self.extract_text_from_docx(file_content)
+            return self._extract_binary('docx', file_content)
         elif file_extension == '.txt':
             try:
                 return file_content.decode('utf-8')
@@ -136,6 +284,19 @@ class CVParser:
             logger.warning(f"Unsupported file type: {file_extension}")
             return ""
     
+    def _extract_binary(self, kind: str, file_content: bytes) -> str:
+        extract = self.extract_text_from_pdf if kind == 'pdf' else self.extract_text_from_docx
+        if self.sandbox is None:
+            return extract(file_content)
+        
+        try:
+            return self.sandbox.extract(kind, file_content)
+        except ExtractionError as e:
+            if e.reason != ExtractionError.UNAVAILABLE:
+                raise
+            logger.warning(f"{e.message}. Extracting in-process.")
+            return extract(file_content)
+    
     def extract_contact_info(self, text: str) -> Dict[str, str]:
         """Extract contact information from text"""
         contact_info = {}
@@ -149,7 +310,7 @@ class CVParser:
         phones = self.phone_pattern.findall(text)
         if phones:
             # Clean up phone number
-            phone = re.sub(r'[^\d+]', '', phones[0])
+            phone = PHONE_CLEANUP_PATTERN.sub('', phones[0])
             if len(phone) >= 7:  # Minimum reasonable phone number length
                 contact_info['phone'] = phones[0]
         
@@ -189,28 +350,33 @@ class CVParser:
     
     def extract_skills(self, text: str) -> List[str]:
         """Extract skills from CV text"""
-        text_lower = text.lower()
         found_skills = []
         
-        for skill in self.skill_keywords:
-            if skill.lower() in text_lower:
-                # Check if it's a whole word match
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.append(skill.title())
+        for match in self.match_skills(text):
+            if match['name'] not in found_skills:
+                found_skills.append(match['name'])
         
-        return list(set(found_skills))  # Remove duplicates
+        return found_skills
+    
+    def match_skills(self, text: str) -> List[Dict[str, Any]]:
+        """Find skills in CV text with occurrence counts and offsets into the lowercased text"""
+        skill_set = self.skill_set
+        matches = skill_set.matcher.match(text.lower())
+        
+        return [
+            {
+                'name': skill_set.names[keyword],
+                'keyword': keyword,
+                'count': match['count'],
+                'offsets': match['offsets'],
+            }
+            for keyword, match in matches.items()
+        ]
     
     def extract_experience_years(self, text: str) -> Optional[int]:
         """Extract years of experience from text"""
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'experience[:\s]*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in EXPERIENCE_YEARS_PATTERNS:
+            matches = pattern.findall(text)
             if matches:
                 try:
                     years = int(matches[0])
@@ -260,27 +426,69 @@ class CVParser:
         return sections
     
     def parse_cv(self, file_path: str, file_content: bytes) -> Dict[str, Any]:
-        """Main method to parse CV and extract all information"""
+        """
+        Main method to parse CV and extract all information.
+        
+        Wall-clock and CPU time of each stage are passed to ``self.hooks`` and
+        returned under 'parse_timings'.
+        """
+        timer = StageTimer(file_path, self.hooks)
+        
         # Extract text
-        text = self.extract_text_from_file(file_path, file_content)
+        try:
+            with timer.stage('extraction'):
+                text = self.extract_text_from_file(file_path, file_content)
+        except ExtractionError as e:
+            logger.warning(f"Extraction of {file_path} failed ({e.reason}): {e.message}")
+            return {
+                'extracted_text': '',
+                'extraction_confidence': 0.0,
+                'error': e.message,
+                'error_reason': e.reason,
+                'parse_timings': timer.finish(),
+            }
         
         if not text:
             return {
                 'extracted_text': '',
                 'extraction_confidence': 0.0,
-                'error': 'Could not extract text from file'
+                'error': 'Could not extract text from file',
+                'parse_timings': timer.finish(),
             }
         
+        return self._parse_extracted_text(text, timer)
+    
+    def parse_text(self, text: str, source: str = '') -> Dict[str, Any]:
+        """
+        Re-run every stage after extraction on already extracted text.
+        
+        Returns the same result as parse_cv without touching the original
+        file; ``source`` only labels the timings passed to the hooks.
+        """
+        return self._parse_extracted_text(text, StageTimer(source, self.hooks))
+    
+    def _parse_extracted_text(self, text: str, timer: StageTimer) -> Dict[str, Any]:
         # Extract information
-        contact_info = self.extract_contact_info(text)
-        name = self.extract_name(text)
-        skills = self.extract_skills(text)
-        experience_years = self.extract_experience_years(text)
-        sections = self.extract_sections(text)
-        
-        # Calculate confidence score and breakdown
-        confidence = self.calculate_confidence(text, contact_info, name, skills)
-        confidence_breakdown = self.get_confidence_breakdown(text, contact_info, name, skills)
+        with timer.stage('contact_info'):
+            contact_info = self.extract_contact_info(text)
+            name = self.extract_name(text)
+        
+        with timer.stage('skills'):
+            skills = self.extract_skills(text)
+            experience_years = self.extract_experience_years(text)
+        
+        with timer.stage('sections'):
+            sections = self.extract_sections(text)
+            education = self.parse_education(sections.get('education', ''))
+            work_experience = self.parse_work_experience(sections.get('experience', ''))
+            certifications = self.parse_certifications(sections.get('certifications', ''))
+            languages = self.parse_languages(sections.get('languages', ''))
+        
+        # Calculate confidence score and breakdown from a single analysis pass
+        with timer.stage('confidence'):
+            features = self.analyze_text(text)
+            confidence_breakdown = self.get_confidence_breakdown(text, contact_info, name, skills, features=features)
+            confidence = confidence_breakdown['overall_confidence']
         
         # Prepare result
         result = {
@@ -295,91 +503,120 @@ class CVParser:
             'skills': skills,
             'experience_years': experience_years,
             'summary': sections.get('summary', '')[:500],  # Limit summary length
-            'education': self.parse_education(sections.get('education', '')),
-            'work_experience': self.parse_work_experience(sections.get('experience', '')),
-            'certifications': self.parse_certifications(sections.get('certifications', '')),
-            'languages': self.parse_languages(sections.get('languages', '')),
+            'education': education,
+            'work_experience': work_experience,
+            'certifications': certifications,
+            'languages': languages,
+            'parse_timings': timer.finish(),
         }
         
         return result
     
-    def calculate_confidence(self, text: str, contact_info: Dict, name: Optional[str], skills: List[str]) -> float:
+    def parse_many(self, paths: Iterable[str], max_workers: Optional[int] = None,
+                   max_pending: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse many CV files in parallel, yielding (path, result) in input order.
+        
+        Files are read and parsed inside a process pool so PDF extraction uses
+        every core. At most ``max_pending`` files are in flight at once, so
+        ``paths`` may be a lazy iterator over a very large directory. Failed
+        files yield a result with an 'error' key instead of raising.
+        """
+        return self._map_in_pool(_parse_path, ((path, path) for path in paths), max_workers, max_pending)
+    
+    def parse_texts(self, items: Iterable[Tuple[Any, str]], max_workers: Optional[int] = None,
+                    max_pending: Optional[int] = None) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        Run parse_text over (key, text) pairs in parallel, yielding (key, result)
+        in input order. Only the text is sent to the worker processes, so keys
+        may be any object, e.g. a model instance.
+        """
+        return self._map_in_pool(_parse_text, items, max_workers, max_pending)
+    
+    def _map_in_pool(self, func, items: Iterable[Tuple[Any, Any]], max_workers: Optional[int],
+                     max_pending: Optional[int]) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """Yield (key, func(arg)) for (key, arg) items, computed in a bounded process pool"""
+        max_workers = max_workers or os.cpu_count() or 1
+        max_pending = max_pending or max_workers * 4
+        
+        if max_workers == 1:
+            _init_parse_worker(self)
+            for key, arg in items:
+                yield key, func(arg)
+            return
+        
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_parse_worker,
+                                 initargs=(self,)) as executor:
+            pending = deque()
+            for key, arg in items:
+                pending.append((key, executor.submit(func, arg)))
+                if len(pending) >= max_pending:
+                    done_key, future = pending.popleft()
+                    yield done_key, future.result()
+            
+            while pending:
+                done_key, future = pending.popleft()
+                yield done_key, future.result()
+    
+    def analyze_text(self, text: str) -> CVFeatures:
+        """Compute the text statistics used for confidence scoring"""
+        return CVFeatures(text, self.section_patterns)
+    
+    def calculate_confidence(self, text: str, contact_info: Dict, name: Optional[str], skills: List[str],
+                             features: Optional[CVFeatures] = None) -> float:
         """Calculate comprehensive confidence score for extraction quality"""
-        confidence_metrics = {
-            'text_quality': 0.0,
-            'contact_completeness': 0.0,
-            'personal_info': 0.0,
-            'professional_content': 0.0,
-            'structure_recognition': 0.0,
-            'data_validation': 0.0
+        features = features or self.analyze_text(text)
+        scores = self._score_metrics(features, contact_info, name, skills)
+        return self._combine_scores(scores, features, contact_info)
+    
+    def _score_metrics(self, features: CVFeatures, contact_info: Dict, name: Optional[str],
+                       skills: List[str]) -> Dict[str, float]:
+        """Score each confidence metric on a 0-1 scale"""
+        return {
+            'text_quality': self._assess_text_quality(features),
+            'contact_completeness': self._assess_contact_completeness(contact_info),
+            'personal_info': self._assess_personal_info(name, features),
+            'professional_content': self._assess_professional_content(skills, features),
+            'structure_recognition': self._assess_document_structure(features),
+            'data_validation': self._assess_data_validation(contact_info),
         }
-        
-        # 1. Text Quality Assessment (25% weight)
-        text_quality_score = self._assess_text_quality(text)
-        confidence_metrics['text_quality'] = text_quality_score * 0.25
-        
-        # 2. Contact Information Completeness (20% weight)
-        contact_score = self._assess_contact_completeness(contact_info)
-        confidence_metrics['contact_completeness'] = contact_score * 0.20
-        
-        # 3. Personal Information Extraction (15% weight)
-        personal_score = self._assess_personal_info(name, text)
-        confidence_metrics['personal_info'] = personal_score * 0.15
-        
-        # 4. Professional Content Detection (20% weight)
-        professional_score = self._assess_professional_content(skills, text)
-        confidence_metrics['professional_content'] = professional_score * 0.20
-        
-        # 5. Document Structure Recognition (10% weight)
-        structure_score = self._assess_document_structure(text)
-        confidence_metrics['structure_recognition'] = structure_score * 0.10
-        
-        # 6. Data Validation (10% weight)
-        validation_score = self._assess_data_validation(contact_info, text)
-        confidence_metrics['data_validation'] = validation_score * 0.10
-        
-        # Calculate total confidence
-        total_confidence = sum(confidence_metrics.values())
+    
+    def _combine_scores(self, scores: Dict[str, float], features: CVFeatures, contact_info: Dict) -> float:
+        """Weight metric scores into the overall confidence"""
+        total_confidence = sum(scores[metric] * weight for metric, weight in self.CONFIDENCE_WEIGHTS.items())
         
         # Apply penalties for common extraction issues
-        total_confidence = self._apply_extraction_penalties(total_confidence, text, contact_info)
+        total_confidence = self._apply_extraction_penalties(total_confidence, features, contact_info)
         
         return min(1.0, max(0.0, total_confidence))
     
-    def _assess_text_quality(self, text: str) -> float:
+    def _assess_text_quality(self, features: CVFeatures) -> float:
         """Assess the quality of extracted text"""
-        if not text:
+        if not features.text_length:
             return 0.0
         
         score = 0.0
         
         # Length assessment
-        if len(text) > 500:
+        if features.text_length > 500:
             score += 0.3
-        elif len(text) > 200:
+        elif features.text_length > 200:
             score += 0.2
-        elif len(text) > 50:
+        elif features.text_length > 50:
             score += 0.1
         
         # Character quality (proper text vs garbage)
-        total_chars = len(text)
-        if total_chars > 0:
-            letter_chars = sum(1 for c in text if c.isalpha())
-            letter_ratio = letter_chars / total_chars
-            
-            if letter_ratio > 0.6:
-                score += 0.3
-            elif letter_ratio > 0.4:
-                score += 0.2
-            elif letter_ratio > 0.2:
-                score += 0.1
+        letter_ratio = features.letter_ratio
+        if letter_ratio > 0.6:
+            score += 0.3
+        elif letter_ratio > 0.4:
+            score += 0.2
+        elif letter_ratio > 0.2:
+            score += 0.1
         
         # Word formation quality
-        words = text.split()
-        if words:
-            valid_words = sum(1 for word in words if len(word) > 1 and word.isalpha())
-            word_quality = valid_words / len(words)
-            
+        if features.word_count:
+            word_quality = features.word_quality
             if word_quality > 0.7:
                 score += 0.2
             elif word_quality > 0.5:
@@ -388,10 +625,9 @@ class CVParser:
                 score += 0.1
         
         # Sentence structure
-        sentences = re.split(r'[.!?]+', text)
-        if len(sentences) > 3:
+        if features.sentence_count > 3:
             score += 0.2
-        elif len(sentences) > 1:
+        elif features.sentence_count > 1:
             score += 0.1
         
         return min(1.0, score)
@@ -425,7 +661,7 @@ class CVParser:
         
         return min(1.0, score)
     
-    def _assess_personal_info(self, name: Optional[str], text: str) -> float:
+    def _assess_personal_info(self, name: Optional[str], features: CVFeatures) -> float:
         """Assess personal information extraction"""
         score = 0.0
         
@@ -442,25 +678,16 @@ class CVParser:
                 score += 0.2
         
         # Location indicators
-        location_patterns = [
-            r'\b(city|state|country|address|location)\b',
-            r'\b\d{5}\b',  # ZIP codes
-            r'\b[A-Z]{2}\b',  # State abbreviations
-        ]
-        
-        for pattern in location_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += 0.1
-                break
+        if features.has_location:
+            score += 0.1
         
         # Age or graduation year indicators
-        year_pattern = r'\b(19|20)\d{2}\b'
-        if re.search(year_pattern, text):
+        if features.has_year:
             score += 0.1
         
         return min(1.0, score)
     
-    def _assess_professional_content(self, skills: List[str], text: str) -> float:
+    def _assess_professional_content(self, skills: List[str], features: CVFeatures) -> float:
         """Assess professional content extraction"""
         score = 0.0
         
@@ -475,18 +702,11 @@ class CVParser:
                 score += 0.1
             
             # Quality assessment - check for diverse skill categories
-            skill_categories = {
-                'programming': ['python', 'javascript', 'java', 'c++', 'c#'],
-                'frameworks': ['react', 'angular', 'django', 'spring'],
-                'databases': ['mysql', 'postgresql', 'mongodb'],
-                'cloud': ['aws', 'azure', 'gcp', 'docker'],
-                'tools': ['git', 'jenkins', 'jira']
-            }
-            
-            categories_found = 0
-            for category, category_skills in skill_categories.items():
-                if any(skill.lower() in [s.lower() for s in skills] for skill in category_skills):
-                    categories_found += 1
+            skills_lower = {s.lower() for s in skills}
+            categories_found = sum(
+                1 for category_skills in self.SKILL_CATEGORIES.values()
+                if any(skill in skills_lower for skill in category_skills)
+            )
             
             if categories_found >= 3:
                 score += 0.2
@@ -494,15 +714,7 @@ class CVParser:
                 score += 0.1
         
         # Professional keywords
-        professional_keywords = [
-            'experience', 'project', 'develop', 'manage', 'lead', 'implement',
-            'design', 'analyze', 'collaborate', 'responsible', 'achieve',
-            'improve', 'optimize', 'create', 'maintain', 'support'
-        ]
-        
-        keyword_count = sum(1 for keyword in professional_keywords 
-                          if keyword in text.lower())
-        
+        keyword_count = features.professional_keyword_count
         if keyword_count >= 8:
             score += 0.3
         elif keyword_count >= 5:
@@ -511,34 +723,19 @@ class CVParser:
             score += 0.1
         
         # Company or position indicators
-        position_patterns = [
-            r'\b(engineer|developer|manager|analyst|specialist|consultant|director)\b',
-            r'\b(senior|junior|lead|principal|chief)\b',
-            r'\b(software|web|data|system|network|security)\b'
-        ]
-        
-        position_matches = 0
-        for pattern in position_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                position_matches += 1
-        
-        if position_matches >= 3:
+        if features.position_matches >= 3:
             score += 0.2
-        elif position_matches >= 1:
+        elif features.position_matches >= 1:
             score += 0.1
         
         return min(1.0, score)
     
-    def _assess_document_structure(self, text: str) -> float:
+    def _assess_document_structure(self, features: CVFeatures) -> float:
         """Assess how well document structure was recognized"""
         score = 0.0
         
         # Section headers detected
-        sections_found = 0
-        for section_name, pattern in self.section_patterns.items():
-            if pattern.search(text):
-                sections_found += 1
-        
+        sections_found = features.sections_found
         if sections_found >= 4:
             score += 0.4
         elif sections_found >= 3:
@@ -549,41 +746,22 @@ class CVParser:
             score += 0.1
         
         # Bullet points or lists
-        if re.search(r'[•\-\*]\s', text):
+        if features.has_bullets:
             score += 0.2
         
         # Date patterns (education/experience dates)
-        date_patterns = [
-            r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\b',
-            r'\b\d{1,2}/\d{4}\b',
-            r'\b\d{4}\s*-\s*\d{4}\b',
-            r'\b\d{4}\s*-\s*present\b'
-        ]
-        
-        date_matches = 0
-        for pattern in date_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                date_matches += 1
-        
-        if date_matches >= 2:
+        if features.structure_date_matches >= 2:
             score += 0.3
-        elif date_matches >= 1:
+        elif features.structure_date_matches >= 1:
             score += 0.2
         
         # Academic degrees
-        degree_patterns = [
-            r'\b(bachelor|master|phd|doctorate|diploma|certificate)\b',
-            r'\b(b\.?s\.?|m\.?s\.?|b\.?a\.?|m\.?a\.?|ph\.?d\.?)\b'
-        ]
-        
-        for pattern in degree_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                score += 0.1
-                break
+        if features.has_degree:
+            score += 0.1
         
         return min(1.0, score)
     
-    def _assess_data_validation(self, contact_info: Dict, text: str) -> float:
+    def _assess_data_validation(self, contact_info: Dict) -> float:
         """Assess data validation and consistency"""
         score = 0.0
         
@@ -608,12 +786,12 @@ class CVParser:
         
         return min(1.0, score)
     
-    def _apply_extraction_penalties(self, confidence: float, text: str, contact_info: Dict) -> float:
+    def _apply_extraction_penalties(self, confidence: float, features: CVFeatures, contact_info: Dict) -> float:
         """Apply penalties for common extraction issues"""
         penalties = 0.0
         
         # Penalty for very short text (likely extraction failure)
-        if len(text) < 100:
+        if features.text_length < 100:
             penalties += 0.3
         
         # Penalty for no contact information
@@ -621,30 +799,23 @@ class CVParser:
             penalties += 0.2
         
         # Penalty for garbage text (too many special characters)
-        if text:
-            special_char_ratio = sum(1 for c in text if not c.isalnum() and not c.isspace()) / len(text)
-            if special_char_ratio > 0.3:
-                penalties += 0.2
+        if features.special_char_ratio > 0.3:
+            penalties += 0.2
         
         # Penalty for repetitive content
-        words = text.split()
-        if len(words) > 10:
-            unique_words = set(words)
-            uniqueness_ratio = len(unique_words) / len(words)
-            if uniqueness_ratio < 0.3:
-                penalties += 0.15
+        if features.word_count > 10 and features.uniqueness_ratio < 0.3:
+            penalties += 0.15
         
         return confidence - penalties
     
     def _is_valid_email(self, email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return VALID_EMAIL_PATTERN.match(email) is not None
     
     def _is_valid_phone(self, phone: str) -> bool:
         """Validate phone number format"""
         # Remove all non-digit characters except +
-        clean_phone = re.sub(r'[^\d+]', '', phone)
+        clean_phone = PHONE_CLEANUP_PATTERN.sub('', phone)
         
         # Check if it's a reasonable phone number
         if clean_phone.startswith('+'):
@@ -652,81 +823,59 @@ class CVParser:
         else:
             return len(clean_phone) >= 7 and len(clean_phone) <= 15
     
-    def get_confidence_breakdown(self, text: str, contact_info: Dict, name: Optional[str], skills: List[str]) -> Dict[str, Any]:
+    def get_confidence_breakdown(self, text: str, contact_info: Dict, name: Optional[str], skills: List[str],
+                                 features: Optional[CVFeatures] = None) -> Dict[str, Any]:
         """Get detailed confidence breakdown for analysis"""
+        features = features or self.analyze_text(text)
+        scores = self._score_metrics(features, contact_info, name, skills)
+        
+        details = {
+            'text_quality': {
+                'text_length': features.text_length,
+                'character_quality': features.letter_ratio,
+                'word_count': features.word_count
+            },
+            'contact_completeness': {
+                'email_found': bool(contact_info.get('email')),
+                'phone_found': bool(contact_info.get('phone')),
+                'linkedin_found': bool(contact_info.get('linkedin_url')),
+                'github_found': bool(contact_info.get('github_url'))
+            },
+            'personal_info': {
+                'name_extracted': bool(name),
+                'name_quality': self._assess_name_quality(name) if name else 0
+            },
+            'professional_content': {
+                'skills_count': len(skills),
+                'professional_keywords': features.breakdown_keyword_count
+            },
+            'structure_recognition': {
+                'sections_found': features.sections_found,
+                'dates_found': features.dates_found
+            },
+            'data_validation': {
+                'email_valid': self._is_valid_email(contact_info.get('email', '')),
+                'phone_valid': self._is_valid_phone(contact_info.get('phone', ''))
+            }
+        }
+        
         breakdown = {
-            'overall_confidence': self.calculate_confidence(text, contact_info, name, skills),
+            'overall_confidence': self._combine_scores(scores, features, contact_info),
             'metrics': {
-                'text_quality': {
-                    'score': self._assess_text_quality(text),
-                    'weight': 0.25,
-                    'weighted_score': self._assess_text_quality(text) * 0.25,
-                    'details': {
-                        'text_length': len(text),
-                        'character_quality': self._get_character_quality(text),
-                        'word_count': len(text.split()) if text else 0
-                    }
-                },
-                'contact_completeness': {
-                    'score': self._assess_contact_completeness(contact_info),
-                    'weight': 0.20,
-                    'weighted_score': self._assess_contact_completeness(contact_info) * 0.20,
-                    'details': {
-                        'email_found': bool(contact_info.get('email')),
-                        'phone_found': bool(contact_info.get('phone')),
-                        'linkedin_found': bool(contact_info.get('linkedin_url')),
-                        'github_found': bool(contact_info.get('github_url'))
-                    }
-                },
-                'personal_info': {
-                    'score': self._assess_personal_info(name, text),
-                    'weight': 0.15,
-                    'weighted_score': self._assess_personal_info(name, text) * 0.15,
-                    'details': {
-                        'name_extracted': bool(name),
-                        'name_quality': self._assess_name_quality(name) if name else 0
-                    }
-                },
-                'professional_content': {
-                    'score': self._assess_professional_content(skills, text),
-                    'weight': 0.20,
-                    'weighted_score': self._assess_professional_content(skills, text) * 0.20,
-                    'details': {
-                        'skills_count': len(skills),
-                        'professional_keywords': self._count_professional_keywords(text)
-                    }
-                },
-                'structure_recognition': {
-                    'score': self._assess_document_structure(text),
-                    'weight': 0.10,
-                    'weighted_score': self._assess_document_structure(text) * 0.10,
-                    'details': {
-                        'sections_found': self._count_sections_found(text),
-                        'dates_found': self._count_dates_found(text)
-                    }
-                },
-                'data_validation': {
-                    'score': self._assess_data_validation(contact_info, text),
-                    'weight': 0.10,
-                    'weighted_score': self._assess_data_validation(contact_info, text) * 0.10,
-                    'details': {
-                        'email_valid': self._is_valid_email(contact_info.get('email', '')),
-                        'phone_valid': self._is_valid_phone(contact_info.get('phone', ''))
-                    }
+                metric: {
+                    'score': scores[metric],
+                    'weight': weight,
+                    'weighted_score': scores[metric] * weight,
+                    'details': details[metric]
                 }
+                for metric, weight in self.CONFIDENCE_WEIGHTS.items()
             },
-            'penalties_applied': self._get_penalties_breakdown(text, contact_info),
-            'recommendations': self._get_improvement_recommendations(text, contact_info, name, skills)
+            'penalties_applied': self._get_penalties_breakdown(features, contact_info),
+            'recommendations': self._get_improvement_recommendations(features, contact_info, name, skills)
         }
         
         return breakdown
     
-    def _get_character_quality(self, text: str) -> float:
-        """Get character quality ratio"""
-        if not text:
-            return 0.0
-        return sum(1 for c in text if c.isalpha()) / len(text)
-    
     def _assess_name_quality(self, name: str) -> float:
         """Assess quality of extracted name"""
         if not name:
@@ -740,42 +889,27 @@ class CVParser:
         else:
             return 0.3
     
-    def _count_professional_keywords(self, text: str) -> int:
-        """Count professional keywords in text"""
-        keywords = ['experience', 'project', 'develop', 'manage', 'lead', 'implement']
-        return sum(1 for keyword in keywords if keyword in text.lower())
-    
-    def _count_sections_found(self, text: str) -> int:
-        """Count sections found in text"""
-        return sum(1 for pattern in self.section_patterns.values() if pattern.search(text))
-    
-    def _count_dates_found(self, text: str) -> int:
-        """Count date patterns found in text"""
-        patterns = [r'\b\d{4}\b', r'\b\d{1,2}/\d{4}\b', r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\b']
-        return sum(1 for pattern in patterns if re.search(pattern, text, re.IGNORECASE))
-    
-    def _get_penalties_breakdown(self, text: str, contact_info: Dict) -> Dict[str, float]:
+    def _get_penalties_breakdown(self, features: CVFeatures, contact_info: Dict) -> Dict[str, float]:
         """Get breakdown of penalties applied"""
         penalties = {}
         
-        if len(text) < 100:
+        if features.text_length < 100:
             penalties['short_text'] = 0.3
         
         if not contact_info.get('email') and not contact_info.get('phone'):
             penalties['no_contact_info'] = 0.2
         
-        if text:
-            special_char_ratio = sum(1 for c in text if not c.isalnum() and not c.isspace()) / len(text)
-            if special_char_ratio > 0.3:
-                penalties['high_special_chars'] = 0.2
+        if features.special_char_ratio > 0.3:
+            penalties['high_special_chars'] = 0.2
         
         return penalties
     
-    def _get_improvement_recommendations(self, text: str, contact_info: Dict, name: Optional[str], skills: List[str]) -> List[str]:
+    def _get_improvement_recommendations(self, features: CVFeatures, contact_info: Dict, name: Optional[str],
+                                         skills: List[str]) -> List[str]:
         """Get recommendations for improving extraction"""
         recommendations = []
         
-        if len(text) < 200:
+        if features.text_length < 200:
             recommendations.append("CV text appears too short - consider checking file format or OCR quality")
         
         if not contact_info.get('email'):
@@ -787,7 +921,7 @@ class CVParser:
         if len(skills) < 3:
             recommendations.append("Few skills detected - verify skills section is properly formatted")
         
-        if self._count_sections_found(text) < 2:
+        if features.sections_found < 2:
             recommendations.append("Few document sections recognized - check CV structure and formatting")
         
         return recommendations
@@ -871,5 +1005,39 @@ class CVParser:
         
         return languages
 
+# Parser used by parse_many and parse_texts worker processes
+_worker_parser: Optional[CVParser] = None
+
+def _init_parse_worker(parser: CVParser):
+    """Install the parser instance used by _parse_path in this process"""
+    global _worker_parser
+    _worker_parser = parser
+
+def _parse_path(path: str) -> Dict[str, Any]:
+    """Read and parse a single CV file, returning an error result on failure"""
+    try:
+        with open(path, 'rb') as f:
+            file_content = f.read()
+        return _worker_parser.parse_cv(path, file_content)
+    except Exception as e:
+        logger.error(f"Error parsing CV {path}: {e}")
+        return {
+            'extracted_text': '',
+            'extraction_confidence': 0.0,
+            'error': str(e)
+        }
+
+def _parse_text(text: str) -> Dict[str, Any]:
+    """Re-analyse extracted text, returning an error result on failure"""
+    try:
+        return _worker_parser.parse_text(text)
+    except Exception as e:
+        logger.error(f"Error re-analysing CV text: {e}")
+        return {
+            'extracted_text': text,
+            'extraction_confidence': 0.0,
+            'error': str(e)
+        }
+
 # Global parser instance
-cv_parser = CVParser()
+cv_parser = CVParser(hooks=[LoggingParseHook(), parse_histograms])
@@ -0,0 +1,162 @@
+"""
+Near-duplicate CV lookup through the MinHash LSH bucket index
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from .models import CandidateLSHBucket, CandidateTextSignature
+from .similarity import band_keys, estimate_similarity, minhash_signature, pack_signature, unpack_signature
+
+# Matches are (candidate id, estimated similarity), most similar first
+Matches = List[Tuple[object, float]]
+
+class DuplicateIndex:
+    """
+    Find candidates whose CV text is nearly identical to another's.
+
+    Every indexed candidate has one CandidateLSHBucket row per signature
+    band. A lookup fetches only the candidates sharing at least one band key
+    through the bucket index, then ranks that short list by estimated
+    similarity, so its cost does not grow with the number of candidates.
+    """
+
+    # Upper bound on the short list scored per lookup, most shared bands first
+    MAX_CANDIDATES = 200
+
+    # Keys per bucket__in query, well under SQLite's variable limit
+    KEY_CHUNK_SIZE = 500
+
+    @staticmethod
+    def default_threshold() -> float:
+        return getattr(settings, 'CV_DUPLICATE_THRESHOLD', 0.8)
+
+    @classmethod
+    def find(cls, signature, queryset=None, exclude_id=None, threshold: Optional[float] = None,
+             limit: int = 10) -> Matches:
+        """Indexed candidates at least ``threshold`` similar to signature, optionally within queryset"""
+        hits = CandidateLSHBucket.objects.filter(bucket__in=band_keys(signature))
+        if exclude_id is not None:
+            hits = hits.exclude(candidate_id=exclude_id)
+        if queryset is not None:
+            hits = hits.filter(candidate__in=queryset.values('pk'))
+
+        candidate_ids = list(
+            hits.values('candidate_id').annotate(bands=Count('id')).order_by('-bands')
+            .values_list('candidate_id', flat=True)[:cls.MAX_CANDIDATES]
+        )
+        signatures = (
+            (candidate_id, unpack_signature(stored))
+            for candidate_id, stored in CandidateTextSignature.objects.filter(candidate_id__in=candidate_ids)
+            .values_list('candidate_id', 'signature')
+        )
+        matches = cls._rank(signature, signatures, threshold)
+        return matches[:limit]
+
+    @classmethod
+    def find_for(cls, candidate, queryset=None, threshold: Optional[float] = None, limit: int = 10) -> Matches:
+        """Near-duplicates of an indexed candidate; empty if it has no signature yet"""
+        stored = CandidateTextSignature.objects.filter(candidate=candidate).values_list('signature', flat=True).first()
+        if stored is None:
+            return []
+        return cls.find(unpack_signature(stored), queryset, candidate.pk, threshold, limit)
+
+    @classmethod
+    def index_candidate(cls, candidate, queryset=None) -> Matches:
+        """
+        (Re)index the candidate's extracted text and return its likely
+        duplicates among the other indexed candidates in queryset.
+        """
+        signature = minhash_signature(candidate.extracted_text)
+
+        with transaction.atomic():
+            CandidateLSHBucket.objects.filter(candidate=candidate).delete()
+            if signature is None:
+                CandidateTextSignature.objects.filter(candidate=candidate).delete()
+                return []
+
+            matches = cls.find(signature, queryset, candidate.pk)
+            CandidateTextSignature.objects.update_or_create(
+                candidate=candidate, defaults={'signature': pack_signature(signature)}
+            )
+            CandidateLSHBucket.objects.bulk_create([
+                CandidateLSHBucket(bucket=key, candidate=candidate) for key in band_keys(signature)
+            ])
+        return matches
+
+    @classmethod
+    def index_many(cls, items: Iterable[Tuple[object, str]], queryset=None,
+                   threshold: Optional[float] = None) -> Dict[object, Matches]:
+        """
+        Index new candidates from (candidate id, extracted text) pairs in bulk.
+
+        All band keys of the batch are looked up together and matched against
+        the existing index and earlier items of the same batch, so a large
+        import costs a few queries per batch rather than one per pair.
+        Returns the likely duplicates of each candidate that has any.
+        """
+        signatures = {}
+        for candidate_id, text in items:
+            signature = minhash_signature(text)
+            if signature is not None:
+                signatures[candidate_id] = (signature, band_keys(signature))
+        if not signatures:
+            return {}
+
+        # Existing candidates sharing any band key with the batch
+        all_keys = list({key for _signature, keys in signatures.values() for key in keys})
+        bucket_members = defaultdict(set)
+        for start in range(0, len(all_keys), cls.KEY_CHUNK_SIZE):
+            hits = CandidateLSHBucket.objects.filter(bucket__in=all_keys[start:start + cls.KEY_CHUNK_SIZE])
+            if queryset is not None:
+                hits = hits.filter(candidate__in=queryset.values('pk'))
+            for key, candidate_id in hits.values_list('bucket', 'candidate_id'):
+                bucket_members[key].add(candidate_id)
+
+        existing_ids = set().union(*bucket_members.values()) if bucket_members else set()
+        known = {
+            candidate_id: unpack_signature(stored)
+            for candidate_id, stored in CandidateTextSignature.objects.filter(candidate_id__in=existing_ids)
+            .values_list('candidate_id', 'signature')
+        }
+
+        results = {}
+        for candidate_id, (signature, keys) in signatures.items():
+            candidate_ids = set().union(*(bucket_members[key] for key in keys)) - {candidate_id}
+            matches = cls._rank(signature, ((other, known[other]) for other in candidate_ids if other in known),
+                                threshold)
+            if matches:
+                results[candidate_id] = matches
+
+            # Later items in the batch are matched against this one too
+            known[candidate_id] = signature
+            for key in keys:
+                bucket_members[key].add(candidate_id)
+
+        with transaction.atomic():
+            CandidateTextSignature.objects.bulk_create([
+                CandidateTextSignature(candidate_id=candidate_id, signature=pack_signature(signature))
+                for candidate_id, (signature, _keys) in signatures.items()
+            ])
+            CandidateLSHBucket.objects.bulk_create([
+                CandidateLSHBucket(bucket=key, candidate_id=candidate_id)
+                for candidate_id, (_signature, keys) in signatures.items()
+                for key in keys
+            ], batch_size=1000)
+        return results
+
+    @classmethod
+    def _rank(cls, signature, others, threshold: Optional[float]) -> Matches:
+        if threshold is None:
+            threshold = cls.default_threshold()
+
+        matches = []
+        for candidate_id, other in others:
+            similarity = estimate_similarity(signature, other)
+            if similarity >= threshold:
+                matches.append((candidate_id, round(similarity, 3)))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
@@ -0,0 +1,256 @@
+"""
+Batch entity resolution and merging of duplicate Candidate rows
+"""
+import logging
+from difflib import SequenceMatcher
+from itertools import combinations, groupby
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .duplicate_index import DuplicateIndex
+from .match_keys import MATCH_KEY_FIELDS
+from .models import Candidate, CandidateActivity, CandidateMatch, CandidateTagAssignment, CandidateTextSignature
+from .search import remove_candidates
+from .similarity import estimate_similarity, unpack_signature
+
+logger = logging.getLogger(__name__)
+
+class CandidateResolver:
+    """
+    Find candidate rows that describe the same person.
+
+    Candidates are only compared with others sharing a blocking key (email,
+    E.164 phone or name). Each key column is indexed, so blocks are read as
+    one ordered scan per key instead of comparing every pair of candidates.
+    Pairs are scored on all their signals and stored as CandidateMatch rows.
+    """
+
+    # Contribution of each signal to a pair's score
+    WEIGHTS = {
+        'email': 0.6,
+        'phone': 0.4,
+        'name': 0.3,
+        'cv_text': 0.4,
+    }
+
+    # Fields loaded for scoring
+    SCORING_FIELDS = ['id', 'match_email', 'match_phone', 'match_name']
+
+    def __init__(self, threshold: Optional[float] = None, max_block_size: int = 500, batch_size: int = 1000):
+        if threshold is None:
+            threshold = getattr(settings, 'CANDIDATE_MATCH_THRESHOLD', 0.7)
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.batch_size = batch_size
+        self.stats = {'blocks': 0, 'skipped_blocks': 0, 'pairs_scored': 0, 'matches': 0}
+
+    def refresh_keys(self) -> int:
+        """Recompute blocking keys of every candidate, returning how many rows changed"""
+        fields = ['id', 'email', 'phone', 'full_name', 'first_name', 'last_name'] + list(MATCH_KEY_FIELDS.values())
+        candidates = Candidate.objects.only(*fields).order_by('pk').iterator(chunk_size=self.batch_size)
+
+        updated = 0
+        batch = []
+        for candidate in candidates:
+            if candidate.refresh_match_keys():
+                batch.append(candidate)
+            if len(batch) >= self.batch_size:
+                Candidate.objects.bulk_update(batch, list(MATCH_KEY_FIELDS.values()))
+                updated += len(batch)
+                batch = []
+        if batch:
+            Candidate.objects.bulk_update(batch, list(MATCH_KEY_FIELDS.values()))
+            updated += len(batch)
+        return updated
+
+    def iter_blocks(self, field: str) -> Iterator[List]:
+        """Yield the ids of each group of two or more candidates sharing a value of field"""
+        rows = (
+            Candidate.objects.exclude(**{field: ''})
+            .order_by(field, 'pk')
+            .values_list(field, 'id')
+            .iterator(chunk_size=self.batch_size)
+        )
+        for _key, group in groupby(rows, key=lambda row: row[0]):
+            ids = [candidate_id for _key, candidate_id in group]
+            if len(ids) < 2:
+                continue
+            self.stats['blocks'] += 1
+            if len(ids) > self.max_block_size:
+                # Shared placeholders such as a company switchboard number
+                self.stats['skipped_blocks'] += 1
+                logger.info(f"Skipping {field} block of {len(ids)} candidates")
+                continue
+            yield ids
+
+    def run(self) -> Dict[str, int]:
+        """Score every blocked pair once and store those at or above the threshold"""
+        seen = set()
+        for field in MATCH_KEY_FIELDS.values():
+            pending = []
+            for ids in self.iter_blocks(field):
+                pending.append(ids)
+                if sum(map(len, pending)) >= self.batch_size:
+                    self._score_blocks(pending, seen)
+                    pending = []
+            if pending:
+                self._score_blocks(pending, seen)
+        return self.stats
+
+    def _score_blocks(self, blocks: List[List], seen: set):
+        ids = {candidate_id for block in blocks for candidate_id in block}
+        rows = {row['id']: row for row in Candidate.objects.filter(pk__in=ids).values(*self.SCORING_FIELDS)}
+        signatures = {
+            candidate_id: unpack_signature(stored)
+            for candidate_id, stored in CandidateTextSignature.objects.filter(candidate_id__in=ids)
+            .values_list('candidate_id', 'signature')
+        }
+
+        matches = []
+        for block in blocks:
+            for a, b in combinations(sorted(block, key=str), 2):
+                if (a, b) in seen or a not in rows or b not in rows:
+                    continue
+                seen.add((a, b))
+                self.stats['pairs_scored'] += 1
+
+                score, reasons = self.score_pair(rows[a], rows[b], signatures.get(a), signatures.get(b))
+                if score >= self.threshold:
+                    matches.append(CandidateMatch(candidate_a_id=a, candidate_b_id=b, score=score, reasons=reasons))
+
+        if matches:
+            # Re-running refreshes scores but keeps merged/dismissed decisions
+            CandidateMatch.objects.bulk_create(
+                matches, update_conflicts=True, unique_fields=['candidate_a', 'candidate_b'],
+                update_fields=['score', 'reasons', 'updated_at']
+            )
+            self.stats['matches'] += len(matches)
+
+    @classmethod
+    def score_pair(cls, a: Dict, b: Dict, signature_a=None, signature_b=None) -> Tuple[float, List[str]]:
+        """Score two candidates' blocking keys and CV signatures, returning (score, reasons)"""
+        score = 0.0
+        reasons = []
+
+        if a['match_email'] and a['match_email'] == b['match_email']:
+            score += cls.WEIGHTS['email']
+            reasons.append('email')
+        if a['match_phone'] and a['match_phone'] == b['match_phone']:
+            score += cls.WEIGHTS['phone']
+            reasons.append('phone')
+        if a['match_name'] and b['match_name']:
+            name_similarity = SequenceMatcher(None, a['match_name'], b['match_name']).ratio()
+            if name_similarity >= 0.85:
+                score += cls.WEIGHTS['name'] * name_similarity
+                reasons.append('name')
+        if signature_a is not None and signature_b is not None:
+            text_similarity = estimate_similarity(signature_a, signature_b)
+            if text_similarity >= 0.5:
+                score += cls.WEIGHTS['cv_text'] * text_similarity
+                reasons.append('cv_text')
+
+        return round(min(score, 1.0), 3), reasons
+
+class CandidateMergeService:
+    """Fold duplicate candidates into a primary candidate"""
+
+    # Copied from a duplicate when the primary has no value
+    FILL_EMPTY_FIELDS = [
+        'first_name', 'last_name', 'email', 'phone', 'full_name', 'summary', 'experience_years',
+        'current_position', 'current_company', 'location', 'linkedin_url', 'github_url', 'portfolio_url',
+        'cv_file', 'cv_filename', 'extracted_text',
+    ]
+
+    # Combined across all merged candidates
+    LIST_FIELDS = ['skills', 'languages', 'certifications']
+
+    @classmethod
+    @transaction.atomic
+    def merge(cls, primary: Candidate, duplicates: List[Candidate], user=None) -> Candidate:
+        """
+        Move activities, tags and interviews of duplicates onto primary, fill
+        its empty fields from them and delete the duplicates.
+
+        Related rows are re-pointed with one UPDATE per table, whatever their number.
+        The primary/duplicate pairs stay as 'merged' matches, and CV files of
+        duplicates that the primary did not take over are deleted once the
+        merge commits.
+        """
+        from interviews.models import Interview
+        from .services import CandidateParsingService
+
+        duplicates = [duplicate for duplicate in duplicates if duplicate.pk != primary.pk]
+        if not duplicates:
+            return primary
+        duplicate_ids = [duplicate.pk for duplicate in duplicates]
+
+        # primary.save() below bumps its updated_at; moved interviews need theirs bumped here
+        CandidateActivity.objects.filter(candidate_id__in=duplicate_ids).update(candidate=primary)
+        Interview.objects.filter(candidate_id__in=duplicate_ids).update(candidate=primary, updated_at=timezone.now())
+        cls._move_tags(primary, duplicate_ids)
+
+        for duplicate in duplicates:
+            for field in cls.FILL_EMPTY_FIELDS:
+                if not getattr(primary, field) and getattr(duplicate, field):
+                    setattr(primary, field, getattr(duplicate, field))
+            for field in cls.LIST_FIELDS:
+                merged = list(getattr(primary, field) or [])
+                merged.extend(item for item in getattr(duplicate, field) or [] if item not in merged)
+                setattr(primary, field, merged)
+
+        CandidateMatch.objects.filter(candidate_a=primary, candidate_b_id__in=duplicate_ids).update(status='merged')
+        CandidateMatch.objects.filter(candidate_b=primary, candidate_a_id__in=duplicate_ids).update(status='merged')
+
+        orphaned_files = [
+            duplicate.cv_file.name for duplicate in duplicates
+            if duplicate.cv_file and duplicate.cv_file.name != primary.cv_file.name
+        ]
+        storage = Candidate._meta.get_field('cv_file').storage
+        transaction.on_commit(lambda: cls._delete_files(storage, orphaned_files))
+
+        # Deleted before saving so a copied email does not collide with its old row
+        Candidate.objects.filter(pk__in=duplicate_ids).delete()
+        remove_candidates(duplicate_ids)
+        primary.save()
+
+        # Filled-in CV text and combined skills feed duplicate detection and job ranking
+        if getattr(settings, 'CV_DUPLICATE_DETECTION', True):
+            DuplicateIndex.index_candidate(primary, Candidate.objects.filter(added_by=primary.added_by))
+        CandidateParsingService.refresh_match_vector(primary)
+
+        CandidateActivity.objects.create(
+            candidate=primary,
+            activity_type='updated',
+            description=f"Merged {len(duplicates)} duplicate candidate(s): {', '.join(str(d) for d in duplicates)}",
+            metadata={'merged_candidate_ids': [str(candidate_id) for candidate_id in duplicate_ids]},
+            user=user
+        )
+        logger.info(f"Merged candidates {duplicate_ids} into {primary.pk}")
+        return primary
+
+    @staticmethod
+    def _delete_files(storage, names: List[str]):
+        for name in names:
+            try:
+                storage.delete(name)
+            except OSError as e:
+                logger.warning(f"Could not delete CV file {name} of a merged candidate: {e}")
+
+    @staticmethod
+    def _move_tags(primary: Candidate, duplicate_ids: List):
+        """Re-point tag assignments, dropping those that would repeat a tag on primary"""
+        assignments = CandidateTagAssignment.objects.filter(candidate_id__in=duplicate_ids)
+        assignments.filter(tag_id__in=primary.tag_assignments.values('tag_id')).delete()
+
+        # Of several duplicates with the same tag, keep the earliest assignment
+        repeated = (
+            assignments.values('tag_id').annotate(copies=Count('id'), keep=Min('id')).filter(copies__gt=1)
+        )
+        for row in repeated:
+            assignments.filter(tag_id=row['tag_id']).exclude(id=row['keep']).delete()
+
+        assignments.update(candidate=primary)
@@ -0,0 +1,98 @@
+"""
+Streaming CSV and NDJSON exports of candidate rows
+"""
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from rest_framework.renderers import BaseRenderer
+
+# Rows formatted between two writes to the response
+EXPORT_BATCH_SIZE = 500
+
+
+def export_rows(queryset, fields: Sequence[str], chunk_size: int = 2000) -> Iterator[Dict]:
+    """
+    Candidate rows as plain dicts of JSON-safe values, read with a database
+    iterator so only one chunk of rows is held in memory at a time.
+    """
+    for values in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        row = dict(zip(fields, values))
+        if 'id' in row:
+            row['id'] = str(row['id'])
+        if 'skills' in row:
+            row['skills'] = row['skills'] or []
+        if row.get('created_at') is not None:
+            row['created_at'] = row['created_at'].isoformat()
+        yield row
+
+
+def csv_value(value):
+    """Flatten list values into one comma-separated cell"""
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    return '' if value is None else value
+
+
+def iter_csv(rows: Iterable[Dict], fields: Sequence[str], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """CSV text for rows, a header line first, in pieces of batch_size rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    for count, row in enumerate(rows, 1):
+        writer.writerow([csv_value(row[field]) for field in fields])
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows: Iterable[Dict], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """One JSON object per line, in pieces of batch_size rows"""
+    lines: List[str] = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= batch_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Selects CSV for ``Accept: text/csv`` or ``?format=csv``. Exports stream
+    their own body; this only renders error responses in that format.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows and isinstance(rows[0], dict) else ['detail']
+        rows = [row if isinstance(row, dict) else {'detail': row} for row in rows]
+        return ''.join(iter_csv(rows, fields)).encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Selects newline-delimited JSON for ``Accept: application/x-ndjson`` or
+    ``?format=ndjson``. Like CSVRenderer it only renders error responses.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(iter_ndjson(rows)).encode(self.charset)
@@ -0,0 +1,205 @@
+"""
+Run PDF and DOCX text extraction in child processes with time and memory limits
+"""
+import logging
+import multiprocessing
+import queue
+import threading
+from typing import Dict, Optional
+
+# Address space limits are POSIX only
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+class ExtractionError(Exception):
+    """Text extraction failed in the sandbox; ``reason`` says why"""
+
+    TIMEOUT = 'timeout'
+    MEMORY_LIMIT = 'memory_limit'
+    CRASHED = 'crashed'
+    FAILED = 'failed'
+    UNAVAILABLE = 'unavailable'
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+
+    def as_dict(self) -> Dict[str, str]:
+        return {'reason': self.reason, 'message': self.message}
+
+def _worker_main(conn, parser, memory_limit_bytes: Optional[int]):
+    """Child process loop: receive (kind, content), send back the text or an error"""
+    if memory_limit_bytes and RESOURCE_AVAILABLE:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+    extractors = {
+        'pdf': parser.extract_text_from_pdf,
+        'docx': parser.extract_text_from_docx,
+    }
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if job is None:
+            return
+
+        kind, file_content = job
+        try:
+            conn.send(('ok', extractors[kind](file_content)))
+        except MemoryError:
+            conn.send(('error', ExtractionError.MEMORY_LIMIT, "Extraction exceeded the memory limit"))
+        except Exception as e:
+            conn.send(('error', ExtractionError.FAILED, f"{type(e).__name__}: {e}"))
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.jobs = 0
+
+class ExtractionSandbox:
+    """
+    Reusable pool of extraction processes.
+
+    Each job gets a wall-clock timeout and each process an RLIMIT_AS ceiling.
+    A worker that times out, runs out of memory or dies is killed and replaced
+    on the next job; workers are also recycled after ``max_jobs_per_worker``
+    jobs to bound slow leaks in the PDF libraries. Failures are raised as
+    ExtractionError with a machine-readable reason.
+    """
+
+    def __init__(self, parser, max_workers: int = 2, timeout: float = 30, memory_limit_mb: Optional[int] = 512,
+                 max_jobs_per_worker: int = 200, start_method: Optional[str] = None):
+        self.parser = parser
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.max_jobs_per_worker = max_jobs_per_worker
+
+        if start_method is None:
+            # Forking a threaded web worker is unsafe; forkserver starts from a clean process
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._context = multiprocessing.get_context(start_method)
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def extract(self, kind: str, file_content: bytes) -> str:
+        """Extract text from a 'pdf' or 'docx' document, raising ExtractionError on failure"""
+        with self._slots:
+            worker = self._checkout()
+            try:
+                worker.conn.send((kind, file_content))
+                if not worker.conn.poll(self.timeout):
+                    self._discard(worker)
+                    raise ExtractionError(ExtractionError.TIMEOUT,
+                                          f"Extraction took longer than {self.timeout:g}s")
+                result = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                exitcode = worker.process.exitcode
+                self._discard(worker)
+                raise ExtractionError(ExtractionError.CRASHED,
+                                      f"Extraction process exited unexpectedly (exit code {exitcode}): {e}")
+
+            worker.jobs += 1
+            if result[0] == 'ok':
+                self._checkin(worker)
+                return result[1]
+
+            _status, reason, message = result
+            if reason == ExtractionError.MEMORY_LIMIT:
+                self._discard(worker)
+            else:
+                self._checkin(worker)
+            raise ExtractionError(reason, message)
+
+    def _checkout(self) -> _Worker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn()
+            if worker.process.is_alive():
+                return worker
+            self._discard(worker)
+
+    def _checkin(self, worker: _Worker):
+        if worker.jobs >= self.max_jobs_per_worker:
+            self._stop(worker)
+        else:
+            self._idle.put(worker)
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn, self.parser, self.memory_limit_bytes), daemon=True
+        )
+        try:
+            process.start()
+        except AssertionError as e:
+            # Daemonic processes (e.g. some Celery pools) may not have children
+            parent_conn.close()
+            child_conn.close()
+            raise ExtractionError(ExtractionError.UNAVAILABLE, f"Cannot start extraction process: {e}")
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    @staticmethod
+    def _stop(worker: _Worker):
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+        worker.process.join(timeout=1)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
+
+    @staticmethod
+    def _discard(worker: _Worker):
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+
+    def shutdown(self):
+        """Stop every idle worker"""
+        while True:
+            try:
+                self._stop(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+# Process-wide sandbox built from settings
+_sandbox: Optional[ExtractionSandbox] = None
+_sandbox_settings: Optional[tuple] = None
+_sandbox_lock = threading.Lock()
+
+def get_extraction_sandbox(parser) -> Optional[ExtractionSandbox]:
+    """Return the sandbox configured in settings, or None when it is disabled"""
+    global _sandbox, _sandbox_settings
+    from django.conf import settings
+
+    sandbox_settings = (
+        getattr(settings, 'CV_EXTRACTION_SANDBOX', True),
+        getattr(settings, 'CV_EXTRACTION_WORKERS', 2),
+        getattr(settings, 'CV_EXTRACTION_TIMEOUT', 30),
+        getattr(settings, 'CV_EXTRACTION_MEMORY_LIMIT_MB', 512),
+    )
+    with _sandbox_lock:
+        if sandbox_settings != _sandbox_settings:
+            if _sandbox is not None:
+                _sandbox.shutdown()
+            enabled, max_workers, timeout, memory_limit_mb = sandbox_settings
+            _sandbox = ExtractionSandbox(parser, max_workers, timeout, memory_limit_mb) if enabled else None
+            _sandbox_settings = sandbox_settings
+        return _sandbox
@@ -0,0 +1,69 @@
+"""
+Filter backends for candidate views
+"""
+import django_filters
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Value, When
+from rest_framework import filters
+
+from .models import Candidate, CandidateSkill
+from .search import get_search_backend
+
+
+class CandidateFilter(django_filters.FilterSet):
+    """
+    Candidate filters, including ``?skills=Python,Docker`` matched through the
+    CandidateSkill index. ``?skills_match=any`` returns candidates with any of
+    the skills instead of all of them.
+    """
+    skills = django_filters.CharFilter(method='filter_skills')
+    skills_match = django_filters.ChoiceFilter(choices=[('all', 'All'), ('any', 'Any')], method='filter_noop')
+
+    class Meta:
+        model = Candidate
+        fields = ['status', 'added_by']
+
+    def filter_skills(self, queryset, name, value):
+        keys = {skill.strip().lower() for skill in value.split(',') if skill.strip()}
+        if not keys:
+            return queryset
+
+        matching = CandidateSkill.objects.filter(key__in=keys)
+        if self.form.cleaned_data.get('skills_match') != 'any' and len(keys) > 1:
+            matching = matching.values('candidate').annotate(found=Count('key')).filter(found=len(keys))
+        return queryset.filter(pk__in=matching.values('candidate'))
+
+    def filter_noop(self, queryset, name, value):
+        return queryset
+
+
+class CandidateSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` through the configured full-text backend.
+
+    Matches are ranked best first unless ``?ordering=`` is given, and the
+    highlighted CV excerpt of each match is left on ``view.search_snippets``.
+    Without a backend this is DRF's icontains SearchFilter over ``search_fields``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        backend = get_search_backend()
+        query = ' '.join(self.get_search_terms(request))
+        if backend is None or not query:
+            return super().filter_queryset(request, queryset, view)
+
+        limit = getattr(settings, 'CANDIDATE_SEARCH_MAX_RESULTS', 500)
+        hits = backend.search(query, limit, scope=queryset)
+        view.search_snippets = {hit.candidate_id: hit.snippet for hit in hits}
+        if not hits:
+            return queryset.none()
+
+        queryset = queryset.filter(pk__in=[hit.candidate_id for hit in hits])
+        if request.query_params.get('ordering'):
+            return queryset
+
+        position = Case(
+            *[When(pk=hit.candidate_id, then=Value(i)) for i, hit in enumerate(hits)],
+            output_field=IntegerField()
+        )
+        return queryset.annotate(search_position=position).order_by('search_position')
@@ -0,0 +1,22 @@
+"""
+Queue bulk upload files left pending while the task broker was unavailable
+"""
+from django.core.management.base import BaseCommand
+
+from candidates.bulk_upload import BulkUploadService
+from candidates.models import BulkUploadItem
+
+
+class Command(BaseCommand):
+    help = (
+        "Send every pending bulk upload file to the Celery workers again; files stay pending "
+        "if the broker is still unavailable"
+    )
+
+    def handle(self, *args, **options):
+        queued = BulkUploadService.redispatch(BulkUploadItem.objects.all())
+        pending = BulkUploadItem.objects.filter(status='pending').count()
+        if pending:
+            self.stdout.write(self.style.WARNING(f"Could not queue {pending} pending files"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Queued {queued} pending files"))
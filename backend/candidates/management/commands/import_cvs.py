@@ -0,0 +1,150 @@
+"""
+Bulk-import a directory of CVs as candidates
+"""
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from candidates.duplicate_index import DuplicateIndex
+from candidates.models import Candidate, CandidateActivity, CandidateSkill
+from candidates.search import index_candidates
+from candidates.services import CandidateParsingService
+from scoring.vectors import CandidateVectorService
+
+ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.txt'}
+
+
+class Command(BaseCommand):
+    help = "Parse every CV in a directory in parallel and create Candidate rows in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help="Directory containing CV files")
+        parser.add_argument('--user', help="Email of the user the candidates are added by")
+        parser.add_argument('--workers', type=int, default=None, help="Parser processes (default: CPU count)")
+        parser.add_argument('--batch-size', type=int, default=200, help="Candidates per bulk_create")
+        parser.add_argument('--recursive', action='store_true', help="Descend into subdirectories")
+        parser.add_argument('--no-store', action='store_true', help="Do not copy CV files into media storage")
+
+    def handle(self, *args, **options):
+        directory = Path(options['directory'])
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory")
+
+        user = None
+        if options['user']:
+            User = get_user_model()
+            try:
+                user = User.objects.get(email=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {options['user']}")
+
+        self.user = user
+        self.store_files = not options['no_store']
+        self.batch_size = options['batch_size']
+        self.created = 0
+        self.duplicates = 0
+        self.failures = []
+
+        start = time.perf_counter()
+        batch = []
+
+        parser = CandidateParsingService.get_parser()
+        for path, parsed_data in parser.parse_many(self.iter_files(directory, options['recursive']),
+                                                   max_workers=options['workers']):
+            if parsed_data.get('error'):
+                self.report_failure(path, parsed_data['error'])
+                continue
+
+            batch.append((path, parsed_data))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+
+        if batch:
+            self.flush(batch)
+
+        elapsed = time.perf_counter() - start
+        processed = self.created + len(self.failures)
+        rate = processed / elapsed if elapsed > 0 else 0.0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {self.created} CVs, {len(self.failures)} failed, {self.duplicates} possible duplicates, "
+            f"in {elapsed:.1f}s ({rate:.1f} CVs/s)"
+        ))
+
+    def iter_files(self, directory, recursive):
+        """Lazily yield CV file paths under directory"""
+        if recursive:
+            for root, _dirs, files in os.walk(directory):
+                for name in sorted(files):
+                    if Path(name).suffix.lower() in ALLOWED_EXTENSIONS:
+                        yield os.path.join(root, name)
+        else:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and Path(entry.name).suffix.lower() in ALLOWED_EXTENSIONS:
+                        yield entry.path
+
+    def report_failure(self, path, error):
+        self.failures.append((path, error))
+        self.stderr.write(f"FAILED {path}: {error}")
+
+    def flush(self, batch):
+        """Create candidates for a batch of parsed CVs"""
+        emails = {parsed_data['email'] for _path, parsed_data in batch if parsed_data.get('email')}
+        seen_emails = set(Candidate.objects.filter(email__in=emails).values_list('email', flat=True))
+
+        candidates = []
+        for path, parsed_data in batch:
+            email = parsed_data.get('email')
+            if email and email in seen_emails:
+                self.report_failure(path, f"candidate with email {email} already exists")
+                continue
+            if email:
+                seen_emails.add(email)
+
+            candidate = Candidate(added_by=self.user, cv_filename=os.path.basename(path))
+            CandidateParsingService.apply_parsed_data(candidate, parsed_data)
+            candidate.refresh_match_keys()
+
+            if self.store_files:
+                with open(path, 'rb') as f:
+                    candidate.cv_file.save(candidate.cv_filename, File(f), save=False)
+
+            candidates.append(candidate)
+
+        with transaction.atomic():
+            Candidate.objects.bulk_create(candidates, batch_size=self.batch_size)
+            index_candidates(candidates)
+            CandidateSkill.sync(candidates)
+            CandidateVectorService.refresh(candidates)
+            CandidateActivity.objects.bulk_create([
+                CandidateActivity(
+                    candidate=candidate,
+                    activity_type='cv_uploaded',
+                    description=f"Imported from {candidate.cv_filename}. Confidence: {candidate.extraction_confidence:.2f}",
+                    user=self.user
+                )
+                for candidate in candidates
+            ], batch_size=self.batch_size)
+
+            # Matched against the index and the rest of the batch in a few queries
+            if getattr(settings, 'CV_DUPLICATE_DETECTION', True):
+                matches = DuplicateIndex.index_many(
+                    ((candidate.pk, candidate.extracted_text) for candidate in candidates),
+                    queryset=Candidate.objects.filter(added_by=self.user)
+                )
+                by_candidate = {candidate: matches[candidate.pk] for candidate in candidates if candidate.pk in matches}
+                CandidateActivity.objects.bulk_create(
+                    CandidateParsingService.duplicate_activities(by_candidate), batch_size=self.batch_size
+                )
+                self.duplicates += len(by_candidate)
+
+        self.created += len(candidates)
+        self.stdout.write(f"Created {self.created} candidates so far")
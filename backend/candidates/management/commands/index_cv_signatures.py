@@ -0,0 +1,48 @@
+"""
+Add candidates parsed before duplicate detection to the near-duplicate index
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from candidates.duplicate_index import DuplicateIndex
+from candidates.models import Candidate
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash signatures and LSH buckets for candidates that are not indexed yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Candidates indexed per batch")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        start = time.perf_counter()
+        indexed = 0
+        duplicates = 0
+
+        candidates = (
+            Candidate.objects.filter(text_signature__isnull=True)
+            .exclude(extracted_text='')
+            .only('id', 'extracted_text')
+            .order_by('pk')
+            .iterator(chunk_size=batch_size)
+        )
+
+        batch = []
+        for candidate in candidates:
+            batch.append((candidate.pk, candidate.extracted_text))
+            if len(batch) >= batch_size:
+                duplicates += len(DuplicateIndex.index_many(batch))
+                indexed += len(batch)
+                batch = []
+                self.stdout.write(f"Indexed {indexed} candidates so far")
+
+        if batch:
+            duplicates += len(DuplicateIndex.index_many(batch))
+            indexed += len(batch)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} candidates in {elapsed:.1f}s, {duplicates} with likely duplicates"
+        ))
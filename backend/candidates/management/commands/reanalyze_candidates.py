@@ -0,0 +1,121 @@
+"""
+Re-run skill, section and confidence extraction on stored CV text
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from candidates.match_keys import MATCH_KEY_FIELDS
+from candidates.models import Candidate, CandidateSkill
+from candidates.search import SEARCH_FIELDS, index_candidates
+from candidates.services import CandidateParsingService
+from scoring.vectors import VECTOR_FIELDS, CandidateVectorService
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-analyse every candidate's extracted_text with the current parser and "
+        "update only the rows whose derived fields change"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Parser processes (default: CPU count)")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows fetched and updated per batch")
+        parser.add_argument('--dry-run', action='store_true', help="Report changes without saving them")
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+        self.changed_fields = {}
+        self.updated = 0
+        processed = 0
+        failed = 0
+        start = time.perf_counter()
+
+        fields = (
+            ['id', 'first_name', 'last_name'] + CandidateParsingService.derived_fields()
+            + list(MATCH_KEY_FIELDS.values()) + SEARCH_FIELDS
+        )
+        candidates = (
+            Candidate.objects.exclude(extracted_text='')
+            .only(*fields)
+            .order_by('pk')
+            .iterator(chunk_size=self.batch_size)
+        )
+
+        batch = []
+        items = ((candidate, candidate.extracted_text) for candidate in candidates)
+        parser = CandidateParsingService.get_parser()
+        for candidate, parsed_data in parser.parse_texts(items, max_workers=options['workers']):
+            processed += 1
+            if parsed_data.get('error'):
+                failed += 1
+                self.stderr.write(f"FAILED {candidate.id}: {parsed_data['error']}")
+                continue
+
+            changed = CandidateParsingService.apply_reanalysis(candidate, parsed_data)
+            if changed:
+                batch.append((candidate, changed))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+
+        if batch:
+            self.flush(batch)
+
+        elapsed = time.perf_counter() - start
+        summary = ', '.join(f"{field} {count}" for field, count in sorted(self.changed_fields.items())) or 'none'
+        verb = 'Would update' if self.dry_run else 'Updated'
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-analysed {processed} candidates in {elapsed:.1f}s, {failed} failed. "
+            f"{verb} {self.updated} (changed fields: {summary})"
+        ))
+
+    def flush(self, batch):
+        """Write the changed fields of a batch with one bulk_update"""
+        batch = self.drop_taken_emails(batch)
+        self.updated += len(batch)
+        for _candidate, changed in batch:
+            for field in changed:
+                self.changed_fields[field] = self.changed_fields.get(field, 0) + 1
+        if self.dry_run or not batch:
+            return
+
+        now = timezone.now()
+        fields = set()
+        for candidate, changed in batch:
+            candidate.updated_at = now
+            fields.update(changed)
+            fields.update(candidate.refresh_match_keys())
+
+        Candidate.objects.bulk_update(
+            [candidate for candidate, _changed in batch],
+            sorted(fields) + ['updated_at'],
+            batch_size=self.batch_size
+        )
+        index_candidates(candidate for candidate, changed in batch if set(changed) & set(SEARCH_FIELDS))
+        CandidateSkill.sync(candidate for candidate, changed in batch if 'skills' in changed)
+        CandidateVectorService.refresh(candidate for candidate, changed in batch if set(changed) & VECTOR_FIELDS)
+
+    def drop_taken_emails(self, batch):
+        """Leave email empty where the extracted address already belongs to another candidate"""
+        emails = {candidate.email for candidate, changed in batch if 'email' in changed}
+        taken = set(
+            Candidate.objects.filter(email__in=emails)
+            .exclude(id__in=[candidate.id for candidate, _changed in batch])
+            .values_list('email', flat=True)
+        )
+
+        kept = []
+        for candidate, changed in batch:
+            if 'email' in changed:
+                if candidate.email in taken:
+                    self.stderr.write(f"SKIPPED email for {candidate.id}: {candidate.email} is already in use")
+                    candidate.email = None
+                    changed = [field for field in changed if field != 'email']
+                else:
+                    taken.add(candidate.email)
+            if changed:
+                kept.append((candidate, changed))
+        return kept
@@ -0,0 +1,40 @@
+"""
+Re-index every candidate in the full-text search backend
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.models import Candidate
+from candidates.search import SEARCH_FIELDS, get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the candidate full-text search index from the candidate table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Candidates indexed per batch")
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            raise CommandError("No full-text search backend is configured for this database")
+
+        start = time.perf_counter()
+        batch_size = options['batch_size']
+        indexed = 0
+        batch = []
+
+        for candidate in Candidate.objects.only('id', *SEARCH_FIELDS).order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(candidate)
+            if len(batch) >= batch_size:
+                backend.index(batch)
+                indexed += len(batch)
+                batch = []
+        backend.index(batch)
+        indexed += len(batch)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} candidates with the {backend.name} backend in {elapsed:.1f}s"
+        ))
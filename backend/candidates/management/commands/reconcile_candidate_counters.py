@@ -0,0 +1,37 @@
+"""
+Rebuild the candidate dashboard counters and report how far they had drifted
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from candidates.models import CandidateCounter
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount candidates per user, day, status, confidence band and CV presence, "
+        "report rows whose stored CandidateCounter total differs and replace the table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without rewriting the counters")
+        parser.add_argument('--show', type=int, default=20, help="Drifted rows to list")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        drift = CandidateCounter.rebuild(dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - start
+
+        for key, delta in sorted(drift.items(), key=lambda item: -abs(item[1]))[:options['show']]:
+            user_id, day, status, band, has_cv = key
+            self.stdout.write(
+                f"  user {user_id} {day} {status}/{band}{' with CV' if has_cv else ''}: {delta:+d}"
+            )
+
+        action = "Found" if options['dry_run'] else "Rebuilt counters, correcting"
+        summary = f"{action} {len(drift)} drifted rows ({sum(abs(delta) for delta in drift.values())} candidates) in {elapsed:.1f}s"
+        if drift:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,40 @@
+"""
+Find candidate rows that describe the same person
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from candidates.entity_resolution import CandidateResolver
+
+
+class Command(BaseCommand):
+    help = (
+        "Block candidates on normalized email, phone and name, score the pairs inside each block "
+        "and record likely duplicates as CandidateMatch rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=None,
+                            help="Minimum pair score to record (default: CANDIDATE_MATCH_THRESHOLD)")
+        parser.add_argument('--max-block-size', type=int, default=500,
+                            help="Skip blocks with more candidates than this")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Candidates loaded per query")
+        parser.add_argument('--skip-refresh', action='store_true',
+                            help="Use the stored blocking keys without recomputing them first")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        resolver = CandidateResolver(options['threshold'], options['max_block_size'], options['batch_size'])
+
+        if not options['skip_refresh']:
+            refreshed = resolver.refresh_keys()
+            self.stdout.write(f"Refreshed blocking keys of {refreshed} candidates")
+
+        stats = resolver.run()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {stats['pairs_scored']} pairs in {stats['blocks']} blocks "
+            f"({stats['skipped_blocks']} oversized blocks skipped), "
+            f"{stats['matches']} likely duplicates, in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,86 @@
+"""
+Normalized email, phone and name keys used to block candidates for entity resolution
+"""
+import re
+import unicodedata
+from typing import Optional
+
+from django.conf import settings
+
+PHONE_EXTENSION_PATTERN = re.compile(r'\s*(?:ext\.?|x|#)\s*\d+\s*$', re.IGNORECASE)
+# The '(0)' in '+44 (0)20 ...' is only dialled nationally
+TRUNK_ZERO_PATTERN = re.compile(r'\(0\)')
+NON_DIGIT_PATTERN = re.compile(r'\D')
+NAME_TOKEN_PATTERN = re.compile(r'[a-z]+')
+
+# E.164 allows at most 15 digits; shorter than 8 is not a reachable number
+MIN_PHONE_DIGITS = 8
+MAX_PHONE_DIGITS = 15
+
+# Candidate field holding each key
+MATCH_KEY_FIELDS = {
+    'email': 'match_email',
+    'phone': 'match_phone',
+    'name': 'match_name',
+}
+
+# Candidate fields the keys are computed from
+MATCH_KEY_INPUTS = {'email', 'phone', 'full_name', 'first_name', 'last_name'}
+
+
+def email_key(email: str) -> str:
+    """Lowercased, trimmed email address"""
+    return (email or '').strip().lower()
+
+
+def phone_key(phone: str, country_code: Optional[str] = None) -> str:
+    """
+    E.164 form of a phone number ('+15550100123'), or '' if it cannot be one.
+
+    Numbers written without an international prefix are taken to be national
+    numbers in CANDIDATE_PHONE_COUNTRY_CODE and lose their leading trunk 0.
+    """
+    if not phone:
+        return ''
+    if country_code is None:
+        country_code = getattr(settings, 'CANDIDATE_PHONE_COUNTRY_CODE', '1')
+
+    phone = TRUNK_ZERO_PATTERN.sub('', PHONE_EXTENSION_PATTERN.sub('', phone.strip()))
+    digits = NON_DIGIT_PATTERN.sub('', phone)
+
+    if phone.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith(country_code) and len(digits) > 10:
+        pass
+    else:
+        digits = country_code + digits.lstrip('0')
+
+    if not MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return ''
+    return f"+{digits}"
+
+
+def name_key(name: str) -> str:
+    """
+    Accent-free, lowercased name tokens in sorted order, so 'Doe, Jane' and
+    'Jane Doe' share a key. Single-word names are too common to block on and
+    get no key.
+    """
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    ascii_name = ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    tokens = NAME_TOKEN_PATTERN.findall(ascii_name)
+    if len(tokens) < 2:
+        return ''
+    return ' '.join(sorted(tokens))[:200]
+
+
+def match_keys(candidate) -> dict:
+    """Current key values for a candidate, by Candidate field name"""
+    name = candidate.full_name or f"{candidate.first_name} {candidate.last_name}"
+    return {
+        'match_email': email_key(candidate.email)[:254],
+        'match_phone': phone_key(candidate.phone),
+        'match_name': name_key(name),
+    }
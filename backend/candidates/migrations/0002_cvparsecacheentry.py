@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-17 01:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVParseCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('file_type', models.CharField(max_length=10)),
+                ('parser_version', models.CharField(max_length=32)),
+                ('result', models.JSONField()),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'unique_together': {('content_hash', 'file_type', 'parser_version')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0002_cvparsecacheentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_duration_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Time taken to parse the CV', null=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_status',
+            field=models.CharField(blank=True, choices=[('queued', 'Queued'), ('parsing', 'Parsing'), ('parsed', 'Parsed'), ('failed', 'Failed')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='parsed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['parse_status'], name='candidates__parse_s_ef29f5_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0003_candidate_parse_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='parse_timings',
+            field=models.JSONField(blank=True, default=dict, help_text='Wall and CPU milliseconds per parse stage'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['parse_duration_ms'], name='candidates__parse_d_4d04f8_idx'),
+        ),
+    ]
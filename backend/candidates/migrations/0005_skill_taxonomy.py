@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:21
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0004_candidate_parse_timings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillTaxonomy',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='Canonical name stored on candidates', max_length=100, unique=True)),
+                ('category', models.CharField(choices=[('programming', 'Programming Languages'), ('frameworks', 'Frameworks & Libraries'), ('databases', 'Databases'), ('cloud', 'Cloud & DevOps'), ('data', 'Data Science & AI'), ('tools', 'Tools'), ('other', 'Other')], default='other', max_length=20)),
+                ('aliases', models.JSONField(blank=True, default=list, help_text='Other spellings, e.g. k8s for Kubernetes')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Skill taxonomy',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillTaxonomyVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+# The skill keywords previously hard-coded in CVParser, with canonical spelling and common aliases
+SKILLS = {
+    'programming': [
+        ('Python', []), ('JavaScript', ['ecmascript']), ('Java', []), ('C++', ['cpp']), ('C#', ['csharp']),
+        ('PHP', []), ('Ruby', []), ('Go', ['golang']), ('Rust', []), ('Swift', []), ('TypeScript', []),
+        ('Kotlin', []), ('Scala', []), ('R', []), ('MATLAB', []), ('SQL', []), ('HTML', ['html5']),
+        ('CSS', ['css3']),
+    ],
+    'frameworks': [
+        ('React', ['react.js', 'reactjs']), ('Angular', ['angularjs']), ('Vue', ['vue.js', 'vuejs']),
+        ('Django', []), ('Flask', []), ('Spring', ['spring boot']), ('Express', ['express.js', 'expressjs']),
+        ('FastAPI', []), ('Laravel', []), ('Rails', ['ruby on rails']), ('ASP.NET', []), ('jQuery', []),
+        ('Bootstrap', []), ('Tailwind', ['tailwind css', 'tailwindcss']),
+    ],
+    'databases': [
+        ('MySQL', []), ('PostgreSQL', ['postgres', 'psql']), ('MongoDB', ['mongo']), ('Redis', []),
+        ('Elasticsearch', ['elastic search']), ('SQLite', []), ('Oracle', []), ('Cassandra', []),
+        ('DynamoDB', []), ('Firebase', []),
+    ],
+    'cloud': [
+        ('AWS', ['amazon web services']), ('Azure', ['microsoft azure']),
+        ('GCP', ['google cloud', 'google cloud platform']), ('Docker', []), ('Kubernetes', ['k8s']),
+        ('Jenkins', []), ('Git', []), ('GitHub', []), ('GitLab', []), ('CircleCI', []), ('Terraform', []),
+        ('Ansible', []), ('Nginx', []), ('Apache', []),
+    ],
+    'data': [
+        ('Machine Learning', []), ('Deep Learning', []), ('Data Science', []), ('Pandas', []),
+        ('NumPy', []), ('TensorFlow', []), ('PyTorch', []), ('scikit-learn', ['sklearn']), ('Keras', []),
+        ('OpenCV', []), ('NLTK', []),
+    ],
+    'tools': [
+        ('Excel', ['microsoft excel']), ('Power BI', ['powerbi']), ('Tableau', []), ('Figma', []),
+        ('Adobe', []), ('Photoshop', []), ('Illustrator', []), ('Jira', []), ('Confluence', []),
+        ('Slack', []), ('Notion', []), ('Trello', []),
+    ],
+}
+
+
+def seed_skills(apps, schema_editor):
+    SkillTaxonomy = apps.get_model('candidates', 'SkillTaxonomy')
+    SkillTaxonomyVersion = apps.get_model('candidates', 'SkillTaxonomyVersion')
+
+    SkillTaxonomy.objects.bulk_create([
+        SkillTaxonomy(name=name, category=category, aliases=aliases)
+        for category, skills in SKILLS.items()
+        for name, aliases in skills
+    ], ignore_conflicts=True)
+    SkillTaxonomyVersion.objects.update_or_create(pk=1, defaults={'version': 1})
+
+
+def unseed_skills(apps, schema_editor):
+    SkillTaxonomy = apps.get_model('candidates', 'SkillTaxonomy')
+    SkillTaxonomy.objects.filter(
+        name__in=[name for skills in SKILLS.values() for name, _aliases in skills]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0005_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_skills, unseed_skills),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0006_seed_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateTextSignature',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='text_signature', serialize=False, to='candidates.candidate')),
+                ('signature', models.BinaryField(help_text='Packed unsigned 32-bit MinHash values')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CandidateLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField()),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='candidates.candidate')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket', 'candidate'], name='candidates__bucket_8e254a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0007_candidate_text_signature'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('reasons', models.JSONField(blank=True, default=list, help_text='Signals that contributed to the score')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('merged', 'Merged'), ('dismissed', 'Dismissed')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-score'],
+            },
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='match_email',
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='match_name',
+            field=models.CharField(blank=True, editable=False, help_text='Sorted lowercase name tokens', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='match_phone',
+            field=models.CharField(blank=True, editable=False, help_text='E.164 phone number', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['match_email'], name='candidates__match_e_f9249e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['match_phone'], name='candidates__match_p_b48805_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['match_name'], name='candidates__match_n_89a7a5_idx'),
+        ),
+        migrations.AddField(
+            model_name='candidatematch',
+            name='candidate_a',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='candidates.candidate'),
+        ),
+        migrations.AddField(
+            model_name='candidatematch',
+            name='candidate_b',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='candidates.candidate'),
+        ),
+        migrations.AddIndex(
+            model_name='candidatematch',
+            index=models.Index(fields=['status', '-score'], name='candidates__status_e44e2f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='candidatematch',
+            unique_together={('candidate_a', 'candidate_b')},
+        ),
+    ]
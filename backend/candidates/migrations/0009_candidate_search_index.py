@@ -0,0 +1,78 @@
+from django.db import migrations
+
+# Inlined from candidates.search as of this migration, so later changes to the app code cannot alter it
+FTS_TABLE = 'candidates_candidate_fts'
+FTS_INSERT = (
+    f"INSERT INTO {FTS_TABLE} (rowid, candidate_id, full_name, email, phone, skills, position, body) "
+    f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+
+def fts_rowid(candidate_id) -> int:
+    return candidate_id.int >> 65
+
+
+def skills_text(skills) -> str:
+    return ' '.join(str(skill) for skill in skills) if isinstance(skills, list) else str(skills or '')
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    Candidate = apps.get_model('candidates', 'Candidate')
+
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "candidate_id UNINDEXED, full_name, email, phone, skills, position, body, "
+            "tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+        rows = Candidate.objects.order_by('pk').values_list(
+            'pk', 'full_name', 'email', 'phone', 'skills', 'current_position', 'current_company', 'extracted_text'
+        )
+        batch = []
+        with connection.cursor() as cursor:
+            for pk, full_name, email, phone, skills, position, company, text in rows.iterator(chunk_size=1000):
+                batch.append((
+                    fts_rowid(pk), pk.hex, full_name, email or '', phone, skills_text(skills),
+                    f"{position} {company}".strip(), text,
+                ))
+                if len(batch) >= 1000:
+                    cursor.executemany(FTS_INSERT, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(FTS_INSERT, batch)
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE candidates_candidate ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS candidates_candidate_search_idx "
+            "ON candidates_candidate USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            "UPDATE candidates_candidate SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(full_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || "
+            "coalesce(skills::text, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(current_position, '') || ' ' || "
+            "coalesce(current_company, '')), 'C') || "
+            "setweight(to_tsvector('english', coalesce(extracted_text, '')), 'D')"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS candidates_candidate_search_idx")
+        schema_editor.execute("ALTER TABLE candidates_candidate DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0008_candidate_match_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from candidates.models import skill_names
+
+
+def index_skills(apps, schema_editor):
+    Candidate = apps.get_model('candidates', 'Candidate')
+    CandidateSkill = apps.get_model('candidates', 'CandidateSkill')
+
+    rows = []
+    for candidate_id, skills in Candidate.objects.values_list('id', 'skills').iterator(chunk_size=1000):
+        rows.extend(
+            CandidateSkill(candidate_id=candidate_id, key=key, name=name)
+            for key, name in skill_names(skills).items()
+        )
+        if len(rows) >= 1000:
+            CandidateSkill.objects.bulk_create(rows)
+            rows = []
+    CandidateSkill.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0009_candidate_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Lowercase skill name used for matching', max_length=100)),
+                ('name', models.CharField(max_length=100)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to='candidates.candidate')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'candidate'], name='candidates__key_a90fba_idx')],
+                'unique_together': {('candidate', 'key')},
+            },
+        ),
+        migrations.RunPython(index_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0010_candidate_skill'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='candidate',
+            name='candidates__created_a71da5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['created_at', 'id'], name='candidates__created_c67973_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateactivity',
+            index=models.Index(fields=['created_at', 'id'], name='candidates__created_d2d05c_idx'),
+        ),
+    ]
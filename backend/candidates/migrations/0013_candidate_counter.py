@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+from candidates.models import CandidateCounter as CurrentCandidateCounter
+
+
+def count_candidates(apps, schema_editor):
+    Candidate = apps.get_model('candidates', 'Candidate')
+    CandidateCounter = apps.get_model('candidates', 'CandidateCounter')
+
+    columns = CurrentCandidateCounter.key_columns()
+    rows = Candidate.objects.order_by().annotate(**columns).values(*columns).annotate(candidates=Count('pk'))
+    CandidateCounter.objects.bulk_create([
+        CandidateCounter(
+            user_id=row['key_user_id'], day=row['key_day'], status=row['key_status'],
+            confidence_band=row['key_band'], has_cv=row['key_has_cv'], total=row['candidates']
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0012_bulk_upload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('confidence_band', models.CharField(choices=[('none', 'Not parsed'), ('low', 'Low confidence'), ('high', 'High confidence')], max_length=10)),
+                ('has_cv', models.BooleanField()),
+                ('total', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'day', 'status', 'confidence_band', 'has_cv')},
+            },
+        ),
+        migrations.RunPython(count_candidates, migrations.RunPython.noop),
+    ]
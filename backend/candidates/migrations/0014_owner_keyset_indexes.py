@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 04:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0013_candidate_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['added_by', 'created_at', 'id'], name='candidates__added_b_6150f7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateactivity',
+            index=models.Index(fields=['candidate', 'created_at', 'id'], name='candidates__candida_d0c17f_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-17 04:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0014_owner_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidatematch',
+            name='candidate_a',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='candidates.candidate'),
+        ),
+        migrations.AlterField(
+            model_name='candidatematch',
+            name='candidate_b',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='candidates.candidate'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0015_candidate_match_set_null'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bulkuploaditem',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('pending', 'Waiting for the task queue'), ('parsed', 'Parsed'), ('failed', 'Failed'), ('rejected', 'Rejected')], default='queued', max_length=20),
+        ),
+    ]
@@ -1,16 +1,85 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F, Q, Case, When, Value, Count, Sum
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import json
+from datetime import timedelta
 from django.contrib.auth import get_user_model
 import uuid
 import os
 
 User = get_user_model()
 
+# Largest CV accepted by single and bulk uploads
+MAX_CV_FILE_SIZE = 10 * 1024 * 1024
+CV_FILE_SIZE_ERROR = f"File size cannot exceed {MAX_CV_FILE_SIZE // (1024 * 1024)}MB."
+
 def candidate_cv_upload_path(instance, filename):
     """Generate upload path for candidate CVs"""
     ext = filename.split('.')[-1]
     filename = f"{uuid.uuid4()}.{ext}"
     return f"candidates/cvs/{filename}"
 
+# Candidate fields that decide which CandidateCounter row a candidate is counted in
+COUNTER_FIELDS = {'added_by', 'added_by_id', 'created_at', 'status', 'extraction_confidence', 'cv_file'}
+COUNTER_ATTNAMES = {'added_by_id', 'created_at', 'status', 'extraction_confidence', 'cv_file'}
+
+class CandidateQuerySet(models.QuerySet):
+    """Queryset that keeps CandidateCounter in step with bulk changes"""
+    
+    def update(self, **kwargs):
+        if not COUNTER_FIELDS & set(kwargs):
+            return super().update(**kwargs)
+        
+        with transaction.atomic():
+            if any(hasattr(value, 'resolve_expression') for value in kwargs.values()):
+                # New values are only known once the database has computed them
+                ids = list(self.values_list('pk', flat=True))
+                before = CandidateCounter.keys_of(self.model.objects.filter(pk__in=ids))
+                rows = super().update(**kwargs)
+                after = CandidateCounter.keys_of(self.model.objects.filter(pk__in=ids))
+            else:
+                before = CandidateCounter.keys_of(self)
+                rows = super().update(**kwargs)
+                after = {}
+                for key, count in before.items():
+                    new_key = CandidateCounter.replace(key, kwargs)
+                    after[new_key] = after.get(new_key, 0) + count
+            CandidateCounter.apply(CandidateCounter.diff(before, after))
+        return rows
+    
+    def delete(self):
+        with transaction.atomic():
+            before = CandidateCounter.keys_of(self)
+            result = super().delete()
+            CandidateCounter.apply(CandidateCounter.diff(before, {}))
+        return result
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic():
+            created = super().bulk_create(objs, *args, **kwargs)
+            after = {}
+            for candidate in created:
+                key = CandidateCounter.key_of(candidate)
+                after[key] = after.get(key, 0) + 1
+            CandidateCounter.apply(after)
+        return created
+    
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if not COUNTER_FIELDS & set(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        
+        objs = list(objs)
+        ids = [candidate.pk for candidate in objs]
+        with transaction.atomic():
+            before = CandidateCounter.keys_of(self.model.objects.filter(pk__in=ids))
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+            after = CandidateCounter.keys_of(self.model.objects.filter(pk__in=ids))
+            CandidateCounter.apply(CandidateCounter.diff(before, after))
+        return rows
+
 class Candidate(models.Model):
     """Model to store candidate information"""
     
@@ -49,6 +118,19 @@ class Candidate(models.Model):
     extracted_text = models.TextField(blank=True)
     extraction_confidence = models.FloatField(default=0.0)
     
+    # CV Parsing Lifecycle
+    PARSE_STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('parsing', 'Parsing'),
+        ('parsed', 'Parsed'),
+        ('failed', 'Failed'),
+    ]
+    parse_status = models.CharField(max_length=20, choices=PARSE_STATUS_CHOICES, blank=True)
+    parse_error = models.TextField(blank=True)
+    parse_duration_ms = models.PositiveIntegerField(null=True, blank=True, help_text="Time taken to parse the CV")
+    parsed_at = models.DateTimeField(null=True, blank=True)
+    parse_timings = models.JSONField(default=dict, blank=True, help_text="Wall and CPU milliseconds per parse stage")
+    
     # Status and Tracking
     STATUS_CHOICES = [
         ('new', 'New'),
@@ -65,17 +147,31 @@ class Candidate(models.Model):
     rating = models.IntegerField(null=True, blank=True, help_text="Rating from 1-10")
     notes = models.TextField(blank=True)
     
+    # Entity resolution blocking keys, kept in sync on save
+    match_email = models.CharField(max_length=254, blank=True, editable=False)
+    match_phone = models.CharField(max_length=16, blank=True, editable=False, help_text="E.164 phone number")
+    match_name = models.CharField(max_length=200, blank=True, editable=False, help_text="Sorted lowercase name tokens")
+    
     # Metadata
     added_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CandidateQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['email']),
             models.Index(fields=['status']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
+            # Keyset pages of one recruiter's candidates
+            models.Index(fields=['added_by', 'created_at', 'id']),
+            models.Index(fields=['parse_status']),
+            models.Index(fields=['parse_duration_ms']),
+            models.Index(fields=['match_email']),
+            models.Index(fields=['match_phone']),
+            models.Index(fields=['match_name']),
         ]
     
     def __str__(self):
@@ -88,6 +184,74 @@ class Candidate(models.Model):
         else:
             return f"Candidate {str(self.id)[:8]}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which counter row the stored values fall in, unless some were deferred
+        if COUNTER_ATTNAMES <= set(field_names):
+            instance._counter_key = CandidateCounter.key_of(instance)
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """Save, running only the match key, counter and index hooks whose inputs update_fields includes"""
+        from .match_keys import MATCH_KEY_INPUTS
+        from .search import SEARCH_FIELDS, index_candidates
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or MATCH_KEY_INPUTS & set(update_fields):
+            changed = self.refresh_match_keys()
+            if changed and update_fields is not None:
+                kwargs['update_fields'] = update_fields = list(update_fields) + changed
+        
+        if update_fields is not None and not COUNTER_FIELDS & set(update_fields):
+            super().save(*args, **kwargs)
+        else:
+            old_key = None if self._state.adding else self.stored_counter_key()
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                self._counter_key = CandidateCounter.key_of(self)
+                if self._counter_key != old_key:
+                    CandidateCounter.apply(CandidateCounter.diff(
+                        {old_key: 1} if old_key else {}, {self._counter_key: 1}
+                    ))
+        
+        # Status and parse bookkeeping saves leave the search index alone
+        if update_fields is None or set(update_fields) & set(SEARCH_FIELDS):
+            index_candidates([self])
+        if update_fields is None or 'skills' in update_fields:
+            CandidateSkill.sync([self])
+    
+    def delete(self, *args, **kwargs):
+        from .search import remove_candidates
+        
+        candidate_id = self.pk
+        key = self.stored_counter_key()
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            if key:
+                CandidateCounter.apply({key: -1})
+        remove_candidates([candidate_id])
+        return result
+    
+    def stored_counter_key(self):
+        """The CandidateCounter key of the saved row, read from the database if not known from loading"""
+        key = getattr(self, '_counter_key', None)
+        if key is None:
+            keys = CandidateCounter.keys_of(Candidate.objects.filter(pk=self.pk))
+            key = next(iter(keys), None)
+        return key
+    
+    def refresh_match_keys(self):
+        """Recompute the blocking keys, returning the names of the fields that changed"""
+        from .match_keys import match_keys
+        
+        changed = []
+        for field, value in match_keys(self).items():
+            if getattr(self, field) != value:
+                setattr(self, field, value)
+                changed.append(field)
+        return changed
+    
     @property
     def display_name(self):
         """Return the best available name for display"""
@@ -151,6 +315,445 @@ class CandidateActivity(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            # Keyset pages of one candidate's activities, or of each candidate of one recruiter in turn
+            models.Index(fields=['candidate', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.candidate.display_name} - {self.get_activity_type_display()}"
+
+class CVParseCacheEntry(models.Model):
+    """Cached parse_cv output keyed by file content hash and parser version"""
+    content_hash = models.CharField(max_length=64)
+    file_type = models.CharField(max_length=10)
+    parser_version = models.CharField(max_length=32)
+    result = models.JSONField()
+    size_bytes = models.PositiveIntegerField(default=0)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    class Meta:
+        unique_together = ['content_hash', 'file_type', 'parser_version']
+    
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.file_type}, v{self.parser_version})"
+
+class SkillTaxonomyVersion(models.Model):
+    """Single-row counter bumped on every skill taxonomy change"""
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    @classmethod
+    def current(cls) -> int:
+        return cls.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+    
+    @classmethod
+    def bump(cls):
+        with transaction.atomic():
+            if not cls.objects.filter(pk=1).update(version=F('version') + 1):
+                cls.objects.create(pk=1, version=1)
+    
+    def __str__(self):
+        return f"Skill taxonomy v{self.version}"
+
+class SkillTaxonomyQuerySet(models.QuerySet):
+    """Queryset that bumps the taxonomy version on bulk changes"""
+    
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            SkillTaxonomyVersion.bump()
+        return rows
+    
+    def delete(self):
+        result = super().delete()
+        if result[0]:
+            SkillTaxonomyVersion.bump()
+        return result
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            SkillTaxonomyVersion.bump()
+        return created
+    
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if rows:
+            SkillTaxonomyVersion.bump()
+        return rows
+
+class SkillTaxonomy(models.Model):
+    """Canonical skill name, its aliases and category, matched in CV text"""
+    
+    CATEGORY_CHOICES = [
+        ('programming', 'Programming Languages'),
+        ('frameworks', 'Frameworks & Libraries'),
+        ('databases', 'Databases'),
+        ('cloud', 'Cloud & DevOps'),
+        ('data', 'Data Science & AI'),
+        ('tools', 'Tools'),
+        ('other', 'Other'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=100, unique=True, help_text="Canonical name stored on candidates")
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='other')
+    aliases = models.JSONField(default=list, blank=True, help_text="Other spellings, e.g. k8s for Kubernetes")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = SkillTaxonomyQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'Skill taxonomy'
+    
+    def __str__(self):
+        return self.name
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        SkillTaxonomyVersion.bump()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        SkillTaxonomyVersion.bump()
+        return result
+
+class CandidateTextSignature(models.Model):
+    """MinHash signature of a candidate's extracted CV text"""
+    candidate = models.OneToOneField(Candidate, on_delete=models.CASCADE, primary_key=True, related_name='text_signature')
+    signature = models.BinaryField(help_text="Packed unsigned 32-bit MinHash values")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Signature of {self.candidate_id}"
+
+class CandidateLSHBucket(models.Model):
+    """One LSH band key of a candidate's signature; candidates sharing a key are likely near-duplicates"""
+    bucket = models.BigIntegerField()
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='lsh_buckets')
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['bucket', 'candidate']),
+        ]
+    
+    def __str__(self):
+        return f"{self.bucket} -> {self.candidate_id}"
+
+class CandidateMatch(models.Model):
+    """Pair of candidates that entity resolution scored as likely the same person"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('merged', 'Merged'),
+        ('dismissed', 'Dismissed'),
+    ]
+    
+    # candidate_a has the smaller id so each pair is stored once; a merged
+    # pair keeps its row with the deleted duplicate's side cleared
+    candidate_a = models.ForeignKey(Candidate, on_delete=models.SET_NULL, null=True, related_name='+')
+    candidate_b = models.ForeignKey(Candidate, on_delete=models.SET_NULL, null=True, related_name='+')
+    score = models.FloatField()
+    reasons = models.JSONField(default=list, blank=True, help_text="Signals that contributed to the score")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-score']
+        unique_together = ['candidate_a', 'candidate_b']
+        indexes = [
+            models.Index(fields=['status', '-score']),
+        ]
+    
+    def __str__(self):
+        return f"{self.candidate_a_id} ~ {self.candidate_b_id} ({self.score:.2f})"
+
+def skill_names(skills) -> dict:
+    """Distinct skills of a Candidate.skills value as {lowercase key: name}"""
+    if isinstance(skills, str):
+        try:
+            skills = json.loads(skills)
+        except (json.JSONDecodeError, TypeError):
+            skills = skills.split(',')
+    if not isinstance(skills, list):
+        return {}
+    
+    names = {}
+    for skill in skills:
+        if isinstance(skill, str) and skill.strip():
+            name = skill.strip()[:100]
+            names.setdefault(name.lower(), name)
+    return names
+
+class CandidateSkill(models.Model):
+    """One skill of a candidate, mirrored from Candidate.skills so skill filters and facets can use indexes"""
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='skill_index')
+    key = models.CharField(max_length=100, help_text="Lowercase skill name used for matching")
+    name = models.CharField(max_length=100)
+    
+    class Meta:
+        unique_together = ['candidate', 'key']
+        indexes = [
+            models.Index(fields=['key', 'candidate']),
+        ]
+    
+    def __str__(self):
+        return f"{self.candidate_id}: {self.name}"
+    
+    @classmethod
+    def sync(cls, candidates):
+        """Replace the skill rows of candidates with their current Candidate.skills"""
+        candidates = list(candidates)
+        if not candidates:
+            return
+        with transaction.atomic():
+            cls.objects.filter(candidate__in=[candidate.pk for candidate in candidates]).delete()
+            cls.objects.bulk_create([
+                cls(candidate=candidate, key=key, name=name)
+                for candidate in candidates
+                for key, name in skill_names(candidate.skills).items()
+            ], batch_size=1000)
+
+class BulkUploadJob(models.Model):
+    """CVs uploaded together in one request and parsed in the background"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='bulk_upload_jobs')
+    total_files = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Bulk upload {self.id} ({self.total_files} files)"
+
+class BulkUploadItem(models.Model):
+    """Outcome of one file of a bulk upload"""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('pending', 'Waiting for the task queue'),
+        ('parsed', 'Parsed'),
+        ('failed', 'Failed'),
+        ('rejected', 'Rejected'),
+    ]
+    
+    job = models.ForeignKey(BulkUploadJob, on_delete=models.CASCADE, related_name='items')
+    filename = models.CharField(max_length=255)
+    candidate = models.ForeignKey(Candidate, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    error = models.TextField(blank=True)
+    extraction_confidence = models.FloatField(null=True, blank=True)
+    possible_duplicates = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['job', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+class CandidateCounter(models.Model):
+    """
+    Number of candidates per user, creation day, status, parse confidence
+    band and CV presence.
+
+    Kept up to date by Candidate.save()/delete(), CandidateQuerySet and the
+    User pre_delete handler below, so dashboard stats sum a few small rows
+    instead of scanning candidates.
+    The reconcile_candidate_counters command rebuilds it from scratch.
+    """
+    
+    BAND_CHOICES = [
+        ('none', 'Not parsed'),
+        ('low', 'Low confidence'),
+        ('high', 'High confidence'),
+    ]
+    
+    # Lowest extraction confidence of the 'high' band
+    HIGH_CONFIDENCE = 0.7
+    
+    # Whole days counted as recent, including today
+    RECENT_DAYS = 30
+    
+    # Fields identifying a row, in the order of a counter key tuple
+    KEY_FIELDS = ['user_id', 'day', 'status', 'confidence_band', 'has_cv']
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, related_name='+')
+    day = models.DateField()
+    status = models.CharField(max_length=20)
+    confidence_band = models.CharField(max_length=10, choices=BAND_CHOICES)
+    has_cv = models.BooleanField()
+    total = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['user', 'day', 'status', 'confidence_band', 'has_cv']
+    
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.status}/{self.confidence_band}: {self.total}"
+    
+    @classmethod
+    def band(cls, confidence) -> str:
+        if confidence is not None and confidence >= cls.HIGH_CONFIDENCE:
+            return 'high'
+        if confidence:
+            return 'low'
+        return 'none'
+    
+    @classmethod
+    def key_of(cls, candidate) -> tuple:
+        """(user_id, day, status, confidence band, has_cv) of a Candidate instance"""
+        return (
+            candidate.added_by_id, timezone.localdate(candidate.created_at), candidate.status,
+            cls.band(candidate.extraction_confidence), bool(candidate.cv_file),
+        )
+    
+    @classmethod
+    def key_columns(cls) -> dict:
+        """The key of each candidate as annotations, matching key_of"""
+        return {
+            'key_user_id': F('added_by_id'),
+            'key_day': TruncDate('created_at'),
+            'key_status': F('status'),
+            'key_band': Case(
+                When(extraction_confidence__gte=cls.HIGH_CONFIDENCE, then=Value('high')),
+                When(extraction_confidence__gt=0, then=Value('low')),
+                default=Value('none'),
+            ),
+            'key_has_cv': Case(
+                When(Q(cv_file__isnull=True) | Q(cv_file=''), then=Value(False)),
+                default=Value(True),
+                output_field=models.BooleanField(),
+            ),
+        }
+    
+    @classmethod
+    def keys_of(cls, queryset) -> dict:
+        """{key: number of candidates} for a Candidate queryset, in one grouped query"""
+        columns = cls.key_columns()
+        rows = queryset.order_by().annotate(**columns).values(*columns).annotate(candidates=Count('pk'))
+        return {tuple(row[column] for column in columns): row['candidates'] for row in rows}
+    
+    @classmethod
+    def replace(cls, key: tuple, values: dict) -> tuple:
+        """key after a Candidate update() setting values"""
+        user_id, day, status, band, has_cv = key
+        if 'added_by' in values:
+            user_id = getattr(values['added_by'], 'pk', values['added_by'])
+        if 'added_by_id' in values:
+            user_id = values['added_by_id']
+        if 'created_at' in values:
+            day = timezone.localdate(values['created_at'])
+        if 'status' in values:
+            status = values['status']
+        if 'extraction_confidence' in values:
+            band = cls.band(values['extraction_confidence'])
+        if 'cv_file' in values:
+            has_cv = bool(values['cv_file'])
+        return (user_id, day, status, band, has_cv)
+    
+    @staticmethod
+    def diff(before: dict, after: dict) -> dict:
+        """Changes turning the counts before into the counts after, without zero entries"""
+        deltas = {key: after.get(key, 0) - count for key, count in before.items()}
+        deltas.update({key: count for key, count in after.items() if key not in before})
+        return {key: delta for key, delta in deltas.items() if delta}
+    
+    @classmethod
+    def apply(cls, deltas: dict):
+        """Add each delta to its counter row, creating rows as needed"""
+        for key, delta in deltas.items():
+            lookup = dict(zip(cls.KEY_FIELDS, key))
+            if cls.objects.filter(**lookup).update(total=F('total') + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(total=delta, **lookup)
+            except IntegrityError:
+                # Another transaction created the row first
+                cls.objects.filter(**lookup).update(total=F('total') + delta)
+    
+    @classmethod
+    def stored(cls) -> dict:
+        """{key: total} of every counter row"""
+        counts = {}
+        for row in cls.objects.values(*cls.KEY_FIELDS, 'total'):
+            key = tuple(row[field] for field in cls.KEY_FIELDS)
+            counts[key] = counts.get(key, 0) + row['total']
+        return counts
+    
+    @classmethod
+    def rebuild(cls, dry_run: bool = False) -> dict:
+        """
+        Recount every candidate and replace the counter rows with the result.
+        Returns the drift found, as {key: stored total - actual count}.
+        """
+        with transaction.atomic():
+            actual = cls.keys_of(Candidate.objects.all())
+            drift = cls.diff(actual, cls.stored())
+            if not dry_run:
+                cls.objects.all().delete()
+                cls.objects.bulk_create([
+                    cls(total=count, **dict(zip(cls.KEY_FIELDS, key))) for key, count in actual.items()
+                ], batch_size=1000)
+        return drift
+    
+    @classmethod
+    def recent_since(cls):
+        """First local day whose candidates count as recent, for counters and live counts alike"""
+        return timezone.localdate() - timedelta(days=cls.RECENT_DAYS)
+    
+    @classmethod
+    def stats(cls, user) -> dict:
+        """Candidate totals for a user's dashboard"""
+        rows = cls.objects.filter(user=user)
+        totals = rows.aggregate(
+            total_candidates=Sum('total'),
+            recent_candidates=Sum('total', filter=Q(day__gte=cls.recent_since())),
+            with_cv=Sum('total', filter=Q(has_cv=True)),
+            parsed=Sum('total', filter=~Q(confidence_band='none')),
+            high_confidence=Sum('total', filter=Q(confidence_band='high')),
+        )
+        totals = {name: value or 0 for name, value in totals.items()}
+        status_distribution = {
+            row['status']: row['candidates']
+            for row in rows.values('status').annotate(candidates=Sum('total')).order_by()
+            if row['candidates']
+        }
+        return {
+            'total_candidates': totals['total_candidates'],
+            'recent_candidates': totals['recent_candidates'],
+            'status_distribution': status_distribution,
+            'parsing_stats': {
+                'with_cv': totals['with_cv'],
+                'parsed': totals['parsed'],
+                'high_confidence': totals['high_confidence'],
+            }
+        }
+
+@receiver(pre_delete, sender=User)
+def release_deleted_users_candidates(sender, instance, **kwargs):
+    """
+    Clear added_by through CandidateQuerySet.update() before the SET_NULL
+    cascade would, which writes without it, so the counters move the
+    user's candidates to the no-user rows instead of drifting
+    """
+    Candidate.objects.filter(added_by=instance).update(added_by=None)
+
+@receiver(pre_delete, sender=Candidate)
+def drop_deleted_candidates_matches(sender, instance, **kwargs):
+    """Delete undecided and dismissed pairs of a deleted candidate; only merge decisions outlive it"""
+    CandidateMatch.objects.filter(
+        models.Q(candidate_a=instance) | models.Q(candidate_b=instance)
+    ).exclude(status='merged').delete()
@@ -0,0 +1,261 @@
+"""
+Content-addressed cache for CV parsing results
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+class ParseCacheBackend:
+    """
+    Size limits shared by the backends. Checking them costs a scan, so it
+    runs on the first store of each process and then once every
+    ``evict_every`` stores; in between the cache may overshoot by that many entries.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, evict_every: int = 1):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evict_every = max(evict_every, 1)
+        self._stores_until_evict = 0
+
+    def stored(self, parser_version: str):
+        """Count a store and run eviction when it is due"""
+        if self._stores_until_evict <= 0:
+            self._stores_until_evict = self.evict_every
+            self.evict(parser_version)
+        self._stores_until_evict -= 1
+
+    def evict(self, parser_version: str):
+        raise NotImplementedError
+
+class DatabaseParseCacheBackend(ParseCacheBackend):
+    """
+    Store parse results in the CVParseCacheEntry table.
+
+    A hit writes last_used_at and hit_count only once the stored time is
+    ``touch_seconds`` old, adding the hits this process counted meanwhile,
+    so repeated hits on a hot entry are reads only.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, evict_every: int = 1, touch_seconds: int = 0):
+        super().__init__(max_entries, max_bytes, evict_every)
+        self.touch_seconds = touch_seconds
+        self._pending_hits: Dict[int, int] = {}
+
+    def get(self, content_hash: str, file_type: str, parser_version: str) -> Optional[Dict[str, Any]]:
+        from .models import CVParseCacheEntry
+
+        entry = CVParseCacheEntry.objects.filter(
+            content_hash=content_hash, file_type=file_type, parser_version=parser_version
+        ).only('id', 'result', 'last_used_at').first()
+        if entry is None:
+            return None
+
+        hits = self._pending_hits.pop(entry.id, 0) + 1
+        now = timezone.now()
+        if (now - entry.last_used_at).total_seconds() >= self.touch_seconds:
+            CVParseCacheEntry.objects.filter(id=entry.id).update(
+                hit_count=F('hit_count') + hits, last_used_at=now
+            )
+        else:
+            self._pending_hits[entry.id] = hits
+        return entry.result
+
+    def set(self, content_hash: str, file_type: str, parser_version: str, result: Dict[str, Any]):
+        from .models import CVParseCacheEntry
+
+        CVParseCacheEntry.objects.update_or_create(
+            content_hash=content_hash, file_type=file_type, parser_version=parser_version,
+            defaults={'result': result, 'size_bytes': len(json.dumps(result))}
+        )
+        self.stored(parser_version)
+
+    def evict(self, parser_version: str):
+        """Drop entries from other parser versions, then least recently used ones, until within limits"""
+        from .models import CVParseCacheEntry
+
+        entries = CVParseCacheEntry.objects.all()
+        stats = entries.aggregate(count=Count('id'), total_bytes=Sum('size_bytes'))
+        if stats['count'] <= self.max_entries and (stats['total_bytes'] or 0) <= self.max_bytes:
+            return
+
+        entries.exclude(parser_version=parser_version).delete()
+
+        count = entries.count()
+        if count > self.max_entries:
+            stale_ids = list(
+                entries.order_by('last_used_at').values_list('id', flat=True)[:count - self.max_entries]
+            )
+            CVParseCacheEntry.objects.filter(id__in=stale_ids).delete()
+
+        total_bytes = entries.aggregate(total_bytes=Sum('size_bytes'))['total_bytes'] or 0
+        if total_bytes > self.max_bytes:
+            stale_ids = []
+            for entry_id, size_bytes in entries.order_by('last_used_at').values_list('id', 'size_bytes').iterator():
+                if total_bytes <= self.max_bytes:
+                    break
+                stale_ids.append(entry_id)
+                total_bytes -= size_bytes
+            CVParseCacheEntry.objects.filter(id__in=stale_ids).delete()
+
+    def clear(self):
+        from .models import CVParseCacheEntry
+        CVParseCacheEntry.objects.all().delete()
+
+class FileSystemParseCacheBackend(ParseCacheBackend):
+    """Store parse results as JSON files, using modification time for LRU order"""
+
+    def __init__(self, directory: str, max_entries: int, max_bytes: int, evict_every: int = 1):
+        super().__init__(max_entries, max_bytes, evict_every)
+        self.directory = Path(directory)
+
+    def _path(self, content_hash: str, file_type: str, parser_version: str) -> Path:
+        return self.directory / parser_version / content_hash[:2] / f"{content_hash}.{file_type}.json"
+
+    def get(self, content_hash: str, file_type: str, parser_version: str) -> Optional[Dict[str, Any]]:
+        path = self._path(content_hash, file_type, parser_version)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable parse cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def set(self, content_hash: str, file_type: str, parser_version: str, result: Dict[str, Any]):
+        path = self._path(content_hash, file_type, parser_version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+        self.stored(parser_version)
+
+    def evict(self, parser_version: str):
+        """Drop other parser versions, then least recently used files, until within limits"""
+        if not self.directory.exists():
+            return
+
+        files = []
+        for version_dir in self.directory.iterdir():
+            for path in version_dir.glob('*/*.json'):
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, version_dir.name, path))
+
+        total_bytes = sum(size for _mtime, size, _version, _path in files)
+        if len(files) <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # Other versions sort first, then oldest access time
+        files.sort(key=lambda item: (item[2] == parser_version, item[0]))
+        count = len(files)
+        for _mtime, size, _version, path in files:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            count -= 1
+            total_bytes -= size
+
+    def clear(self):
+        for path in self.directory.glob('*/*/*.json'):
+            path.unlink(missing_ok=True)
+
+class ParseCache:
+    """
+    Cache of CVParser.parse_cv results keyed by SHA-256 of the file content,
+    the file type and the parser's cache_version. Bumping CVParser.VERSION or
+    editing the skill taxonomy makes every existing entry unreachable; they
+    are evicted first once the cache is full. Parsers with non-default
+    extraction limits get their own entries.
+    """
+
+    def __init__(self):
+        self._backend = None
+        self._backend_settings = None
+
+    @staticmethod
+    def content_hash(file_content: bytes) -> str:
+        """Return the SHA-256 hex digest of the file content"""
+        return hashlib.sha256(file_content).hexdigest()
+
+    @staticmethod
+    def file_type(file_path: str) -> str:
+        return Path(file_path).suffix.lower().lstrip('.')[:10]
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'CV_PARSE_CACHE_ENABLED', True)
+
+    @property
+    def backend(self):
+        """Backend configured in settings, rebuilt if the settings change"""
+        backend_settings = (
+            getattr(settings, 'CV_PARSE_CACHE_BACKEND', 'db'),
+            getattr(settings, 'CV_PARSE_CACHE_DIR', None),
+            getattr(settings, 'CV_PARSE_CACHE_MAX_ENTRIES', 10000),
+            getattr(settings, 'CV_PARSE_CACHE_MAX_BYTES', 512 * 1024 * 1024),
+            getattr(settings, 'CV_PARSE_CACHE_EVICT_EVERY', 50),
+            getattr(settings, 'CV_PARSE_CACHE_TOUCH_SECONDS', 300),
+        )
+        if backend_settings != self._backend_settings:
+            name, directory, max_entries, max_bytes, evict_every, touch_seconds = backend_settings
+            if name == 'filesystem':
+                self._backend = FileSystemParseCacheBackend(directory, max_entries, max_bytes, evict_every)
+            else:
+                self._backend = DatabaseParseCacheBackend(max_entries, max_bytes, evict_every, touch_seconds)
+            self._backend_settings = backend_settings
+        return self._backend
+
+    def parse_cv(self, parser, file_path: str, file_content: bytes) -> Dict[str, Any]:
+        """Return parser.parse_cv output, from the cache when the same bytes were parsed before"""
+        if not self.enabled:
+            return parser.parse_cv(file_path, file_content)
+
+        content_hash = self.content_hash(file_content)
+        file_type = self.file_type(file_path)
+        parser_version = parser.cache_version
+
+        try:
+            cached = self.backend.get(content_hash, file_type, parser_version)
+        except Exception as e:
+            logger.warning(f"Parse cache lookup failed: {e}")
+            cached = None
+
+        if cached is not None:
+            logger.debug(f"Parse cache hit for {content_hash[:12]}")
+            return cached
+
+        result = parser.parse_cv(file_path, file_content)
+
+        # Failed extractions are not cached so they are retried next time.
+        # Timings describe this run only and are not replayed on a hit.
+        if not result.get('error'):
+            cached_result = {key: value for key, value in result.items() if key != 'parse_timings'}
+            try:
+                self.backend.set(content_hash, file_type, parser_version, cached_result)
+            except Exception as e:
+                logger.warning(f"Parse cache store failed: {e}")
+
+        return result
+
+    def clear(self):
+        self.backend.clear()
+
+# Global cache instance
+parse_cache = ParseCache()
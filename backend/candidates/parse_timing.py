@@ -0,0 +1,142 @@
+"""
+Per-stage timing of CV parsing with pluggable hooks
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ParseHook:
+    """
+    Receives stage timings from CVParser.parse_cv.
+
+    Subclasses override either method. Hooks run inside the parsing process,
+    including parse_many workers, so they must be picklable.
+    """
+
+    def stage_finished(self, file_path: str, stage: str, wall_ms: float, cpu_ms: float):
+        pass
+
+    def parse_finished(self, file_path: str, timings: Dict[str, Dict[str, float]]):
+        pass
+
+class LoggingParseHook(ParseHook):
+    """Log a one-line stage summary per parse, as a warning when the parse is slow"""
+
+    def __init__(self, slow_ms: float = 2000):
+        self.slow_ms = slow_ms
+
+    def parse_finished(self, file_path: str, timings: Dict[str, Dict[str, float]]):
+        total = timings.get('total', {}).get('wall_ms', 0.0)
+        stages = ', '.join(
+            f"{stage} {values['wall_ms']:.1f}ms (cpu {values['cpu_ms']:.1f}ms)"
+            for stage, values in timings.items() if stage != 'total'
+        )
+        level = logging.WARNING if total >= self.slow_ms else logging.DEBUG
+        logger.log(level, f"Parsed {file_path} in {total:.1f}ms: {stages}")
+
+class HistogramParseHook(ParseHook):
+    """Aggregate wall-clock stage timings into in-process histograms"""
+
+    # Upper bucket bounds in milliseconds; the last bucket is unbounded
+    DEFAULT_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+    def __init__(self, buckets: Optional[Iterable[float]] = None):
+        self.buckets = sorted(buckets or self.DEFAULT_BUCKETS)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def _observe(self, stage: str, wall_ms: float, cpu_ms: float):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = {
+                    'count': 0, 'wall_ms_sum': 0.0, 'cpu_ms_sum': 0.0, 'max_ms': 0.0,
+                    'buckets': [0] * (len(self.buckets) + 1),
+                }
+            histogram['count'] += 1
+            histogram['wall_ms_sum'] += wall_ms
+            histogram['cpu_ms_sum'] += cpu_ms
+            histogram['max_ms'] = max(histogram['max_ms'], wall_ms)
+            histogram['buckets'][bisect.bisect_left(self.buckets, wall_ms)] += 1
+
+    def stage_finished(self, file_path: str, stage: str, wall_ms: float, cpu_ms: float):
+        self._observe(stage, wall_ms, cpu_ms)
+
+    def parse_finished(self, file_path: str, timings: Dict[str, Dict[str, float]]):
+        total = timings.get('total')
+        if total:
+            self._observe('total', total['wall_ms'], total['cpu_ms'])
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of the histograms with bucket counts labelled by upper bound"""
+        labels = [f"le_{bound:g}" for bound in self.buckets] + ['inf']
+        with self._lock:
+            return {
+                stage: {
+                    'count': histogram['count'],
+                    'wall_ms_sum': round(histogram['wall_ms_sum'], 3),
+                    'cpu_ms_sum': round(histogram['cpu_ms_sum'], 3),
+                    'max_ms': round(histogram['max_ms'], 3),
+                    'buckets': dict(zip(labels, histogram['buckets'])),
+                }
+                for stage, histogram in self._histograms.items()
+            }
+
+class StageTimer:
+    """Measure wall-clock and CPU time of each parse stage and notify hooks"""
+
+    def __init__(self, file_path: str, hooks: List[ParseHook]):
+        self.file_path = file_path
+        self.hooks = hooks
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.thread_time()
+
+    @contextmanager
+    def stage(self, name: str):
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - start_wall) * 1000
+            cpu_ms = (time.thread_time() - start_cpu) * 1000
+            self.timings[name] = {'wall_ms': round(wall_ms, 3), 'cpu_ms': round(cpu_ms, 3)}
+            self._notify('stage_finished', self.file_path, name, wall_ms, cpu_ms)
+
+    def finish(self) -> Dict[str, Dict[str, float]]:
+        """Record the total and return all timings"""
+        self.timings['total'] = {
+            'wall_ms': round((time.perf_counter() - self._start_wall) * 1000, 3),
+            'cpu_ms': round((time.thread_time() - self._start_cpu) * 1000, 3),
+        }
+        self._notify('parse_finished', self.file_path, self.timings)
+        return self.timings
+
+    def _notify(self, method: str, *args):
+        # A broken hook must never fail the parse
+        for hook in self.hooks:
+            try:
+                getattr(hook, method)(*args)
+            except Exception as e:
+                logger.warning(f"Parse hook {type(hook).__name__}.{method} failed: {e}")
+
+# Histograms for the global parser, readable from this process
+parse_histograms = HistogramParseHook()
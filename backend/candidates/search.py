@@ -0,0 +1,223 @@
+"""
+Pluggable full-text search over candidates: SQLite FTS5 or a PostgreSQL tsvector column
+"""
+import re
+import uuid
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+
+# Fields copied into the index; a change to any of them re-indexes the candidate
+SEARCH_FIELDS = ['full_name', 'email', 'phone', 'skills', 'current_position', 'current_company', 'extracted_text']
+
+SEARCH_TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+class SearchHit(NamedTuple):
+    candidate_id: object
+    rank: float
+    snippet: str
+
+def search_terms(query: str) -> List[str]:
+    """Words of a user query, stripped of any search-syntax characters"""
+    return SEARCH_TERM_PATTERN.findall(query or '')[:16]
+
+def _skills_text(skills) -> str:
+    return ' '.join(str(skill) for skill in skills) if isinstance(skills, list) else str(skills or '')
+
+class SearchBackend:
+    """
+    Interface of a candidate search index.
+
+    Every backend matches all query words, treating the last one as a prefix
+    so results keep up with typing, and returns hits best first with a
+    highlighted excerpt of the CV text.
+    """
+
+    name = 'base'
+
+    def search(self, query: str, limit: int, scope=None) -> List[SearchHit]:
+        """
+        The ``limit`` best matches, among the candidates of the ``scope``
+        queryset when given. The scope is joined into the index query so
+        out-of-scope matches never take up the limit.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def scope_clause(column: str, scope) -> Tuple[str, list]:
+        """
+        ``AND column IN (<ids of scope>)`` with its params, or nothing without
+        a scope. Raises EmptyResultSet when the scope can match no candidate,
+        such as ``.none()`` or ``pk__in=[]``; searches return no hits then.
+        """
+        if scope is None:
+            return '', []
+        sql, params = scope.order_by().values('pk').query.sql_with_params()
+        return f" AND {column} IN ({sql})", list(params)
+
+    def index(self, candidates: Iterable):
+        """Add or refresh candidates that were created or edited"""
+        raise NotImplementedError
+
+    def remove(self, candidate_ids: Iterable):
+        """Drop deleted candidates from the index"""
+
+class SQLiteFTSBackend(SearchBackend):
+    """
+    FTS5 virtual table for development databases.
+
+    The table is keyed by a 63-bit rowid derived from the candidate UUID, so
+    refreshing or removing a candidate is a rowid lookup rather than a scan.
+    """
+
+    name = 'sqlite_fts'
+    table = 'candidates_candidate_fts'
+
+    # bm25 column weights: candidate_id, full_name, email, phone, skills, position, body
+    WEIGHTS = (0.0, 10.0, 5.0, 5.0, 5.0, 3.0, 1.0)
+    BODY_COLUMN = 6
+
+    @staticmethod
+    def rowid(candidate_id) -> int:
+        return candidate_id.int >> 65
+
+    def match_expression(self, terms: List[str]) -> str:
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    def search(self, query: str, limit: int, scope=None) -> List[SearchHit]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        try:
+            scope_sql, scope_params = self.scope_clause('candidate_id', scope)
+        except EmptyResultSet:
+            return []
+        weights = ', '.join(str(weight) for weight in self.WEIGHTS)
+        sql = (
+            f"SELECT candidate_id, bm25({self.table}, {weights}) AS score, "
+            f"snippet({self.table}, {self.BODY_COLUMN}, %s, %s, '…', 12) "
+            f"FROM {self.table} WHERE {self.table} MATCH %s{scope_sql} ORDER BY score LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql, [HIGHLIGHT_START, HIGHLIGHT_END, self.match_expression(terms), *scope_params, limit]
+            )
+            # bm25 is lower for better matches; flip it so a higher rank is better in every backend
+            return [
+                SearchHit(uuid.UUID(candidate_id), -score, snippet)
+                for candidate_id, score, snippet in cursor.fetchall()
+            ]
+
+    def index(self, candidates: Iterable):
+        rows = []
+        for candidate in candidates:
+            rows.append((
+                self.rowid(candidate.pk), candidate.pk.hex, candidate.full_name, candidate.email or '',
+                candidate.phone, _skills_text(candidate.skills),
+                f"{candidate.current_position} {candidate.current_company}".strip(), candidate.extracted_text,
+            ))
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, candidate_id, full_name, email, phone, skills, position, body) "
+                f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s)", rows
+            )
+
+    def remove(self, candidate_ids: Iterable):
+        rowids = [(self.rowid(candidate_id),) for candidate_id in candidate_ids]
+        if rowids:
+            with connection.cursor() as cursor:
+                cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", rowids)
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    ``search_vector`` tsvector column on the candidate table with a GIN index.
+
+    The column is filled from weighted fields (name A, contact and skills B,
+    position C, CV text D) by one UPDATE per batch of candidates.
+    """
+
+    name = 'postgres'
+    config = 'english'
+
+    def tsquery(self, terms: List[str]) -> str:
+        return ' & '.join(terms) + ':*'
+
+    def search(self, query: str, limit: int, scope=None) -> List[SearchHit]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        try:
+            scope_sql, scope_params = self.scope_clause('id', scope)
+        except EmptyResultSet:
+            return []
+        sql = (
+            "SELECT id, ts_rank_cd(search_vector, query) AS rank, "
+            "ts_headline(%s, extracted_text, query, %s) "
+            "FROM candidates_candidate, to_tsquery(%s, %s) query "
+            f"WHERE search_vector @@ query{scope_sql} ORDER BY rank DESC LIMIT %s"
+        )
+        options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxFragments=2, MaxWords=24, MinWords=8"
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.config, options, self.config, self.tsquery(terms), *scope_params, limit])
+            return [SearchHit(*row) for row in cursor.fetchall()]
+
+    def index(self, candidates: Iterable):
+        ids = [candidate.pk for candidate in candidates]
+        if not ids:
+            return
+        sql = (
+            "UPDATE candidates_candidate SET search_vector = "
+            "setweight(to_tsvector(%s, coalesce(full_name, '')), 'A') || "
+            "setweight(to_tsvector(%s, coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || "
+            "coalesce(skills::text, '')), 'B') || "
+            "setweight(to_tsvector(%s, coalesce(current_position, '') || ' ' || coalesce(current_company, '')), 'C') || "
+            "setweight(to_tsvector(%s, coalesce(extracted_text, '')), 'D') "
+            "WHERE id = ANY(%s)"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.config] * 4 + [ids])
+
+BACKENDS = {
+    SQLiteFTSBackend.name: SQLiteFTSBackend,
+    PostgresSearchBackend.name: PostgresSearchBackend,
+}
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSBackend.name,
+    'postgresql': PostgresSearchBackend.name,
+}
+
+def get_search_backend() -> Optional[SearchBackend]:
+    """
+    The backend named by CANDIDATE_SEARCH_BACKEND; 'auto' picks one for the
+    database in use. None means plain icontains search.
+    """
+    name = getattr(settings, 'CANDIDATE_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        name = VENDOR_BACKENDS.get(connection.vendor)
+    backend_class = BACKENDS.get(name)
+    return backend_class() if backend_class else None
+
+def index_candidates(candidates: Iterable):
+    """Refresh candidates in the configured search index"""
+    backend = get_search_backend()
+    if backend is not None:
+        backend.index(candidates)
+
+def remove_candidates(candidate_ids: Iterable):
+    """Drop candidates from the configured search index"""
+    backend = get_search_backend()
+    if backend is not None:
+        backend.remove(candidate_ids)
@@ -3,7 +3,8 @@ Serializers for candidate management
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Candidate, CandidateTag, CandidateActivity
+from django.db.models import Prefetch
+from .models import CV_FILE_SIZE_ERROR, MAX_CV_FILE_SIZE, Candidate, CandidateTag, CandidateActivity, CandidateMatch
 import json
 
 User = get_user_model()
@@ -34,14 +35,19 @@ class CandidateListSerializer(serializers.ModelSerializer):
     """Serializer for listing candidates"""
     tags = CandidateTagSerializer(many=True, read_only=True)
     added_by_name = serializers.CharField(source='added_by.get_full_name', read_only=True)
+    search_snippet = serializers.SerializerMethodField()
     
     class Meta:
         model = Candidate
         fields = [
             'id', 'full_name', 'email', 'phone', 'status', 'experience_years',
             'skills', 'current_position', 'current_company', 'extraction_confidence',
-            'created_at', 'updated_at', 'tags', 'added_by_name'
+            'parse_status', 'created_at', 'updated_at', 'tags', 'added_by_name', 'search_snippet'
         ]
+    
+    def get_search_snippet(self, obj):
+        """Highlighted CV excerpt when the list is a search result"""
+        return self.context.get('search_snippets', {}).get(obj.pk)
 
 class CandidateDetailSerializer(serializers.ModelSerializer):
     """Serializer for candidate details with all CV extracted information"""
@@ -62,10 +68,14 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
             'summary', 'experience_years', 'skills', 'current_position', 'current_company',
             'location', 'linkedin_url', 'github_url', 'portfolio_url', 'education',
             'work_experience', 'certifications', 'languages', 'cv_file', 'cv_filename',
-            'cv_file_url', 'extraction_confidence', 'extracted_text', 'created_at', 
-            'updated_at', 'tags', 'added_by_name', 'recent_activities', 'rating', 'notes'
+            'cv_file_url', 'extraction_confidence', 'extracted_text', 'parse_status', 'parse_error',
+            'parse_duration_ms', 'parse_timings', 'parsed_at', 'created_at', 'updated_at', 'tags', 'added_by_name',
+            'recent_activities', 'rating', 'notes'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'updated_at', 'extraction_confidence', 'extracted_text',
+            'parse_status', 'parse_error', 'parse_duration_ms', 'parse_timings', 'parsed_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'extraction_confidence', 'extracted_text']
     
     def get_skills(self, obj):
         """Parse skills from JSON field"""
@@ -126,9 +136,26 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
             return obj.cv_file.url
         return None
     
+    # Activities shown with a candidate's details
+    RECENT_ACTIVITY_LIMIT = 5
+    
+    # Attribute the detail actions prefetch them into; Django only slices a prefetch with to_attr
+    RECENT_ACTIVITIES_ATTR = 'prefetched_recent_activities'
+    
+    @classmethod
+    def recent_activities_prefetch(cls):
+        """Prefetch of each candidate's latest activities and their users, for the detail actions"""
+        return Prefetch(
+            'activities',
+            queryset=CandidateActivity.objects.select_related('user').order_by('-created_at', '-id')[:cls.RECENT_ACTIVITY_LIMIT],
+            to_attr=cls.RECENT_ACTIVITIES_ATTR
+        )
+    
     def get_recent_activities(self, obj):
         """Get recent activities for this candidate"""
-        recent_activities = obj.activities.all()[:5]
+        recent_activities = getattr(obj, self.RECENT_ACTIVITIES_ATTR, None)
+        if recent_activities is None:
+            recent_activities = obj.activities.select_related('user').order_by('-created_at', '-id')[:self.RECENT_ACTIVITY_LIMIT]
         return CandidateActivitySerializer(recent_activities, many=True).data
 
 class CandidateCreateSerializer(serializers.ModelSerializer):
@@ -148,16 +175,16 @@ class CandidateCreateSerializer(serializers.ModelSerializer):
             'location', 'linkedin_url', 'github_url', 'portfolio_url', 
             'education', 'work_experience', 'certifications', 'languages',
             'notes', 'rating', 'extracted_text', 'extraction_confidence',
-            'cv_file', 'tag_ids'
+            'cv_file', 'tag_ids', 'parse_status'
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'parse_status']
     
     def validate_cv_file(self, value):
         """Validate CV file upload"""
         if value:
-            # Check file size (10MB limit)
-            if value.size > 10 * 1024 * 1024:
-                raise serializers.ValidationError("File size cannot exceed 10MB.")
+            # Check file size
+            if value.size > MAX_CV_FILE_SIZE:
+                raise serializers.ValidationError(CV_FILE_SIZE_ERROR)
             
             # Check file type
             allowed_extensions = ['.pdf', '.doc', '.docx', '.txt']
@@ -258,3 +285,20 @@ class CandidateStatsSerializer(serializers.Serializer):
     recent_candidates = serializers.IntegerField()
     status_distribution = serializers.DictField()
     parsing_stats = serializers.DictField()
+
+class CandidateMatchSideSerializer(serializers.ModelSerializer):
+    """Serializer for one candidate of a likely duplicate pair"""
+    added_by_name = serializers.CharField(source='added_by.get_full_name', read_only=True)
+    
+    class Meta:
+        model = Candidate
+        fields = ['id', 'full_name', 'email', 'phone', 'status', 'added_by_name', 'created_at']
+
+class CandidateMatchSerializer(serializers.ModelSerializer):
+    """Serializer for CandidateMatch model"""
+    candidate_a = CandidateMatchSideSerializer(read_only=True)
+    candidate_b = CandidateMatchSideSerializer(read_only=True)
+    
+    class Meta:
+        model = CandidateMatch
+        fields = ['id', 'candidate_a', 'candidate_b', 'score', 'reasons', 'status', 'created_at']
@@ -0,0 +1,290 @@
+"""
+Services for applying CV parsing results and status changes to candidates
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+class CandidateParsingService:
+    """Parse candidate CVs and copy the parser output onto Candidate instances"""
+
+    # Only filled in when the candidate does not have a value yet
+    FILL_EMPTY_FIELDS = ['full_name', 'email', 'phone']
+
+    # Replaced whenever the parser found something
+    PARSED_FIELDS = [
+        'linkedin_url', 'github_url', 'summary', 'skills', 'education',
+        'work_experience', 'certifications', 'languages',
+    ]
+
+    @classmethod
+    def apply_parsed_data(cls, candidate, parsed_data: Dict[str, Any]) -> List[str]:
+        """
+        Update candidate attributes from parse_cv output without saving.
+
+        Returns the list of field names that were set.
+        """
+        update_fields = []
+
+        for field in cls.FILL_EMPTY_FIELDS:
+            if parsed_data.get(field) and not getattr(candidate, field):
+                setattr(candidate, field, parsed_data[field])
+                update_fields.append(field)
+
+        for field in cls.PARSED_FIELDS:
+            if parsed_data.get(field):
+                setattr(candidate, field, parsed_data[field])
+                update_fields.append(field)
+
+        if parsed_data.get('experience_years') is not None:
+            candidate.experience_years = parsed_data['experience_years']
+            update_fields.append('experience_years')
+
+        candidate.extracted_text = parsed_data.get('extracted_text', '')
+        candidate.extraction_confidence = parsed_data.get('extraction_confidence', 0.0)
+        update_fields.extend(['extracted_text', 'extraction_confidence'])
+        
+        # Cached results carry no timings, so the last real parse is kept
+        if getattr(settings, 'CV_PARSE_PERSIST_TIMINGS', False) and parsed_data.get('parse_timings'):
+            candidate.parse_timings = parsed_data['parse_timings']
+            update_fields.append('parse_timings')
+
+        return update_fields
+
+    @classmethod
+    def derived_fields(cls) -> List[str]:
+        """Fields computed from the extracted text alone"""
+        return cls.FILL_EMPTY_FIELDS + cls.PARSED_FIELDS + ['experience_years', 'extraction_confidence']
+    
+    @classmethod
+    def apply_reanalysis(cls, candidate, parsed_data: Dict[str, Any]) -> List[str]:
+        """
+        Update candidate attributes from parse_text output without saving.
+        
+        Returns only the derived fields whose value actually changed.
+        """
+        fields = cls.derived_fields()
+        before = {field: getattr(candidate, field) for field in fields}
+        cls.apply_parsed_data(candidate, parsed_data)
+        return [field for field in fields if getattr(candidate, field) != before[field]]
+    
+    @classmethod
+    def queue_parse(cls, candidate):
+        """Mark the candidate's CV as queued and hand it to a Celery worker once committed"""
+        candidate.parse_status = 'queued'
+        candidate.parse_error = ''
+        candidate.save(update_fields=['parse_status', 'parse_error', 'updated_at'])
+
+        if not getattr(settings, 'CV_PARSING_ASYNC', True):
+            cls.parse_candidate(candidate)
+            return
+
+        candidate_id = str(candidate.id)
+        transaction.on_commit(lambda: cls._dispatch_parse(candidate_id))
+
+    @staticmethod
+    def _dispatch_parse(candidate_id: str):
+        from .tasks import parse_candidate_cv
+
+        try:
+            parse_candidate_cv.delay(candidate_id)
+        except Exception as e:
+            logger.warning(f"Could not queue CV parsing for candidate {candidate_id}: {e}. Parsing inline.")
+            parse_candidate_cv.apply(args=[candidate_id])
+
+    @staticmethod
+    def get_parser():
+        """
+        The global parser. CandidatesConfig.ready() has set it to match skills
+        from the SkillTaxonomy table and to extract PDF and DOCX in the sandbox
+        when it is enabled
+        """
+        from .cv_parser import cv_parser
+        
+        return cv_parser
+    
+    @classmethod
+    def parse_candidate(cls, candidate):
+        """
+        Parse the candidate's CV, apply the results and record the parse status
+        and duration. Exceptions are re-raised after the failure is recorded.
+        """
+        from .models import CandidateActivity
+        from .parse_cache import parse_cache
+
+        candidate.parse_status = 'parsing'
+        candidate.save(update_fields=['parse_status', 'updated_at'])
+        start = time.perf_counter()
+
+        try:
+            with open(candidate.cv_file.path, 'rb') as f:
+                file_content = f.read()
+
+            # Reuse the cached result if these bytes were parsed before
+            parsed_data = parse_cache.parse_cv(cls.get_parser(), candidate.cv_file.name, file_content)
+            update_fields = cls.apply_parsed_data(candidate, parsed_data)
+        except Exception as e:
+            logger.error(f"Error parsing CV for candidate {candidate.id}: {e}")
+            cls._finish_parse(candidate, start, 'failed', str(e))
+            CandidateActivity.objects.create(
+                candidate=candidate,
+                activity_type='note',
+                description=f"CV parsing failed: {str(e)}",
+                user=candidate.added_by
+            )
+            raise
+
+        parse_error = parsed_data.get('error', '')
+        if parse_error and parsed_data.get('error_reason'):
+            parse_error = f"[{parsed_data['error_reason']}] {parse_error}"
+        cls._finish_parse(candidate, start, 'failed' if parse_error else 'parsed', parse_error, update_fields)
+
+        # Log parsing result
+        if parse_error:
+            description = f"CV parsing failed: {parse_error}"
+        else:
+            description = f"CV parsed successfully. Confidence: {candidate.extraction_confidence:.2f}. Updated fields: {', '.join(update_fields)}"
+        CandidateActivity.objects.create(
+            candidate=candidate,
+            activity_type='note',
+            description=description,
+            user=candidate.added_by
+        )
+        
+        if not parse_error:
+            cls.flag_duplicates(candidate)
+            cls.refresh_match_vector(candidate)
+        return candidate
+    
+    @staticmethod
+    def refresh_match_vector(candidate):
+        """Re-vectorize the candidate for job ranking; a failure only leaves its old vector in use"""
+        from scoring.vectors import CandidateVectorService
+        
+        try:
+            CandidateVectorService.refresh([candidate])
+        except Exception as e:
+            logger.warning(f"Could not update the match vector of candidate {candidate.id}: {e}")
+    
+    @classmethod
+    def flag_duplicates(cls, candidate):
+        """
+        Index the candidate's CV text and log an activity naming any likely
+        duplicates added by the same user. Returns the (candidate id, similarity) matches.
+        """
+        from .duplicate_index import DuplicateIndex
+        from .models import Candidate, CandidateActivity
+        
+        if not getattr(settings, 'CV_DUPLICATE_DETECTION', True):
+            return []
+        
+        try:
+            matches = DuplicateIndex.index_candidate(candidate, Candidate.objects.filter(added_by=candidate.added_by))
+        except Exception as e:
+            logger.warning(f"Duplicate detection failed for candidate {candidate.id}: {e}")
+            return []
+        
+        if matches:
+            CandidateActivity.objects.bulk_create(cls.duplicate_activities({candidate: matches}))
+        return matches
+    
+    @staticmethod
+    def duplicate_activities(matches_by_candidate) -> list:
+        """Unsaved 'possible duplicate' activities for {candidate: matches}"""
+        from .models import Candidate, CandidateActivity
+        
+        matched_ids = {candidate_id for matches in matches_by_candidate.values() for candidate_id, _score in matches}
+        names = {
+            candidate.pk: candidate.display_name
+            for candidate in Candidate.objects.filter(pk__in=matched_ids).only('full_name', 'first_name', 'last_name', 'email')
+        }
+        
+        activities = []
+        for candidate, matches in matches_by_candidate.items():
+            described = ', '.join(f"{names.get(candidate_id, candidate_id)} ({score:.0%})" for candidate_id, score in matches)
+            activities.append(CandidateActivity(
+                candidate=candidate,
+                activity_type='note',
+                description=f"Possible duplicate of: {described}",
+                metadata={'possible_duplicates': [
+                    {'candidate_id': str(candidate_id), 'similarity': score} for candidate_id, score in matches
+                ]},
+                user=candidate.added_by
+            ))
+        return activities
+
+    @staticmethod
+    def _finish_parse(candidate, start: float, parse_status: str, parse_error: str = '', update_fields=None):
+        candidate.parse_status = parse_status
+        candidate.parse_error = parse_error
+        candidate.parse_duration_ms = int((time.perf_counter() - start) * 1000)
+        candidate.parsed_at = timezone.now()
+        candidate.save(update_fields=(update_fields or []) + [
+            'parse_status', 'parse_error', 'parse_duration_ms', 'parsed_at', 'updated_at'
+        ])
+
+class CandidateStatusService:
+    """Move many candidates to a new pipeline status at once"""
+
+    # Candidate ids per UPDATE statement, under SQLite's bound parameter limit
+    BATCH_SIZE = 5000
+
+    @classmethod
+    @transaction.atomic
+    def bulk_update_status(cls, queryset, new_status: str, user=None, note: str = '',
+                           candidate_ids: Optional[List] = None) -> Dict[str, Any]:
+        """
+        Set new_status on every candidate in queryset, or on those of
+        candidate_ids within it, and log one 'status_changed' activity per
+        changed candidate.
+
+        The previous statuses are read with one locking query (per batch of
+        candidate_ids), rows are updated with one UPDATE per batch and
+        activities are bulk inserted, so the number of queries does not grow
+        with each candidate. Candidates already in new_status are left alone.
+        """
+        from .models import Candidate, CandidateActivity
+
+        start = time.perf_counter()
+        if candidate_ids is None:
+            selections = [queryset]
+        else:
+            selections = [
+                queryset.filter(pk__in=candidate_ids[offset:offset + cls.BATCH_SIZE])
+                for offset in range(0, len(candidate_ids), cls.BATCH_SIZE)
+            ]
+
+        old_statuses = []
+        for selection in selections:
+            # Locked through a subquery: filters such as the skills match group rows, which FOR UPDATE rejects
+            locked = Candidate.objects.select_for_update().filter(pk__in=selection.order_by().values('pk'))
+            old_statuses.extend(locked.exclude(status=new_status).values_list('id', 'status'))
+
+        now = timezone.now()
+        for offset in range(0, len(old_statuses), cls.BATCH_SIZE):
+            batch_ids = [candidate_id for candidate_id, _status in old_statuses[offset:offset + cls.BATCH_SIZE]]
+            Candidate.objects.filter(pk__in=batch_ids).update(status=new_status, updated_at=now)
+
+        activities = []
+        for candidate_id, old_status in old_statuses:
+            description = f"Bulk status change from {old_status} to {new_status}"
+            if note:
+                description += f". Note: {note}"
+            activities.append(CandidateActivity(
+                candidate_id=candidate_id,
+                activity_type='status_changed',
+                description=description,
+                metadata={'old_status': old_status, 'new_status': new_status, 'bulk': True},
+                user=user
+            ))
+        CandidateActivity.objects.bulk_create(activities, batch_size=cls.BATCH_SIZE)
+
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        logger.info(f"Bulk status update to {new_status}: {len(old_statuses)} candidates in {duration_ms}ms")
+        return {'updated_count': len(old_statuses), 'duration_ms': duration_ms}
@@ -0,0 +1,103 @@
+"""
+MinHash signatures and LSH band keys for near-duplicate CV detection
+"""
+import re
+import sys
+from array import array
+from hashlib import blake2b
+from typing import List, Optional, Set
+
+SHINGLE_SIZE = 3  # words per shingle
+
+# 16 bands of 8 rows: pairs with Jaccard similarity 0.8 share a band 95% of
+# the time, pairs at 0.5 only 6% of the time
+NUM_BANDS = 16
+ROWS_PER_BAND = 8
+SIGNATURE_SIZE = NUM_BANDS * ROWS_PER_BAND
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+_BIN_SHIFT = 64 - (SIGNATURE_SIZE - 1).bit_length()
+_VALUE_SHIFT = _BIN_SHIFT - 32
+_EMPTY = 0xFFFFFFFF + 1
+_ROTATION = 0x9E3779B1  # odd constant mixed into values copied into empty bins
+
+
+def shingle_hashes(text: str) -> Set[int]:
+    """64-bit hashes of the word 3-shingles of text, ignoring case and punctuation"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {_hash(' '.join(words))} if words else set()
+    return {
+        _hash(' '.join(words[i:i + SHINGLE_SIZE]))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(blake2b(shingle.encode(), digest_size=8).digest(), 'little')
+
+
+def minhash_signature(text: str) -> Optional[array]:
+    """
+    MinHash signature of text as SIGNATURE_SIZE unsigned 32-bit values, or
+    None when the text has no words.
+
+    Uses one-permutation hashing: the top bits of each shingle hash pick a
+    bin and the bin keeps its smallest value, so a CV is hashed once instead
+    of once per permutation. Empty bins borrow the value of the next
+    non-empty bin (rotation densification), which keeps equal bins an
+    unbiased estimate of Jaccard similarity and the bands usable for LSH.
+    """
+    hashes = shingle_hashes(text)
+    if not hashes:
+        return None
+
+    bins = [_EMPTY] * SIGNATURE_SIZE
+    for value in hashes:
+        index = value >> _BIN_SHIFT
+        value = (value >> _VALUE_SHIFT) & 0xFFFFFFFF
+        if value < bins[index]:
+            bins[index] = value
+
+    if _EMPTY in bins:
+        original = bins * 2
+        for i in range(SIGNATURE_SIZE):
+            if bins[i] == _EMPTY:
+                distance = 1
+                while original[i + distance] == _EMPTY:
+                    distance += 1
+                bins[i] = (original[i + distance] + distance * _ROTATION) & 0xFFFFFFFF
+
+    return array('I', bins)
+
+
+def band_keys(signature: array) -> List[int]:
+    """One signed 64-bit key per LSH band; equal keys mean an identical band"""
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = blake2b(bytes([band]) + pack_signature(rows), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def estimate_similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity: the fraction of equal signature values"""
+    return sum(x == y for x, y in zip(a, b)) / SIGNATURE_SIZE
+
+
+def pack_signature(signature: array) -> bytes:
+    """Little-endian bytes of a signature, 4 per value"""
+    if sys.byteorder == 'big':
+        signature = array('I', signature)
+        signature.byteswap()
+    return signature.tobytes()
+
+
+def unpack_signature(data: bytes) -> array:
+    signature = array('I')
+    signature.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        signature.byteswap()
+    return signature
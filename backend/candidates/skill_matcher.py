@@ -0,0 +1,144 @@
+"""
+Single-pass multi-keyword matcher used for skill extraction
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple, Any
+
+# Trie key marking the end of a keyword
+_END = None
+
+# Zero-width word boundary, evaluated against the character before ``pos``
+_BOUNDARY = re.compile(r'\b')
+
+
+class SkillMatcher:
+    """
+    Find every whole-word occurrence of a set of keywords in one scan.
+
+    The keywords are folded into a character trie which is compiled into a
+    single regular expression (a nested alternation, so each position costs
+    O(keyword length) instead of O(number of keywords)). The regex locates
+    every position where at least one keyword matches between two ``\\b``
+    boundaries, and the trie is then walked from those positions only to
+    report all keywords (including overlapping ones) that end there.
+
+    Matching semantics are identical to ``re.search(r'\\b' + re.escape(kw) + r'\\b', text)``
+    applied per keyword. Text is expected to be lowercased already.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._trie: Dict[Any, Any] = {}
+        seen = set()
+
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if not keyword or keyword in seen:
+                continue
+            seen.add(keyword)
+            self.keywords.append(keyword)
+
+            node = self._trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[_END] = keyword
+
+        if self.keywords:
+            self._pattern = re.compile(r'(?=\b' + self._build_regex(self._trie) + r'\b)')
+        else:
+            self._pattern = None
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    @classmethod
+    def _build_regex(cls, node: Dict[Any, Any]) -> str:
+        """Convert a trie node into an equivalent regex fragment"""
+        alternatives = [
+            re.escape(char) + cls._build_regex(child)
+            for char, child in sorted(node.items(), key=lambda item: item[0] or '')
+            if char is not _END
+        ]
+
+        if not alternatives:
+            return ''
+
+        if len(alternatives) == 1 and _END not in node:
+            return alternatives[0]
+
+        fragment = '(?:' + '|'.join(alternatives) + ')'
+        if _END in node:
+            fragment += '?'
+        return fragment
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, keyword)`` for every whole-word match in text"""
+        if self._pattern is None:
+            return
+
+        text_length = len(text)
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            node = self._trie
+            position = start
+
+            while position < text_length:
+                node = node.get(text[position])
+                if node is None:
+                    break
+                position += 1
+                if _END in node and _BOUNDARY.match(text, position):
+                    yield start, position, node[_END]
+
+    def match(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Return matched keywords with their counts and offsets.
+
+        The result maps each keyword to ``{'count': int, 'offsets': [(start, end), ...]}``
+        in order of first occurrence.
+        """
+        matches: Dict[str, Dict[str, Any]] = {}
+
+        for start, end, keyword in self.finditer(text):
+            entry = matches.get(keyword)
+            if entry is None:
+                entry = matches[keyword] = {'count': 0, 'offsets': []}
+            entry['count'] += 1
+            entry['offsets'].append((start, end))
+
+        return matches
+
+
+class SkillSet:
+    """
+    Canonical skills and their aliases compiled into one SkillMatcher.
+
+    Every alias resolves to its canonical name, and canonical names win over
+    aliases that collide with them. A SkillSet is also its own skill source:
+    ``get()`` returns itself, so CVParser can be given either a fixed
+    SkillSet or a source that rebuilds one when the taxonomy changes.
+    """
+
+    def __init__(self, skills: Iterable[Tuple[str, Iterable[str]]], version: str = 'builtin'):
+        self.version = version
+        self.names: Dict[str, str] = {}
+
+        skills = [(name, list(aliases)) for name, aliases in skills]
+        for name, _aliases in skills:
+            self.names.setdefault(name.lower(), name)
+        for name, aliases in skills:
+            for alias in aliases:
+                self.names.setdefault(alias.lower(), name)
+
+        self.matcher = SkillMatcher(self.names)
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str], version: str = 'builtin') -> 'SkillSet':
+        """Skill set without aliases, named by title-casing each keyword"""
+        return cls(((keyword.title(), []) for keyword in keywords), version)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self) -> 'SkillSet':
+        return self
@@ -0,0 +1,61 @@
+"""
+Skill set compiled from the SkillTaxonomy table and reloaded when it changes
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+
+from .skill_matcher import SkillSet
+
+logger = logging.getLogger(__name__)
+
+class DatabaseSkillSource:
+    """
+    Skill source for CVParser backed by SkillTaxonomy rows.
+
+    The compiled SkillSet is kept in memory and rebuilt only when
+    SkillTaxonomyVersion moves on. The version is read at most once every
+    CV_SKILL_TAXONOMY_CHECK_SECONDS, so taxonomy edits reach every process
+    within that interval without a restart.
+    """
+
+    def __init__(self):
+        self._skill_set: Optional[SkillSet] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> SkillSet:
+        from .models import SkillTaxonomyVersion
+
+        check_seconds = getattr(settings, 'CV_SKILL_TAXONOMY_CHECK_SECONDS', 5)
+        now = time.monotonic()
+        if self._skill_set is not None and now - self._checked_at < check_seconds:
+            return self._skill_set
+
+        with self._lock:
+            version = SkillTaxonomyVersion.current()
+            if version != self._version or self._skill_set is None:
+                self._skill_set = self.compile(version)
+                self._version = version
+            self._checked_at = now
+            return self._skill_set
+
+    @staticmethod
+    def compile(version: int) -> SkillSet:
+        from .models import SkillTaxonomy
+
+        rows = SkillTaxonomy.objects.filter(is_active=True).values_list('name', 'aliases')
+        skill_set = SkillSet(((name, aliases or []) for name, aliases in rows), version=f"taxonomy{version}")
+        logger.info(f"Compiled skill taxonomy v{version}: {len(skill_set)} terms")
+        return skill_set
+
+    def invalidate(self):
+        """Force a version check on the next get()"""
+        self._checked_at = 0.0
+
+# Skill source used by the global parser
+skill_source = DatabaseSkillSource()
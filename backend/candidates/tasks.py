@@ -0,0 +1,47 @@
+from celery import shared_task
+import logging
+
+from .bulk_upload import BulkUploadService
+from .models import Candidate
+from .services import CandidateParsingService
+
+logger = logging.getLogger(__name__)
+
+@shared_task
+def parse_candidate_cv(candidate_id):
+    """
+    Celery task to parse a candidate's uploaded CV
+
+    Not retried: a failed parse is recorded on the candidate and fails the
+    same way on the same file, so it is left for a reparse request.
+    """
+    try:
+        candidate = Candidate.objects.select_related('added_by').get(id=candidate_id)
+    except Candidate.DoesNotExist:
+        logger.warning(f"Candidate {candidate_id} was deleted before its CV could be parsed")
+        return {'status': 'missing', 'candidate_id': candidate_id}
+    
+    if not candidate.cv_file:
+        return {'status': 'skipped', 'candidate_id': candidate_id}
+    
+    try:
+        CandidateParsingService.parse_candidate(candidate)
+    except Exception as e:
+        # Failure is already recorded on the candidate
+        return {'status': 'failed', 'candidate_id': candidate_id, 'error': str(e)}
+    
+    return {
+        'status': candidate.parse_status,
+        'candidate_id': candidate_id,
+        'parse_duration_ms': candidate.parse_duration_ms,
+    }
+
+@shared_task
+def parse_bulk_upload_item(item_id):
+    """
+    Celery task to parse one file of a bulk CV upload
+    """
+    item = BulkUploadService.process_item(item_id)
+    if item is None:
+        return {'status': 'missing', 'item_id': item_id}
+    return {'status': item.status, 'item_id': item_id}
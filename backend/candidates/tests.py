@@ -2,19 +2,45 @@
 Tests for candidates app
 """
 import json
+import re
 import tempfile
+import zlib
+from contextlib import contextmanager
 from datetime import timedelta
-from django.test import TestCase
+from pathlib import Path
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.db.models import F
 from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import Candidate, CandidateTag, CandidateActivity
+from .models import Candidate, CandidateTag, CandidateActivity, CVParseCacheEntry, SkillTaxonomy, SkillTaxonomyVersion
 
 User = get_user_model()
 
+SELECT_LIST_PATTERN = re.compile(r'SELECT (.*?) FROM ', re.DOTALL)
+
+class QueryColumnsMixin:
+    """Assertions on the columns selected by the queries a block of code runs"""
+    
+    @contextmanager
+    def assertColumnsNotSelected(self, table, columns):
+        """Fail if any query selects one of columns from table; filtering on them is allowed"""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        
+        for query in context.captured_queries:
+            for select_list in SELECT_LIST_PATTERN.findall(query['sql']):
+                for column in columns:
+                    self.assertNotIn(
+                        connection.ops.quote_name(table) + '.' + connection.ops.quote_name(column), select_list,
+                        f"{table}.{column} selected by: {query['sql']}"
+                    )
+
 class CandidateModelTest(TestCase):
     """Test Candidate model"""
     
@@ -106,3 +132,1815 @@ class CVParsingTest(TestCase):
         data = json.loads(response.content)
         self.assertIn('cv_parsing_available', data)
         self.assertIn('message', data)
+
+class SkillMatcherTest(TestCase):
+    """Test single-pass skill matching"""
+    
+    def test_whole_word_matching(self):
+        """Test that keywords only match on word boundaries"""
+        from .skill_matcher import SkillMatcher
+        
+        matcher = SkillMatcher(['java', 'javascript', 'git', 'r'])
+        matches = matcher.match('javascript and git, not github or r&d in r')
+        
+        self.assertEqual(list(matches), ['javascript', 'git', 'r'])
+        self.assertEqual(matches['r']['count'], 2)
+    
+    def test_offsets_and_overlaps(self):
+        """Test that overlapping keywords are all reported with offsets"""
+        from .skill_matcher import SkillMatcher
+        
+        matcher = SkillMatcher(['machine', 'machine learning', 'learning'])
+        text = 'machine learning'
+        matches = matcher.match(text)
+        
+        self.assertEqual(matches['machine']['offsets'], [(0, 7)])
+        self.assertEqual(matches['machine learning']['offsets'], [(0, 16)])
+        self.assertEqual(matches['learning']['offsets'], [(8, 16)])
+
+    def test_duplicate_keywords_keep_first_order(self):
+        """Test that repeated and differently cased keywords are kept once, in first-seen order"""
+        from .skill_matcher import SkillMatcher
+
+        matcher = SkillMatcher(['Go', 'rust', 'go', '', 'RUST', 'zig'])
+
+        self.assertEqual(matcher.keywords, ['go', 'rust', 'zig'])
+    
+    def test_matches_legacy_regex_semantics(self):
+        """Test parity with a per-keyword \\b regex search"""
+        import re
+        from .cv_parser import CVParser
+        
+        parser = CVParser()
+        text = ('Senior engineer: Python, C++ and C#, ASP.NET, scikit-learn, Node, '
+                'R, Go, machine learning, github.com/someone, PostgreSQL; Docker/K8s').lower()
+        
+        expected = {
+            skill.title() for skill in parser.skill_keywords
+            if re.search(r'\b' + re.escape(skill) + r'\b', text)
+        }
+        
+        self.assertEqual(set(parser.extract_skills(text)), expected)
+    
+    def test_match_skills_counts(self):
+        """Test that CVParser.match_skills reports names and counts"""
+        from .cv_parser import CVParser
+        
+        result = CVParser().match_skills('Python developer. PYTHON, Django and python.')
+        by_keyword = {item['keyword']: item for item in result}
+        
+        self.assertEqual(by_keyword['python']['name'], 'Python')
+        self.assertEqual(by_keyword['python']['count'], 3)
+        self.assertEqual(by_keyword['django']['count'], 1)
+
+@override_settings(CV_SKILL_TAXONOMY_CHECK_SECONDS=0)
+class SkillTaxonomyTest(TestCase):
+    """Test the database-backed skill taxonomy"""
+    
+    def setUp(self):
+        from .cv_parser import CVParser
+        from .skill_taxonomy import DatabaseSkillSource
+        
+        self.source = DatabaseSkillSource()
+        self.parser = CVParser(hooks=[], skill_source=self.source)
+    
+    def test_aliases_resolve_to_canonical_names(self):
+        """Test that aliases are reported under their canonical name"""
+        skills = self.parser.extract_skills("Ran k8s clusters backed by postgres and PostgreSQL replicas")
+        
+        self.assertEqual(skills, ['Kubernetes', 'PostgreSQL'])
+    
+    def test_edits_are_picked_up_without_recompiling_each_time(self):
+        """Test that the matcher is rebuilt only when the taxonomy version changes"""
+        first = self.source.get()
+        self.assertIs(self.source.get(), first)
+        cache_version = self.parser.cache_version
+        
+        SkillTaxonomy.objects.create(name='Svelte', category='frameworks', aliases=['sveltekit'])
+        
+        self.assertIsNot(self.source.get(), first)
+        self.assertNotEqual(self.parser.cache_version, cache_version)
+        self.assertEqual(self.parser.extract_skills("Built apps with SvelteKit"), ['Svelte'])
+    
+    def test_bulk_changes_bump_version(self):
+        """Test that queryset updates and deletes invalidate the compiled taxonomy"""
+        version = SkillTaxonomyVersion.current()
+        SkillTaxonomy.objects.filter(name='Python').update(is_active=False)
+        
+        self.assertEqual(SkillTaxonomyVersion.current(), version + 1)
+        self.assertEqual(self.parser.extract_skills("Python and Django"), ['Django'])
+
+    def test_global_parser_uses_taxonomy(self):
+        """Test that the global parser matches the taxonomy from startup, before any service call"""
+        from .cv_parser import cv_parser
+        from .skill_taxonomy import skill_source
+
+        self.assertIs(cv_parser.skill_source, skill_source)
+        skill_source.invalidate()
+        self.assertEqual(cv_parser.extract_skills("Ran k8s clusters"), ['Kubernetes'])
+
+class BatchParsingTest(TestCase):
+    """Test batch CV parsing and bulk import"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.paths = []
+        for i in range(3):
+            path = f"{self.tmpdir.name}/cv_{i}.txt"
+            with open(path, 'w') as f:
+                f.write(f"Jane Doe{i}\ncandidate{i}@example.com\nSkills\nPython, Django, Docker\n")
+            self.paths.append(path)
+        self.empty_path = f"{self.tmpdir.name}/empty.txt"
+        open(self.empty_path, 'w').close()
+    
+    def test_parse_many_preserves_order(self):
+        """Test parse_many yields one result per path in input order"""
+        from .cv_parser import cv_parser
+        
+        paths = self.paths + [self.empty_path, f"{self.tmpdir.name}/missing.txt"]
+        results = list(cv_parser.parse_many(iter(paths), max_workers=2, max_pending=2))
+        
+        self.assertEqual([path for path, _ in results], paths)
+        self.assertEqual(results[0][1]['email'], 'candidate0@example.com')
+        self.assertIn('error', results[3][1])
+        self.assertIn('error', results[4][1])
+    
+    def test_import_cvs_command(self):
+        """Test import_cvs bulk-creates candidates and reports failures"""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        Candidate.objects.create(email='candidate2@example.com')
+        out, err = StringIO(), StringIO()
+        call_command('import_cvs', self.tmpdir.name, '--workers', '1', '--no-store', stdout=out, stderr=err)
+        
+        self.assertEqual(Candidate.objects.filter(email__in=['candidate0@example.com', 'candidate1@example.com']).count(), 2)
+        self.assertEqual(CandidateActivity.objects.filter(activity_type='cv_uploaded').count(), 2)
+        self.assertIn('Imported 2 CVs, 2 failed', out.getvalue())
+        self.assertIn('empty.txt', err.getvalue())
+        self.assertIn('already exists', err.getvalue())
+
+class ReanalyzeCandidatesTest(TestCase):
+    """Test text-only re-analysis of stored CV text"""
+    
+    TEXT = "Jane Doe\njane@example.com\nSkills\nPython, Django, Docker\n"
+    
+    def setUp(self):
+        from .cv_parser import cv_parser
+        
+        current = cv_parser.parse_text(self.TEXT)
+        self.stale = Candidate.objects.create(full_name='Jane Doe', extracted_text=self.TEXT, skills=['Python'])
+        self.current = Candidate.objects.create(
+            full_name='Jane Doe', email='jane@example.com', extracted_text=self.TEXT,
+            **{field: current[field] for field in ['skills', 'extraction_confidence', 'phone']}
+        )
+        self.taken = Candidate.objects.create(
+            full_name='John Roe', extracted_text=self.TEXT.replace('Jane Doe', 'John Roe'), skills=[]
+        )
+        self.long_ago = timezone.now() - timedelta(days=30)
+        Candidate.objects.update(updated_at=self.long_ago)
+    
+    def test_parse_text_matches_parse_cv(self):
+        """Test that re-analysis gives the same result as parsing the file"""
+        from .cv_parser import CVParser
+        
+        parser = CVParser(hooks=[])
+        from_file = parser.parse_cv('cv.txt', self.TEXT.encode())
+        from_text = parser.parse_text(self.TEXT)
+        from_file.pop('parse_timings')
+        from_text.pop('parse_timings')
+        
+        self.assertEqual(from_file, from_text)
+    
+    def test_only_changed_rows_are_updated(self):
+        """Test that unchanged rows keep updated_at and taken emails are not copied"""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        out, err = StringIO(), StringIO()
+        call_command('reanalyze_candidates', '--workers', '2', stdout=out, stderr=err)
+        
+        self.stale.refresh_from_db()
+        self.current.refresh_from_db()
+        self.taken.refresh_from_db()
+        self.assertEqual(self.stale.skills, ['Python', 'Django', 'Docker'])
+        self.assertGreater(self.stale.updated_at, self.long_ago)
+        self.assertEqual(self.current.updated_at, self.long_ago)
+        self.assertEqual(self.taken.skills, ['Python', 'Django', 'Docker'])
+        self.assertIsNone(self.taken.email)
+        self.assertIn('Updated 2', out.getvalue())
+        self.assertIn('already in use', err.getvalue())
+    
+    def test_dry_run(self):
+        """Test that --dry-run reports without saving"""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        out = StringIO()
+        call_command('reanalyze_candidates', '--workers', '1', '--dry-run', stdout=out, stderr=StringIO())
+        
+        self.stale.refresh_from_db()
+        self.assertEqual(self.stale.skills, ['Python'])
+        self.assertIn('Would update 2', out.getvalue())
+
+class ParseCacheTest(TestCase):
+    """Test the content-addressed parse result cache"""
+    
+    CV_CONTENT = b'Jane Doe\njane@example.com\nExperienced Python developer'
+    
+    def setUp(self):
+        from .cv_parser import CVParser
+        from .parse_cache import ParseCache
+        
+        self.parser = CVParser()
+        self.cache = ParseCache()
+        self.calls = 0
+        original_parse_cv = self.parser.parse_cv
+        
+        def counting_parse_cv(*args, **kwargs):
+            self.calls += 1
+            return original_parse_cv(*args, **kwargs)
+        
+        self.parser.parse_cv = counting_parse_cv
+    
+    @override_settings(CV_PARSE_CACHE_TOUCH_SECONDS=0)
+    def test_identical_content_is_parsed_once(self):
+        """Test that re-parsing identical bytes is served from the cache"""
+        first = self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+        second = self.cache.parse_cv(self.parser, 'renamed.txt', self.CV_CONTENT)
+        
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(first['email'], second['email'])
+        self.assertEqual(CVParseCacheEntry.objects.get().hit_count, 1)
+    
+    def test_parser_version_bump_invalidates(self):
+        """Test that a new parser version misses the cache"""
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+        self.parser.VERSION = 'next'
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+        
+        self.assertEqual(self.calls, 2)
+    
+    def test_failed_extractions_are_not_cached(self):
+        """Test that error results are retried"""
+        self.cache.parse_cv(self.parser, 'a.txt', b'')
+        self.cache.parse_cv(self.parser, 'a.txt', b'')
+        
+        self.assertEqual(self.calls, 2)
+        self.assertFalse(CVParseCacheEntry.objects.exists())
+    
+    def test_recent_hits_are_not_written_back(self):
+        """Test that hits within the touch interval are reads, with their count added on the next write"""
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+        with self.assertNumQueries(2):
+            self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+            self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+        self.assertEqual(CVParseCacheEntry.objects.get().hit_count, 0)
+        
+        CVParseCacheEntry.objects.update(last_used_at=timezone.now() - timedelta(days=1))
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+        entry = CVParseCacheEntry.objects.get()
+        self.assertEqual(entry.hit_count, 3)
+        self.assertGreater(entry.last_used_at, timezone.now() - timedelta(minutes=1))
+    
+    @override_settings(CV_PARSE_CACHE_MAX_ENTRIES=1, CV_PARSE_CACHE_EVICT_EVERY=3)
+    def test_eviction_runs_every_n_stores(self):
+        """Test that limits are checked on the first store and then every Nth"""
+        for i in range(3):
+            self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT + str(i).encode())
+        self.assertEqual(CVParseCacheEntry.objects.count(), 3)
+        
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT + b'3')
+        self.assertEqual(CVParseCacheEntry.objects.count(), 1)
+    
+    def test_parser_limits_are_part_of_the_key(self):
+        """Test that a parser with different extraction limits does not share entries"""
+        from .cv_parser import CVParser
+        
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+        truncating = CVParser(max_text_chars=10)
+        self.cache.parse_cv(truncating, 'a.txt', self.CV_CONTENT)
+        
+        self.assertNotEqual(truncating.cache_version, self.parser.cache_version)
+        self.assertEqual(CVParser().cache_version, self.parser.cache_version)
+        self.assertEqual(CVParseCacheEntry.objects.count(), 2)
+    
+    @override_settings(CV_PARSE_CACHE_MAX_ENTRIES=2, CV_PARSE_CACHE_EVICT_EVERY=1)
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        for i in range(2):
+            self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT + str(i).encode())
+        CVParseCacheEntry.objects.filter(hit_count=0).update(last_used_at=timezone.now() - timedelta(days=1))
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT + b'0')
+        self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT + b'2')
+        
+        hashes = set(CVParseCacheEntry.objects.values_list('content_hash', flat=True))
+        self.assertEqual(hashes, {
+            self.cache.content_hash(self.CV_CONTENT + b'0'),
+            self.cache.content_hash(self.CV_CONTENT + b'2'),
+        })
+    
+    def test_filesystem_backend(self):
+        """Test the filesystem backend round trip and eviction"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with override_settings(CV_PARSE_CACHE_BACKEND='filesystem', CV_PARSE_CACHE_DIR=cache_dir,
+                                   CV_PARSE_CACHE_MAX_ENTRIES=1, CV_PARSE_CACHE_EVICT_EVERY=1):
+                self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+                self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT)
+                self.cache.parse_cv(self.parser, 'a.txt', self.CV_CONTENT + b'!')
+                
+                self.assertEqual(self.calls, 2)
+                self.assertEqual(len(list(Path(cache_dir).glob('*/*/*.json'))), 1)
+
+def build_pdf(pages, padding=0):
+    """
+    Build a minimal PDF with one line of Helvetica text per entry in each page.
+    
+    With ``padding``, each content stream is followed by that many spaces and
+    Flate-compressed, which makes a small file that inflates to a huge one.
+    """
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    
+    for lines in pages:
+        stream = b'BT /F1 11 Tf 14 TL 50 800 Td ' + b' '.join(
+            b'(' + line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1') + b') Tj T*'
+            for line in lines
+        ) + b' ET'
+        stream_filter = b''
+        if padding:
+            stream = zlib.compress(stream + b' ' * padding, 1)
+            stream_filter = b' /Filter /FlateDecode'
+        objects.append(b'<< /Length %d%s >>\nstream\n' % (len(stream), stream_filter) + stream + b'\nendstream')
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        page_ids.append(len(objects))
+    
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % page_id for page_id in page_ids), len(page_ids))
+    
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+class PDFExtractionTest(TestCase):
+    """Test streaming, page-bounded PDF extraction"""
+    
+    def test_extracts_all_pages(self):
+        """Test that every page's text is extracted in order"""
+        from .cv_parser import CVParser
+        
+        pdf = build_pdf([['Jane Doe', 'jane@example.com'], ['Python developer']])
+        text = CVParser().extract_text_from_pdf(pdf)
+        
+        self.assertEqual(text.split('\n'), ['Jane Doe', 'jane@example.com', 'Python developer'])
+    
+    def test_page_and_character_limits(self):
+        """Test max page count and character budget"""
+        from .cv_parser import CVParser
+        
+        pdf = build_pdf([[f'Page {i} ' + 'x' * 50] for i in range(10)])
+        
+        self.assertEqual(len(list(CVParser(max_pdf_pages=4).iter_pdf_pages(pdf))), 4)
+        self.assertEqual(len(CVParser(max_text_chars=120).extract_text_from_pdf(pdf)), 120)
+    
+    def test_early_stop(self):
+        """Test that early-stop mode stops reading once enough text is gathered"""
+        from .cv_parser import CVParser
+        
+        pdf = build_pdf([[f'Page {i} ' + 'x' * 50] for i in range(10)])
+        text = CVParser(early_stop_chars=100).extract_text_from_pdf(pdf)
+        
+        self.assertEqual(text.count('Page'), 2)
+    
+    def test_stops_on_pdf_without_text_layer(self):
+        """Test that image-only PDFs are abandoned after the leading empty pages"""
+        from .cv_parser import CVParser
+        
+        parser = CVParser()
+        pdf = build_pdf([[] for _ in range(parser.MAX_LEADING_EMPTY_PAGES)] + [['Late text']])
+        
+        self.assertEqual(parser.extract_text_from_pdf(pdf), '')
+
+def build_docx(body, header=None):
+    """Build a DOCX package from raw WordprocessingML body and optional header content"""
+    import io
+    import zipfile
+    
+    namespaces = (
+        'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    )
+    parts = {'word/document.xml': f'<w:document {namespaces}><w:body>{body}</w:body></w:document>'}
+    if header is not None:
+        parts['word/header1.xml'] = f'<w:hdr {namespaces}>{header}</w:hdr>'
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+class DocxExtractionTest(TestCase):
+    """Test streaming DOCX extraction"""
+    
+    def test_headers_tables_and_text_boxes(self):
+        """Test that header, table and text box text is extracted once, in reading order"""
+        from .cv_parser import CVParser
+        
+        text_box = '<w:txbxContent><w:p><w:r><w:t>Python, Django</w:t></w:r></w:p></w:txbxContent>'
+        body = (
+            '<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:tab/><w:t xml:space="preserve">Doe </w:t></w:r></w:p>'
+            '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Skills</w:t></w:r></w:p></w:tc>'
+            '<w:tc><w:p><w:r><w:t>AWS</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+            f'<w:p><w:r><mc:AlternateContent><mc:Choice>{text_box}</mc:Choice>'
+            f'<mc:Fallback>{text_box}</mc:Fallback></mc:AlternateContent></w:r></w:p>'
+        )
+        docx = build_docx(body, header='<w:p><w:r><w:t>jane@example.com</w:t></w:r></w:p>')
+        
+        self.assertEqual(
+            CVParser().extract_text_from_docx(docx).split('\n'),
+            ['jane@example.com', 'Jane\tDoe ', 'Skills', 'AWS', 'Python, Django']
+        )
+    
+    def test_character_limit_and_invalid_files(self):
+        """Test the text budget and that broken files give empty text"""
+        from .cv_parser import CVParser
+        
+        body = ''.join(f'<w:p><w:r><w:t>Paragraph {i}</w:t></w:r></w:p>' for i in range(100))
+        
+        self.assertEqual(len(CVParser(max_text_chars=50).extract_text_from_docx(build_docx(body))), 50)
+        self.assertEqual(CVParser().extract_text_from_docx(b'not a zip'), '')
+
+class ExtractionSandboxTest(TestCase):
+    """Test out-of-process extraction with time and memory limits"""
+    
+    def setUp(self):
+        from .cv_parser import CVParser
+        from .extraction_sandbox import ExtractionSandbox
+        
+        self.parser = CVParser(hooks=[])
+        self.sandbox = ExtractionSandbox(self.parser, max_workers=1, timeout=30, memory_limit_mb=256)
+        self.addCleanup(self.sandbox.shutdown)
+        self.parser.sandbox = self.sandbox
+    
+    def test_extracts_in_child_process(self):
+        """Test that sandboxed extraction matches in-process extraction"""
+        pdf = build_pdf([['Jane Doe', 'jane@example.com']])
+        result = self.parser.parse_cv('cv.pdf', pdf)
+        
+        self.assertEqual(result['email'], 'jane@example.com')
+        self.assertEqual(self.parser.extract_text_from_pdf(pdf), result['extracted_text'])
+    
+    def test_timeout_recycles_worker(self):
+        """Test that a slow document returns a timeout error and the next job still works"""
+        self.sandbox.timeout = 0.01
+        result = self.parser.parse_cv('slow.pdf', build_pdf([[f'Line {i}'] * 40 for i in range(40)]))
+        
+        self.assertEqual(result['error_reason'], 'timeout')
+        self.assertEqual(result['extraction_confidence'], 0.0)
+        
+        self.sandbox.timeout = 30
+        result = self.parser.parse_cv('cv.pdf', build_pdf([['Jane Doe', 'jane@example.com']]))
+        self.assertEqual(result['email'], 'jane@example.com')
+    
+    def test_memory_limit(self):
+        """Test that a decompression bomb hits the memory ceiling instead of exhausting the host"""
+        result = self.parser.parse_cv('bomb.pdf', build_pdf([['Jane Doe']], padding=512 * 1024 * 1024))
+        
+        self.assertEqual(result['error_reason'], 'memory_limit')
+
+class ConfidenceScoringTest(TestCase):
+    """Test that confidence scoring from CVFeatures matches the recorded scores"""
+    
+    def setUp(self):
+        from .cv_parser import CVParser
+        
+        self.parser = CVParser()
+        with open(Path(__file__).parent / 'testdata' / 'confidence_golden.json') as f:
+            self.cases = json.load(f)
+    
+    def test_scores_match_golden_values(self):
+        """Test confidence and breakdown are identical to the pre-CVFeatures implementation"""
+        for case in self.cases:
+            with self.subTest(case=case['name']):
+                args = (case['text'], case['contact_info'], case['full_name'], case['skills'])
+                
+                self.assertEqual(self.parser.calculate_confidence(*args), case['expected_confidence'])
+                self.assertEqual(self.parser.get_confidence_breakdown(*args), case['expected_breakdown'])
+    
+    def test_shared_features_give_same_result(self):
+        """Test that passing precomputed features does not change the result"""
+        case = self.cases[0]
+        args = (case['text'], case['contact_info'], case['full_name'], case['skills'])
+        features = self.parser.analyze_text(case['text'])
+        
+        self.assertEqual(self.parser.get_confidence_breakdown(*args, features=features), case['expected_breakdown'])
+        self.assertEqual(self.parser.calculate_confidence(*args, features=features), case['expected_confidence'])
+
+class ParseTimingTest(TestCase):
+    """Test per-stage timing hooks in parse_cv"""
+    
+    CV_CONTENT = b'Jane Doe\njane@example.com\nExperience\nPython developer since 2019'
+    STAGES = ['extraction', 'contact_info', 'skills', 'sections', 'confidence', 'total']
+    
+    def test_hooks_receive_every_stage(self):
+        """Test that hooks are called per stage and timings are returned"""
+        from .cv_parser import CVParser
+        from .parse_timing import HistogramParseHook, ParseHook
+        
+        class RecordingHook(ParseHook):
+            def __init__(self):
+                self.stages = []
+            
+            def stage_finished(self, file_path, stage, wall_ms, cpu_ms):
+                self.stages.append(stage)
+        
+        recorder, histograms = RecordingHook(), HistogramParseHook()
+        parser = CVParser(hooks=[recorder, histograms])
+        result = parser.parse_cv('cv.txt', self.CV_CONTENT)
+        parser.parse_cv('cv.txt', self.CV_CONTENT)
+        
+        self.assertEqual(list(result['parse_timings']), self.STAGES)
+        self.assertEqual(recorder.stages, self.STAGES[:-1] * 2)
+        
+        snapshot = histograms.snapshot()
+        self.assertEqual(set(snapshot), set(self.STAGES))
+        self.assertEqual(snapshot['total']['count'], 2)
+        self.assertEqual(sum(snapshot['extraction']['buckets'].values()), 2)
+    
+    def test_failing_hook_does_not_break_parsing(self):
+        """Test that hook exceptions are swallowed"""
+        from .cv_parser import CVParser
+        from .parse_timing import ParseHook
+        
+        class BrokenHook(ParseHook):
+            def parse_finished(self, file_path, timings):
+                raise RuntimeError('boom')
+        
+        with self.assertLogs('candidates.parse_timing', level='WARNING'):
+            result = CVParser(hooks=[BrokenHook()]).parse_cv('cv.txt', self.CV_CONTENT)
+        self.assertEqual(result['email'], 'jane@example.com')
+    
+    def test_cached_results_have_no_timings(self):
+        """Test that timings are not replayed from the parse cache"""
+        from .cv_parser import CVParser
+        from .parse_cache import ParseCache
+        
+        parser, cache = CVParser(hooks=[]), ParseCache()
+        self.assertIn('parse_timings', cache.parse_cv(parser, 'cv.txt', self.CV_CONTENT))
+        self.assertNotIn('parse_timings', cache.parse_cv(parser, 'cv.txt', self.CV_CONTENT))
+
+class AsyncCVParsingTest(APITestCase):
+    """Test CV parsing through Celery and the parse status lifecycle"""
+    
+    def setUp(self):
+        from core.celery import app
+        
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+        
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+    
+    def upload(self, content=b'Jane Doe\njane@example.com\nSkills\nPython, Django', filename='cv.txt'):
+        cv_file = SimpleUploadedFile(filename, content)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post('/api/candidates/', {'full_name': 'Jane Doe', 'cv_file': cv_file}, format='multipart')
+        return response, callbacks
+    
+    def test_upload_queues_parsing(self):
+        """Test that upload returns before parsing and the task completes it"""
+        response, callbacks = self.upload()
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['parse_status'], 'queued')
+        self.assertEqual(len(callbacks), 1)
+        
+        candidate = Candidate.objects.get(id=response.data['id'])
+        self.assertEqual(candidate.parse_status, 'parsed')
+        self.assertEqual(candidate.email, 'jane@example.com')
+        self.assertEqual(candidate.skills, ['Python', 'Django'])
+        self.assertIsNotNone(candidate.parse_duration_ms)
+    
+    def test_failed_parse_is_recorded(self):
+        """Test that an unparseable CV ends in the failed state"""
+        response, _ = self.upload(content=b'not really a pdf', filename='cv.pdf')
+        
+        candidate = Candidate.objects.get(id=response.data['id'])
+        self.assertEqual(candidate.parse_status, 'failed')
+        self.assertEqual(candidate.parse_error, 'Could not extract text from file')
+    
+    def test_parse_status_endpoints(self):
+        """Test polling one candidate and bulk-querying many"""
+        first, _ = self.upload()
+        second = Candidate.objects.create(full_name='No CV', added_by=self.user)
+        
+        response = self.client.get(f"/api/candidates/{first.data['id']}/parse_status/")
+        self.assertEqual(response.data['parse_status'], 'parsed')
+        
+        response = self.client.get(f"/api/candidates/parse_statuses/?ids={first.data['id']},{second.id}")
+        statuses = {str(item['id']): item['parse_status'] for item in response.data['results']}
+        self.assertEqual(statuses, {first.data['id']: 'parsed', str(second.id): ''})
+        
+        response = self.client.post('/api/candidates/parse_statuses/', {'candidate_ids': ['not-a-uuid']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    @override_settings(CV_PARSE_PERSIST_TIMINGS=True)
+    def test_timings_are_persisted(self):
+        """Test that stage timings are stored and the slowest parses can be listed"""
+        from .parse_cache import parse_cache
+        parse_cache.clear()
+        
+        response, _ = self.upload()
+        candidate = Candidate.objects.get(id=response.data['id'])
+        self.assertIn('extraction', candidate.parse_timings)
+        
+        Candidate.objects.create(full_name='Unparsed', added_by=self.user)
+        response = self.client.get('/api/candidates/slowest_parses/?limit=5')
+        self.assertEqual([str(item['id']) for item in response.data['results']], [str(candidate.id)])
+        self.assertEqual(response.data['results'][0]['parse_timings'], candidate.parse_timings)
+
+class DuplicateDetectionTest(APITestCase):
+    """Test the MinHash LSH near-duplicate index"""
+    
+    CV_TEXT = (
+        "Jane Doe\nSenior software engineer with eight years of experience building web platforms.\n"
+        "Experience\nLed the payments team at Acme from 2019 to 2024, migrating billing to Django and PostgreSQL.\n"
+        "Designed an event pipeline on Kafka processing two million messages a day with strict ordering.\n"
+        "Mentored six engineers and introduced code review guidelines adopted across the department.\n"
+        "Education\nBachelor of Science in Computer Science, State University, 2015.\n"
+        "Skills\nPython, Django, PostgreSQL, Docker, Kubernetes, AWS, Terraform, React.\n"
+    )
+    OTHER_TEXT = (
+        "John Roe\nData analyst focused on retail forecasting and reporting.\n"
+        "Built weekly sales dashboards in Tableau and Power BI for regional managers.\n"
+        "Automated inventory reconciliation with Excel macros and SQL stored procedures.\n"
+        "Education\nMaster of Arts in Economics, City College, 2018.\n"
+    )
+    
+    def setUp(self):
+        from core.celery import app
+        
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+        
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.other_user = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+    
+    def edited(self):
+        return self.CV_TEXT.replace('eight years', '9 years').replace('six engineers', 'seven engineers')
+    
+    def upload(self, content, filename='cv.txt'):
+        cv_file = SimpleUploadedFile(filename, content.encode())
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/candidates/', {'full_name': 'Jane Doe', 'cv_file': cv_file}, format='multipart')
+        return response.data['id']
+    
+    def test_signature_estimates_similarity(self):
+        """Test that small edits keep a high estimate and share LSH bands"""
+        from .similarity import band_keys, estimate_similarity, minhash_signature, pack_signature, unpack_signature
+        
+        original = minhash_signature(self.CV_TEXT)
+        edited = minhash_signature(self.edited())
+        unrelated = minhash_signature(self.OTHER_TEXT)
+        
+        self.assertGreaterEqual(estimate_similarity(original, edited), 0.7)
+        self.assertLess(estimate_similarity(original, unrelated), 0.2)
+        self.assertTrue(set(band_keys(original)) & set(band_keys(edited)))
+        self.assertEqual(estimate_similarity(original, minhash_signature(self.CV_TEXT.upper())), 1.0)
+        self.assertEqual(unpack_signature(pack_signature(original)), original)
+        self.assertEqual(len(pack_signature(original)), 512)
+        self.assertIsNone(minhash_signature(' -- '))
+    
+    def test_upload_reports_duplicates(self):
+        """Test that re-uploading an edited CV flags the earlier candidate"""
+        first_id = self.upload(self.CV_TEXT)
+        self.upload(self.OTHER_TEXT)
+        second_id = self.upload(self.edited())
+        
+        response = self.client.get(f"/api/candidates/{second_id}/parse_status/")
+        self.assertEqual([str(item['id']) for item in response.data['possible_duplicates']], [first_id])
+        self.assertGreaterEqual(response.data['possible_duplicates'][0]['similarity'], 0.7)
+        
+        activity = CandidateActivity.objects.get(candidate_id=second_id, description__startswith='Possible duplicate')
+        self.assertEqual(activity.metadata['possible_duplicates'][0]['candidate_id'], first_id)
+        
+        response = self.client.get(f"/api/candidates/{first_id}/duplicates/?threshold=0.5")
+        self.assertEqual([str(item['id']) for item in response.data['results']], [second_id])
+    
+    def test_duplicates_are_scoped_to_user(self):
+        """Test that other users' candidates are never reported"""
+        from .duplicate_index import DuplicateIndex
+        
+        theirs = Candidate.objects.create(full_name='Jane Doe', extracted_text=self.CV_TEXT, added_by=self.other_user)
+        DuplicateIndex.index_candidate(theirs)
+        
+        candidate_id = self.upload(self.edited())
+        response = self.client.get(f"/api/candidates/{candidate_id}/duplicates/")
+        self.assertEqual(response.data['results'], [])
+    
+    def test_index_many_matches_within_batch_and_index(self):
+        """Test that bulk indexing matches existing and same-batch candidates"""
+        from .duplicate_index import DuplicateIndex
+        
+        existing = Candidate.objects.create(full_name='Jane Doe', extracted_text=self.CV_TEXT)
+        DuplicateIndex.index_candidate(existing)
+        
+        first = Candidate.objects.create(full_name='Jane Doe', extracted_text=self.edited())
+        second = Candidate.objects.create(full_name='John Roe', extracted_text=self.OTHER_TEXT)
+        third = Candidate.objects.create(full_name='John Roe', extracted_text=self.OTHER_TEXT + "Languages\nSpanish\n")
+        
+        with self.assertNumQueries(6):
+            matches = DuplicateIndex.index_many([
+                (candidate.pk, candidate.extracted_text) for candidate in (first, second, third)
+            ])
+        
+        self.assertEqual([candidate_id for candidate_id, _score in matches[first.pk]], [existing.pk])
+        self.assertNotIn(second.pk, matches)
+        self.assertEqual([candidate_id for candidate_id, _score in matches[third.pk]], [second.pk])
+        self.assertEqual(DuplicateIndex.find_for(second)[0][0], third.pk)
+    
+    def test_import_flags_duplicates(self):
+        """Test that import_cvs indexes candidates and logs likely duplicates"""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, 'a.txt').write_text(self.CV_TEXT)
+            Path(directory, 'b.txt').write_text(self.edited())
+            out = StringIO()
+            call_command('import_cvs', directory, '--workers', '1', '--no-store', stdout=out, stderr=StringIO())
+        
+        self.assertIn('1 possible duplicates', out.getvalue())
+        self.assertEqual(CandidateActivity.objects.filter(description__startswith='Possible duplicate').count(), 1)
+
+class EntityResolutionTest(APITestCase):
+    """Test blocking keys, pair scoring and candidate merging"""
+    
+    def setUp(self):
+        self.recruiter = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.jane = Candidate.objects.create(
+            full_name='Jane Doe', email='Jane.Doe@Example.com', phone='(555) 010-0123',
+            skills=['Python'], added_by=self.recruiter
+        )
+        self.jane_again = Candidate.objects.create(
+            full_name='Doe, Jane', phone='+1 555 010 0123', skills=['Python', 'Django'],
+            location='Colombo', added_by=self.other
+        )
+        self.namesake = Candidate.objects.create(full_name='Jane Doe', phone='555 999 0000', added_by=self.other)
+    
+    def test_match_keys(self):
+        """Test email, E.164 phone and name normalization"""
+        from .match_keys import email_key, name_key, phone_key
+        
+        self.assertEqual(email_key('  Jane.Doe@Example.COM '), 'jane.doe@example.com')
+        self.assertEqual(phone_key('(555) 010-0123'), '+15550100123')
+        self.assertEqual(phone_key('+44 (0)20 7946 0958'), '+442079460958')
+        self.assertEqual(phone_key('0044 20 7946 0958'), '+442079460958')
+        self.assertEqual(phone_key('077 123 4567', country_code='94'), '+94771234567')
+        self.assertEqual(phone_key('(555) 010-0123 ext. 12'), '+15550100123')
+        self.assertEqual(phone_key('12-34'), '')
+        self.assertEqual(name_key('Doe, Jane'), name_key('  jane  DOE '))
+        self.assertEqual(name_key('José Núñez'), 'jose nunez')
+        self.assertEqual(name_key('Jane'), '')
+        
+        self.assertEqual(self.jane.match_email, 'jane.doe@example.com')
+        self.assertEqual(self.jane.match_phone, self.jane_again.match_phone)
+        self.assertEqual(self.jane.match_name, 'doe jane')
+    
+    def test_keys_follow_updates(self):
+        """Test that saving with update_fields also refreshes the keys"""
+        self.jane.phone = '+94 77 123 4567'
+        self.jane.save(update_fields=['phone'])
+        
+        self.assertEqual(Candidate.objects.get(pk=self.jane.pk).match_phone, '+94771234567')
+    
+    def test_resolver_scores_pairs_within_blocks(self):
+        """Test that blocked pairs are scored once and only likely duplicates are stored"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import CandidateMatch
+        
+        Candidate.objects.create(full_name='Someone Else', added_by=self.other)
+        Candidate.objects.update(match_email='', match_phone='', match_name='')
+        
+        out = StringIO()
+        call_command('resolve_candidates', stdout=out)
+        
+        self.assertIn('Refreshed blocking keys of 4 candidates', out.getvalue())
+        # jane/jane_again share phone and name, the namesake only a name with both
+        self.assertIn('Scored 3 pairs', out.getvalue())
+        match = CandidateMatch.objects.get()
+        self.assertEqual({match.candidate_a_id, match.candidate_b_id}, {self.jane.pk, self.jane_again.pk})
+        self.assertEqual(match.reasons, ['phone', 'name'])
+        
+        # Re-running keeps a dismissal
+        CandidateMatch.objects.update(status='dismissed')
+        call_command('resolve_candidates', '--skip-refresh', stdout=StringIO())
+        self.assertEqual(CandidateMatch.objects.get().status, 'dismissed')
+    
+    def test_oversized_blocks_are_skipped(self):
+        """Test that a key shared by too many candidates is not expanded into pairs"""
+        from .entity_resolution import CandidateResolver
+        
+        resolver = CandidateResolver(max_block_size=2)
+        stats = resolver.run()
+        
+        self.assertEqual(stats['skipped_blocks'], 1)
+        self.assertEqual(stats['pairs_scored'], 1)
+    
+    def test_merge_repoints_related_rows(self):
+        """Test that merging moves activities, tags and interviews and deletes duplicates"""
+        from interviews.models import Interview, InterviewType
+        from .models import CandidateTagAssignment
+        
+        python_tag = CandidateTag.objects.create(name='python')
+        senior_tag = CandidateTag.objects.create(name='senior')
+        CandidateTagAssignment.objects.create(candidate=self.jane, tag=python_tag)
+        CandidateTagAssignment.objects.create(candidate=self.jane_again, tag=python_tag)
+        CandidateTagAssignment.objects.create(candidate=self.jane_again, tag=senior_tag)
+        CandidateTagAssignment.objects.create(candidate=self.namesake, tag=senior_tag)
+        CandidateActivity.objects.create(candidate=self.jane_again, activity_type='note_added', description='Called')
+        Interview.objects.create(
+            title='Screening', candidate=self.jane_again, interviewer=self.other,
+            interview_type=InterviewType.objects.create(name='Phone'), scheduled_date=timezone.now()
+        )
+        
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='testpass123', is_staff=True)
+        self.client.force_authenticate(user=staff)
+        response = self.client.post(
+            f'/api/candidates/{self.jane.id}/merge/',
+            {'duplicate_ids': [str(self.jane_again.id), str(self.namesake.id)]}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Candidate.objects.filter(pk__in=[self.jane_again.pk, self.namesake.pk]).exists())
+        self.jane.refresh_from_db()
+        self.assertEqual(self.jane.skills, ['Python', 'Django'])
+        self.assertEqual(self.jane.location, 'Colombo')
+        self.assertEqual(self.jane.interviews.count(), 1)
+        self.assertTrue(self.jane.activities.filter(description='Called').exists())
+        self.assertEqual(
+            sorted(self.jane.tag_assignments.values_list('tag__name', flat=True)), ['python', 'senior']
+        )
+        merged = self.jane.activities.get(description__startswith='Merged 2')
+        self.assertEqual(len(merged.metadata['merged_candidate_ids']), 2)
+    
+    def test_merge_reindexes_primary(self):
+        """Test that the merged candidate's CV signature and match vector follow the filled-in fields"""
+        from scoring.models import CandidateVector
+        from .entity_resolution import CandidateMergeService
+        from .models import CandidateTextSignature
+        from .services import CandidateParsingService
+        
+        self.jane_again.extracted_text = 'Backend engineer building Django services and data pipelines'
+        self.jane_again.save()
+        CandidateParsingService.refresh_match_vector(self.jane)
+        vector = CandidateVector.objects.get(candidate=self.jane)
+        
+        CandidateMergeService.merge(self.jane, [self.jane_again])
+        
+        self.assertTrue(CandidateTextSignature.objects.filter(candidate=self.jane).exists())
+        self.assertGreater(CandidateVector.objects.get(candidate=self.jane).sequence, vector.sequence)
+    
+    def test_merge_keeps_decision_and_removes_duplicate_cvs(self):
+        """Test that the merged pair survives the duplicate's deletion and its unused CV file is deleted"""
+        from .entity_resolution import CandidateMergeService, CandidateResolver
+        from .models import CandidateMatch
+        
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        with override_settings(MEDIA_ROOT=media_root.name):
+            self.jane.cv_file = SimpleUploadedFile('jane.pdf', b'%PDF-1.4 jane')
+            self.jane.save()
+            self.jane_again.cv_file = SimpleUploadedFile('jane_again.pdf', b'%PDF-1.4 jane again')
+            self.jane_again.save()
+            duplicate_cv = Path(self.jane_again.cv_file.path)
+            CandidateResolver().run()
+        
+            with self.captureOnCommitCallbacks(execute=True):
+                CandidateMergeService.merge(self.jane, [self.jane_again])
+        
+            self.assertFalse(duplicate_cv.exists())
+            self.assertTrue(Path(Candidate.objects.get(pk=self.jane.pk).cv_file.path).exists())
+        
+        match = CandidateMatch.objects.get()
+        self.assertEqual(match.status, 'merged')
+        self.assertEqual({match.candidate_a_id, match.candidate_b_id}, {self.jane.pk, None})
+        
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='testpass123', is_staff=True)
+        self.client.force_authenticate(user=staff)
+        response = self.client.get('/api/candidates/match_suggestions/?status=merged')
+        self.assertEqual(response.data['count'], 1)
+        
+        # Deleting a candidate drops its undecided pairs
+        CandidateMatch.objects.create(candidate_a=self.jane, candidate_b=self.namesake, score=0.6)
+        self.namesake.delete()
+        self.assertEqual(list(CandidateMatch.objects.values_list('status', flat=True)), ['merged'])
+    
+    def test_merge_is_scoped_for_recruiters(self):
+        """Test that non-staff users can only merge their own candidates"""
+        self.client.force_authenticate(user=self.recruiter)
+        response = self.client.post(
+            f'/api/candidates/{self.jane.id}/merge/', {'duplicate_ids': [str(self.jane_again.id)]}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Candidate.objects.filter(pk=self.jane_again.pk).exists())
+    
+    def test_match_suggestions_and_dismiss(self):
+        """Test listing and dismissing suggested pairs"""
+        from .entity_resolution import CandidateResolver
+        from .models import CandidateMatch
+        
+        CandidateResolver().run()
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='testpass123', is_staff=True)
+        self.client.force_authenticate(user=staff)
+        
+        response = self.client.get('/api/candidates/match_suggestions/')
+        self.assertEqual(response.data['count'], 1)
+        match_id = response.data['results'][0]['id']
+        
+        response = self.client.post('/api/candidates/dismiss_match/', {'match_id': match_id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(CandidateMatch.objects.get().status, 'dismissed')
+        
+        self.client.force_authenticate(user=self.recruiter)
+        response = self.client.get('/api/candidates/match_suggestions/?status=dismissed')
+        self.assertEqual(response.data['count'], 0)
+
+class CandidateSearchTest(APITestCase):
+    """Test ranked full-text candidate search"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.kubernetes_expert = Candidate.objects.create(
+            full_name='Kate Kubernetes', skills=['Kubernetes'], added_by=self.user,
+            extracted_text="Platform engineer. Ran Kubernetes clusters and wrote Kubernetes operators in Go."
+        )
+        self.mentions = Candidate.objects.create(
+            full_name='Sam Smith', added_by=self.user,
+            extracted_text="Backend developer who deployed services on Kubernetes once, mostly Django work."
+        )
+        self.unrelated = Candidate.objects.create(
+            full_name='Ana Lima', added_by=self.user, extracted_text="Accountant with a love of spreadsheets."
+        )
+    
+    def search(self, query, **params):
+        response = self.client.get('/api/candidates/', {'search': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+    
+    def test_results_are_ranked_with_snippets(self):
+        """Test that better matches come first and excerpts are highlighted"""
+        results = self.search('kubernetes')
+        
+        self.assertEqual([item['id'] for item in results], [str(self.kubernetes_expert.id), str(self.mentions.id)])
+        self.assertIn('<mark>Kubernetes</mark>', results[0]['search_snippet'])
+    
+    def test_prefix_and_all_terms(self):
+        """Test that the last word matches as a prefix and every word must match"""
+        self.assertEqual([item['id'] for item in self.search('django kube')], [str(self.mentions.id)])
+        self.assertEqual(self.search('spreadsheets kubernetes'), [])
+        self.assertEqual(len(self.search('"kub*" (')), 2)
+    
+    def test_index_follows_edits_and_deletes(self):
+        """Test that edits, bookkeeping saves and deletes keep the index in sync"""
+        from .search import get_search_backend
+        
+        self.unrelated.extracted_text = 'Accountant who now administers Kubernetes'
+        self.unrelated.save()
+        self.assertEqual(len(self.search('kubernetes')), 3)
+        
+        self.mentions.delete()
+        hits = get_search_backend().search('kubernetes', 10)
+        self.assertEqual({hit.candidate_id for hit in hits}, {self.kubernetes_expert.id, self.unrelated.id})
+    
+    def test_explicit_ordering_and_scope(self):
+        """Test that ?ordering= wins over rank and other users' candidates stay hidden"""
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        Candidate.objects.create(full_name='Other Kubernetes', extracted_text='Kubernetes', added_by=other)
+        
+        results = self.search('kubernetes', ordering='full_name')
+        self.assertEqual([item['full_name'] for item in results], ['Kate Kubernetes', 'Sam Smith'])
+
+    @override_settings(CANDIDATE_SEARCH_MAX_RESULTS=2)
+    def test_scope_applies_before_limit(self):
+        """Test that better matches of other users or filtered-out candidates do not use up the limit"""
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        for i in range(3):
+            Candidate.objects.create(
+                full_name=f'Kubernetes Expert {i}', skills=['Kubernetes'], added_by=other,
+                extracted_text='Kubernetes Kubernetes Kubernetes operators and Kubernetes clusters.'
+            )
+        self.kubernetes_expert.status = 'rejected'
+        self.kubernetes_expert.save()
+
+        self.assertEqual(len(self.search('kubernetes')), 2)
+        self.assertEqual([item['id'] for item in self.search('kubernetes', status='new')], [str(self.mentions.id)])
+    
+    def test_empty_scope_returns_no_hits(self):
+        """Test that a search combined with a filter matching nothing returns an empty page"""
+        from .search import get_search_backend
+        
+        self.assertEqual(self.search('kubernetes', skills='Cobol'), [])
+        self.assertEqual(get_search_backend().search('kubernetes', 10, scope=Candidate.objects.none()), [])
+        self.assertEqual(get_search_backend().search('kubernetes', 10, scope=Candidate.objects.filter(pk__in=[])), [])
+
+    @override_settings(CANDIDATE_SEARCH_BACKEND='none')
+    def test_icontains_fallback(self):
+        """Test that search still works without a full-text backend"""
+        results = self.search('spreadsheets')
+        
+        self.assertEqual([item['id'] for item in results], [str(self.unrelated.id)])
+        self.assertIsNone(results[0]['search_snippet'])
+    
+    def test_rebuild_command(self):
+        """Test that the index can be rebuilt from the candidate table"""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM candidates_candidate_fts")
+        self.assertEqual(self.search('kubernetes'), [])
+        
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 3 candidates', out.getvalue())
+        self.assertEqual(len(self.search('kubernetes')), 2)
+
+class SkillIndexTest(APITestCase):
+    """Test the CandidateSkill index, skill filters and facet counts"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.backend = Candidate.objects.create(full_name='Back End', skills=['Python', 'Django', 'Docker'], added_by=self.user)
+        self.data = Candidate.objects.create(full_name='Data Person', skills=['Python', 'Pandas'], added_by=self.user)
+        self.ops = Candidate.objects.create(full_name='Ops Person', skills='Docker, Kubernetes', status='screening', added_by=self.user)
+    
+    def ids(self, response):
+        return {item['id'] for item in response.data['results']}
+    
+    def test_index_follows_skills(self):
+        """Test that skill rows mirror Candidate.skills through saves and serializers"""
+        from .models import CandidateSkill
+        
+        self.assertEqual(
+            sorted(CandidateSkill.objects.filter(candidate=self.ops).values_list('name', flat=True)),
+            ['Docker', 'Kubernetes']
+        )
+        
+        self.data.skills = ['Python', 'python', 'SQL']
+        self.data.save(update_fields=['skills'])
+        self.assertEqual(sorted(self.data.skill_index.values_list('key', flat=True)), ['python', 'sql'])
+        
+        from .serializers import CandidateUpdateSerializer
+        serializer = CandidateUpdateSerializer(self.backend, data={'skills': ['Go']}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertEqual(list(self.backend.skill_index.values_list('name', flat=True)), ['Go'])
+    
+    def test_skill_filter_all_and_any(self):
+        """Test AND and OR skill filtering"""
+        response = self.client.get('/api/candidates/', {'skills': 'python,DOCKER'})
+        self.assertEqual(self.ids(response), {str(self.backend.id)})
+        
+        response = self.client.get('/api/candidates/', {'skills': 'pandas,kubernetes', 'skills_match': 'any'})
+        self.assertEqual(self.ids(response), {str(self.data.id), str(self.ops.id)})
+    
+    def test_skill_facets(self):
+        """Test facet counts for the current filter in one grouped query"""
+        response = self.client.get('/api/candidates/skill_facets/')
+        self.assertEqual(response.data['results'][:2], [{'skill': 'Docker', 'count': 2}, {'skill': 'Python', 'count': 2}])
+        
+        response = self.client.get('/api/candidates/skill_facets/', {'skills': 'docker'})
+        counts = {facet['skill']: facet['count'] for facet in response.data['results']}
+        self.assertEqual(counts, {'Docker': 2, 'Python': 1, 'Django': 1, 'Kubernetes': 1})
+        
+        response = self.client.get('/api/candidates/skill_facets/', {'status': 'screening'})
+        self.assertEqual(len(response.data['results']), 2)
+
+class KeysetPaginationTest(APITestCase):
+    """Test opt-in keyset pagination on candidate lists"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        
+        # Pairs of candidates share a timestamp so the id tie-breaker matters
+        now = timezone.now()
+        for i in range(45):
+            candidate = Candidate.objects.create(full_name=f'Candidate {i}', added_by=self.user)
+            Candidate.objects.filter(pk=candidate.pk).update(created_at=now - timedelta(minutes=i // 2))
+        self.expected = list(
+            Candidate.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+    
+    def test_pages_cover_every_row_once(self):
+        """Test that following next links returns all rows in order without COUNT or OFFSET"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        seen = []
+        url = '/api/candidates/?cursor='
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            page_sql = ' '.join(query['sql'] for query in queries.captured_queries if 'candidates_candidate' in query['sql'])
+            self.assertNotIn('COUNT(', page_sql)
+            self.assertNotIn('OFFSET', page_sql)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        
+        self.assertEqual(seen, [str(candidate_id) for candidate_id in self.expected])
+    
+    def test_page_number_mode_is_default(self):
+        """Test that requests without a cursor keep PageNumberPagination"""
+        response = self.client.get('/api/candidates/', {'page': 2})
+        
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 20)
+    
+    def test_approximate_total_and_bad_cursor(self):
+        """Test the optional total and rejection of malformed cursors"""
+        from core.pagination import KeysetPagination
+        
+        response = self.client.get('/api/candidates/', {'cursor': '', 'total': 'approximate'})
+        self.assertEqual((response.data['count'], response.data['count_is_exact']), (45, True))
+        
+        KeysetPagination.approximate_count_cap = 10
+        self.addCleanup(setattr, KeysetPagination, 'approximate_count_cap', 10000)
+        response = self.client.get('/api/candidates/', {'cursor': '', 'total': 'approximate'})
+        self.assertEqual((response.data['count'], response.data['count_is_exact']), (10, False))
+        
+        response = self.client.get('/api/candidates/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_activities_and_interviews(self):
+        """Test that activity and interview lists accept a cursor too"""
+        from interviews.models import Interview, InterviewType
+        
+        candidate = Candidate.objects.first()
+        interview_type = InterviewType.objects.create(name='Phone')
+        for i in range(3):
+            CandidateActivity.objects.create(candidate=candidate, activity_type='note_added', description=str(i))
+            Interview.objects.create(
+                title=f'Round {i}', candidate=candidate, interviewer=self.user,
+                interview_type=interview_type, scheduled_date=timezone.now()
+            )
+        
+        # The candidate routes shadow /api/candidates/activities/, so call the viewset directly
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .views import CandidateActivityViewSet
+        request = APIRequestFactory().get('/', {'cursor': ''})
+        force_authenticate(request, user=self.user)
+        response = CandidateActivityViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual([item['description'] for item in response.data['results']], ['2', '1', '0'])
+        self.assertIsNone(response.data['next'])
+        
+        response = self.client.get('/api/interviews/interviews/', {'cursor': ''})
+        self.assertEqual([item['title'] for item in response.data['results']], ['Round 2', 'Round 1', 'Round 0'])
+
+class ListProjectionTest(QueryColumnsMixin, APITestCase):
+    """Test that list, stats and export only load the columns they use"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        
+        for i, candidate_status in enumerate(['new', 'new', 'screening']):
+            Candidate.objects.create(
+                full_name=f'Candidate {i}', email=f'candidate{i}@example.com', status=candidate_status,
+                skills=['Python', 'Django'], extraction_confidence=0.8 if i else 0.0,
+                extracted_text='Kubernetes operator ' * 500, education=[{'degree': 'BSc'}], added_by=self.user
+            )
+    
+    def test_list_never_selects_cv_text(self):
+        """Test that page-number, keyset and search lists leave extracted_text unread"""
+        heavy_columns = ['extracted_text', 'education', 'work_experience', 'parse_timings']
+        
+        for params in [{}, {'cursor': ''}, {'search': 'kubernetes'}]:
+            with self.assertColumnsNotSelected('candidates_candidate', heavy_columns) as context:
+                response = self.client.get('/api/candidates/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), 3)
+            self.assertTrue(any('"candidates_candidate"."full_name"' in query['sql'] for query in context.captured_queries))
+        
+        self.assertEqual(response.data['results'][0]['skills'], ['Python', 'Django'])
+    
+    def test_list_loads_added_by_in_same_query(self):
+        """Test that the added_by name does not cost a query per row"""
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/candidates/')
+        self.assertEqual(len(response.data['results']), 3)
+    
+    def test_stats_and_export(self):
+        """Test that stats group by status despite the list ordering and export reads plain values"""
+        with self.assertColumnsNotSelected('candidates_candidate', ['extracted_text']):
+            stats = self.client.get('/api/candidates/stats/').data
+            export = self.client.get('/api/candidates/export/').data
+        
+        self.assertEqual(stats['total_candidates'], 3)
+        self.assertEqual(stats['status_distribution'], {'new': 2, 'screening': 1})
+        self.assertEqual(stats['parsing_stats']['parsed'], 2)
+        self.assertEqual(export['total_count'], 3)
+        self.assertEqual(export['candidates'][0]['skills'], 'Python, Django')
+
+class StreamingExportTest(APITestCase):
+    """Test CSV and NDJSON candidate exports"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        Candidate.objects.create(full_name='Jane Doe', email='jane@example.com', skills=['Python', 'SQL'], added_by=self.user)
+        Candidate.objects.create(full_name='Doe, John', email='john@example.com', experience_years=4, added_by=self.user)
+    
+    def test_csv_export_streams_rows(self):
+        """Test that ?format=csv streams a header and one row per candidate"""
+        import csv
+        import io
+        
+        response = self.client.get('/api/candidates/export/', {'format': 'csv', 'ordering': 'full_name'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="candidates.csv"')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['full_name'] for row in rows], ['Doe, John', 'Jane Doe'])
+        self.assertEqual((rows[0]['experience_years'], rows[1]['skills']), ('4', 'Python, SQL'))
+    
+    def test_ndjson_export_by_accept_header(self):
+        """Test that Accept: application/x-ndjson streams one JSON object per line"""
+        response = self.client.get('/api/candidates/export/', HTTP_ACCEPT='application/x-ndjson')
+        
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual({row['email'] for row in rows}, {'jane@example.com', 'john@example.com'})
+        self.assertIn(['Python', 'SQL'], [row['skills'] for row in rows])
+    
+    def test_json_export_unchanged(self):
+        """Test that the default JSON export keeps its shape"""
+        response = self.client.get('/api/candidates/export/')
+        
+        self.assertEqual(response.data['total_count'], 2)
+        self.assertIn('Python, SQL', [row['skills'] for row in response.data['candidates']])
+
+class BulkStatusUpdateTest(APITestCase):
+    """Test the set-based bulk status update"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        
+        self.candidates = [
+            Candidate.objects.create(full_name=f'Candidate {i}', status='new' if i < 4 else 'screening',
+                                     skills=['Python'] if i % 2 else ['Java'], added_by=self.user)
+            for i in range(6)
+        ]
+        self.foreign = Candidate.objects.create(full_name='Not Mine', added_by=self.other)
+    
+    def test_update_by_ids_uses_constant_queries(self):
+        """Test that ids are updated with one read, one UPDATE and one INSERT, skipping unchanged rows"""
+        ids = [str(candidate.id) for candidate in self.candidates] + [str(self.foreign.id)]
+        
+        # Savepoints, status read, counter key read, one UPDATE, two counter updates and one INSERT
+        with self.assertNumQueries(10):
+            response = self.client.post('/api/candidates/bulk_update_status/', {
+                'candidate_ids': ids, 'status': 'screening', 'note': 'Batch review'
+            }, format='json')
+        
+        self.assertEqual(response.data['updated_count'], 4)
+        self.assertIn('duration_ms', response.data)
+        self.assertEqual(Candidate.objects.filter(added_by=self.user, status='screening').count(), 6)
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.status, 'new')
+        
+        activity = CandidateActivity.objects.get(candidate=self.candidates[0], activity_type='status_changed')
+        self.assertEqual(activity.description, 'Bulk status change from new to screening. Note: Batch review')
+        self.assertEqual(activity.user, self.user)
+        self.assertEqual(CandidateActivity.objects.filter(activity_type='status_changed').count(), 4)
+    
+    def test_update_all_matching_filters(self):
+        """Test that all_matching selects candidates with the list query parameters"""
+        response = self.client.post(
+            '/api/candidates/bulk_update_status/?status=new&skills=python',
+            {'all_matching': True, 'status': 'interview'}, format='json'
+        )
+        
+        self.assertEqual(response.data['updated_count'], 2)
+        self.assertEqual(
+            set(Candidate.objects.filter(status='interview').values_list('full_name', flat=True)),
+            {'Candidate 1', 'Candidate 3'}
+        )
+    
+    def test_batches_large_id_lists(self):
+        """Test that id lists longer than a batch are split across queries"""
+        from unittest import mock
+        from .services import CandidateStatusService
+        
+        with mock.patch.object(CandidateStatusService, 'BATCH_SIZE', 2):
+            response = self.client.post('/api/candidates/bulk_update_status/', {
+                'candidate_ids': [str(candidate.id) for candidate in self.candidates], 'status': 'rejected'
+            }, format='json')
+        
+        self.assertEqual(response.data['updated_count'], 6)
+        self.assertFalse(Candidate.objects.filter(added_by=self.user).exclude(status='rejected').exists())
+    
+    def test_rejects_bad_selection(self):
+        """Test that missing selections, statuses and malformed ids are rejected"""
+        url = '/api/candidates/bulk_update_status/'
+        
+        self.assertEqual(self.client.post(url, {'status': 'new'}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'candidate_ids': [str(self.candidates[0].id)], 'status': 'bogus'},
+                                          format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'candidate_ids': ['not-a-uuid'], 'status': 'new'},
+                                          format='json').status_code, 400)
+
+class BulkUploadTest(APITestCase):
+    """Test bulk CV upload jobs"""
+    
+    CV_TEXT = "Jane Doe{i}\ncandidate{i}@example.com\nSkills\nPython, Django, Docker\n" + " ".join(
+        f"Delivered project {n} for client {n * 7}." for n in range(60)
+    )
+    
+    def setUp(self):
+        from core.celery import app
+        
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+        
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+    
+    def upload(self, files):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/candidates/bulk_upload/', {'files': files}, format='multipart')
+    
+    def zip_of(self, members):
+        import io
+        import zipfile
+        
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name, content in members.items():
+                archive.writestr(name, content)
+        return SimpleUploadedFile('cvs.zip', buffer.getvalue(), content_type='application/zip')
+    
+    def test_zip_and_files_are_parsed_per_file(self):
+        """Test that every CV becomes a candidate and the job lists per-file results"""
+        archive = self.zip_of({
+            'batch/cv_0.txt': self.CV_TEXT.format(i=0),
+            'batch/cv_1.txt': self.CV_TEXT.format(i=0).replace('candidate0@', 'other0@'),
+            'batch/photo.png': b'not a cv',
+        })
+        loose = SimpleUploadedFile('cv_2.txt', self.CV_TEXT.format(i=2).encode())
+        
+        response = self.upload([archive, loose])
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['total_files'], 4)
+        job = self.client.get(f"/api/candidates/bulk_upload/{response.data['job_id']}/").data
+        
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['counts'], {'queued': 0, 'pending': 0, 'parsed': 3, 'failed': 0, 'rejected': 1})
+        results = {result['filename']: result for result in job['results']}
+        self.assertEqual(results['photo.png']['status'], 'rejected')
+        self.assertGreater(results['cv_2.txt']['extraction_confidence'], 0)
+        self.assertEqual(Candidate.objects.get(id=results['cv_2.txt']['candidate_id']).email, 'candidate2@example.com')
+        
+        # The second copy of the same CV is flagged against the first
+        self.assertEqual(
+            [duplicate['candidate_id'] for duplicate in results['cv_1.txt']['possible_duplicates']],
+            [str(results['cv_0.txt']['candidate_id'])]
+        )
+    
+    def test_uploaded_files_go_to_disk(self):
+        """Test that the bulk parser spools even small files to temporary files"""
+        from unittest import mock
+        from django.core.files.uploadedfile import TemporaryUploadedFile
+        from .bulk_upload import BulkUploadService
+        
+        with mock.patch.object(BulkUploadService, 'create_job', wraps=BulkUploadService.create_job) as create_job:
+            self.upload([SimpleUploadedFile('cv.txt', self.CV_TEXT.format(i=5).encode())])
+        
+        uploads = create_job.call_args.args[0]
+        self.assertIsInstance(uploads[0], TemporaryUploadedFile)
+
+    def test_failed_job_leaves_no_files(self):
+        """Test that CVs stored before a failed insert are deleted with the rolled back job"""
+        from unittest import mock
+        from django.db import DatabaseError
+        from .bulk_upload import BulkUploadService
+        from .models import BulkUploadItem, BulkUploadJob
+
+        files = [SimpleUploadedFile(f'cv_{i}.txt', self.CV_TEXT.format(i=i).encode()) for i in range(2)]
+        with mock.patch.object(BulkUploadItem.objects, 'bulk_create', side_effect=DatabaseError), \
+                self.assertRaises(DatabaseError):
+            BulkUploadService.create_job(files, user=self.user)
+
+        self.assertEqual([path for path in Path(self.media_root.name).rglob('*') if path.is_file()], [])
+        self.assertFalse(BulkUploadJob.objects.exists())
+        self.assertFalse(Candidate.objects.exists())
+
+    def test_broker_outage_leaves_files_pending(self):
+        """Test that files are not parsed in the upload request without a broker and are queued on the next poll"""
+        from io import StringIO
+        from unittest import mock
+        from celery.canvas import group
+        from django.core.management import call_command
+        from .bulk_upload import BulkUploadService
+        
+        files = [SimpleUploadedFile(f'cv_{i}.txt', self.CV_TEXT.format(i=i).encode()) for i in range(3)]
+        with mock.patch.object(group, 'apply_async', side_effect=ConnectionError('broker down')), \
+                mock.patch.object(BulkUploadService, 'process_item') as process_item:
+            response = self.upload(files)
+            job_url = f"/api/candidates/bulk_upload/{response.data['job_id']}/"
+            job = self.client.get(job_url).data
+            
+            out = StringIO()
+            call_command('dispatch_bulk_uploads', stdout=out)
+        
+        process_item.assert_not_called()
+        self.assertEqual(job['status'], 'processing')
+        self.assertEqual(job['counts']['pending'], 3)
+        self.assertIn('Could not queue 3 pending files', out.getvalue())
+        
+        job = self.client.get(job_url).data
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['counts']['parsed'], 3)
+    
+    def test_limits(self):
+        """Test the file count limit, empty requests and other users' jobs"""
+        self.assertEqual(self.upload([]).status_code, status.HTTP_400_BAD_REQUEST)
+        
+        with override_settings(CV_BULK_UPLOAD_MAX_FILES=2):
+            response = self.upload([self.zip_of({f'cv_{i}.txt': 'text' for i in range(3)})])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Candidate.objects.exists())
+        
+        job_id = self.upload([SimpleUploadedFile('cv.txt', b'Jane Doe')]).data['job_id']
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(f'/api/candidates/bulk_upload/{job_id}/').status_code, status.HTTP_404_NOT_FOUND)
+
+class CandidateCounterTest(APITestCase):
+    """Test the precomputed candidate pipeline counters"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+    
+    def assertCountersMatch(self):
+        from .models import CandidateCounter
+        self.assertEqual(CandidateCounter.rebuild(dry_run=True), {})
+    
+    def test_write_paths_keep_counters_exact(self):
+        """Test that saves, bulk writes, updates and deletes all adjust the counters"""
+        from .models import CandidateCounter
+        
+        jane = Candidate.objects.create(full_name='Jane Doe', added_by=self.user)
+        Candidate.objects.bulk_create([
+            Candidate(full_name=f'Bulk {i}', added_by=self.user, extraction_confidence=0.9, cv_file='cvs/a.pdf')
+            for i in range(3)
+        ])
+        self.assertCountersMatch()
+        
+        jane.extraction_confidence = 0.5
+        jane.save(update_fields=['extraction_confidence'])
+        Candidate.objects.get(pk=jane.pk).save()
+        Candidate.objects.filter(full_name__startswith='Bulk').update(status='screening')
+        self.assertCountersMatch()
+        
+        Candidate.objects.filter(full_name='Bulk 0').delete()
+        Candidate.objects.only('id').get(full_name='Bulk 1').delete()
+        Candidate.objects.filter(pk=jane.pk).update(status=F('status'))
+        self.assertCountersMatch()
+        self.assertEqual(sum(CandidateCounter.stored().values()), 2)
+    
+    def test_bookkeeping_saves_skip_hooks(self):
+        """Test that a save limited to unrelated fields is one UPDATE and a name save refreshes match keys"""
+        from unittest import mock
+        
+        jane = Candidate.objects.create(full_name='Jane Doe', email='jane@example.com', added_by=self.user)
+        
+        jane.notes = 'Strong'
+        with mock.patch.object(Candidate, 'refresh_match_keys') as refresh_match_keys, self.assertNumQueries(1):
+            jane.save(update_fields=['notes'])
+        refresh_match_keys.assert_not_called()
+        
+        jane.full_name = 'Doe Janet'
+        jane.save(update_fields=['full_name'])
+        self.assertEqual(Candidate.objects.get(pk=jane.pk).match_name, 'doe janet')
+    
+    def test_deleting_user_keeps_counters_exact(self):
+        """Test that candidates orphaned by deleting their user are counted under no user"""
+        from .models import CandidateCounter
+        
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        Candidate.objects.create(full_name='Jane Doe', added_by=other)
+        Candidate.objects.create(full_name='John Smith', added_by=self.user)
+        
+        other.delete()
+        self.assertCountersMatch()
+        self.assertEqual(CandidateCounter.objects.get(user=None).total, 1)
+    
+    def test_stats_read_counters(self):
+        """Test that unfiltered stats come from the counters and agree with a live count"""
+        for i, candidate_status in enumerate(['new', 'new', 'screening']):
+            Candidate.objects.create(
+                full_name=f'Candidate {i}', status=candidate_status, added_by=self.user,
+                extraction_confidence=[0.0, 0.5, 0.8][i], cv_file='cvs/cv.pdf' if i else ''
+            )
+        Candidate.objects.create(full_name='Old', added_by=self.user)
+        Candidate.objects.filter(full_name='Old').update(created_at=timezone.now() - timedelta(days=90))
+        
+        with self.assertNumQueries(2):
+            counted = self.client.get('/api/candidates/stats/').data
+        live = self.client.get('/api/candidates/stats/', {'status': 'new'}).data
+        
+        self.assertEqual(counted['total_candidates'], 4)
+        self.assertEqual(counted['recent_candidates'], 3)
+        self.assertEqual(counted['status_distribution'], {'new': 3, 'screening': 1})
+        self.assertEqual(counted['parsing_stats'], {'with_cv': 2, 'parsed': 2, 'high_confidence': 1})
+        self.assertEqual(live['total_candidates'], 3)
+    
+    def test_stats_paths_agree_on_recent(self):
+        """Test that counted and live stats share the day boundary of recent candidates"""
+        from datetime import datetime, time
+        from .models import CandidateCounter
+        
+        first_recent_day = datetime.combine(CandidateCounter.recent_since(), time(0, 1))
+        for name, created_at in [('Edge', first_recent_day), ('Before', first_recent_day - timedelta(minutes=2))]:
+            candidate = Candidate.objects.create(full_name=name, added_by=self.user)
+            Candidate.objects.filter(pk=candidate.pk).update(created_at=timezone.make_aware(created_at))
+        Candidate.objects.create(full_name='Today', added_by=self.user)
+        
+        counted = self.client.get('/api/candidates/stats/').data
+        # A filter matching every candidate takes the live counting path
+        live = self.client.get('/api/candidates/stats/', {'skills_match': 'any'}).data
+        
+        self.assertEqual(counted['recent_candidates'], 2)
+        self.assertEqual(live, counted)
+    
+    def test_reconcile_command_reports_and_fixes_drift(self):
+        """Test that the reconcile command rebuilds counters that drifted"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import CandidateCounter
+        
+        Candidate.objects.create(full_name='Jane Doe', added_by=self.user)
+        CandidateCounter.objects.update(total=5)
+        
+        out = StringIO()
+        call_command('reconcile_candidate_counters', '--dry-run', stdout=out)
+        self.assertIn('Found 1 drifted rows (4 candidates)', out.getvalue())
+        self.assertEqual(CandidateCounter.objects.get().total, 5)
+        
+        call_command('reconcile_candidate_counters', stdout=StringIO())
+        self.assertEqual(CandidateCounter.objects.get().total, 1)
+    
+    def test_interview_stats_count_each_interview_once(self):
+        """Test that interview stats are not inflated by additional interviewers"""
+        from interviews.models import Interview, InterviewType
+        
+        candidate = Candidate.objects.create(full_name='Jane Doe', added_by=self.user)
+        interview_type = InterviewType.objects.create(name='Phone')
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        interview = Interview.objects.create(
+            title='Round 1', candidate=candidate, interviewer=self.user, interview_type=interview_type,
+            scheduled_date=timezone.now() + timedelta(days=1)
+        )
+        interview.additional_interviewers.add(self.user, other)
+        Interview.objects.create(
+            title='Round 0', candidate=candidate, interviewer=self.user, interview_type=interview_type,
+            scheduled_date=timezone.now() - timedelta(days=1), status='completed'
+        )
+        
+        stats = self.client.get('/api/interviews/interviews/stats/').data
+        
+        self.assertEqual((stats['total_interviews'], stats['upcoming_interviews'], stats['completed_interviews']), (2, 1, 1))
+        self.assertEqual(sum(stats['monthly_trends'].values()), 2)
+        self.assertEqual(len(stats['monthly_trends']), 6)
+
+class RelatedQueryCountTest(APITestCase):
+    """Test that candidate endpoints load related users and activities in a fixed number of queries"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.colleagues = [
+            User.objects.create_user(username=f'colleague{i}', email=f'colleague{i}@example.com', password='testpass123')
+            for i in range(7)
+        ]
+    
+    def add_candidate(self, index, activities):
+        candidate = Candidate.objects.create(
+            full_name=f'Candidate {index}', email=f'candidate{index}@example.com', added_by=self.user
+        )
+        for i in range(activities):
+            CandidateActivity.objects.create(
+                candidate=candidate, activity_type='note_added', description=f'Note {i}', user=self.colleagues[i]
+            )
+        return candidate
+    
+    def count_queries(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(path, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+    
+    def test_detail_queries_do_not_grow_with_activities(self):
+        """Test that retrieve and update read recent activities and their users in constant queries"""
+        few = self.add_candidate(0, activities=1)
+        many = self.add_candidate(1, activities=7)
+        
+        few_queries, _ = self.count_queries('get', f'/api/candidates/{few.id}/')
+        many_queries, response = self.count_queries('get', f'/api/candidates/{many.id}/')
+        self.assertEqual(few_queries, many_queries)
+        
+        activities = response.data['recent_activities']
+        self.assertEqual(len(activities), 5)
+        self.assertEqual([activity['description'] for activity in activities], [f'Note {i}' for i in range(6, 1, -1)])
+        
+        few_queries, _ = self.count_queries('patch', f'/api/candidates/{few.id}/', {'notes': 'Strong'})
+        many_queries, response = self.count_queries('patch', f'/api/candidates/{many.id}/', {'notes': 'Strong'})
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(len(response.data['recent_activities']), 5)
+        
+        response = self.client.patch(f'/api/candidates/{many.id}/', {'status': 'screening'}, format='json')
+        self.assertEqual(response.data['recent_activities'][0]['activity_type'], 'status_changed')
+    
+    def test_list_queries_do_not_grow_with_candidates(self):
+        """Test that candidate and activity lists do not query per row"""
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .views import CandidateActivityViewSet
+        
+        def activity_list_queries():
+            request = APIRequestFactory().get('/')
+            force_authenticate(request, user=self.user)
+            with CaptureQueriesContext(connection) as context:
+                response = CandidateActivityViewSet.as_view({'get': 'list'})(request)
+                response.render()
+            return len(context.captured_queries)
+        
+        self.add_candidate(0, activities=1)
+        few_queries = self.count_queries('get', '/api/candidates/')[0]
+        few_activity_queries = activity_list_queries()
+        
+        for i in range(1, 15):
+            self.add_candidate(i, activities=i % 7)
+        many_queries, response = self.count_queries('get', '/api/candidates/')
+        self.assertEqual(len(response.data['results']), 15)
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(few_activity_queries, activity_list_queries())
+
+class ConditionalGetTest(APITestCase):
+    """Test that polled candidate and interview endpoints answer 304 while unchanged"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.candidate = Candidate.objects.create(
+            full_name='Jane Doe', email='jane@example.com', extracted_text='Python ' * 1000, added_by=self.user
+        )
+    
+    def revalidate(self, path, response, **params):
+        return self.client.get(path, params, HTTP_IF_NONE_MATCH=response['ETag'])
+    
+    def test_candidate_detail(self):
+        """Test that detail is not serialized again until the candidate or its activities change"""
+        path = f'/api/candidates/{self.candidate.id}/'
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('no-cache', response['Cache-Control'])
+        
+        with self.assertNumQueries(1):
+            cached = self.revalidate(path, response)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached.content, b'')
+        self.assertEqual(cached['ETag'], response['ETag'])
+        
+        modified_since = self.client.get(path, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(modified_since.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        CandidateActivity.objects.create(candidate=self.candidate, activity_type='note_added', description='Called', user=self.user)
+        changed = self.revalidate(path, response)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data['recent_activities'][0]['description'], 'Called')
+        
+        self.client.patch(path, {'notes': 'Strong'}, format='json')
+        self.assertEqual(self.revalidate(path, changed).status_code, status.HTTP_200_OK)
+        
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.revalidate(path, changed).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get('/api/candidates/not-a-uuid/').status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_candidate_list(self):
+        """Test that the list fingerprint follows edits, deletions and the query string"""
+        other = Candidate.objects.create(full_name='John Smith', email='john@example.com', added_by=self.user)
+        response = self.client.get('/api/candidates/')
+        self.assertEqual(self.revalidate('/api/candidates/', response).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.revalidate('/api/candidates/', response, search='python').status_code, status.HTTP_200_OK)
+        
+        searched = self.client.get('/api/candidates/', {'search': 'python'})
+        self.assertEqual(len(searched.data['results']), 1)
+        self.assertEqual(self.revalidate('/api/candidates/', searched, search='python').status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        other.delete()
+        self.assertEqual(self.revalidate('/api/candidates/', response).status_code, status.HTTP_200_OK)
+        
+        response = self.client.get('/api/candidates/')
+        keyset = self.client.get('/api/candidates/', {'cursor': ''})
+        self.assertEqual(self.revalidate('/api/candidates/', keyset, cursor='').status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        Candidate.objects.filter(pk=self.candidate.pk).update(status='screening', updated_at=timezone.now())
+        self.assertEqual(self.revalidate('/api/candidates/', response).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.revalidate('/api/candidates/', keyset, cursor='').status_code, status.HTTP_200_OK)
+    
+    @override_settings(CV_PARSING_ASYNC=True)
+    def test_parse_status_changes(self):
+        """Test that parse status bookkeeping saves invalidate the detail and list validators"""
+        from .services import CandidateParsingService
+        
+        path = f'/api/candidates/{self.candidate.id}/'
+        detail = self.client.get(path)
+        listed = self.client.get('/api/candidates/')
+        
+        CandidateParsingService.queue_parse(self.candidate)
+        changed = self.revalidate(path, detail)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data['parse_status'], 'queued')
+        self.assertEqual(self.revalidate('/api/candidates/', listed).status_code, status.HTTP_200_OK)
+    
+    def test_interview_detail_and_analysis_status(self):
+        """Test that interview details and the analysis status poll follow the interview and its feedback"""
+        from interviews.models import Interview, InterviewFeedback, InterviewType
+        
+        interview = Interview.objects.create(
+            title='Round 1', candidate=self.candidate, interviewer=self.user,
+            interview_type=InterviewType.objects.create(name='Phone'), scheduled_date=timezone.now() + timedelta(days=1)
+        )
+        
+        path = f'/api/interviews/interviews/{interview.id}/'
+        response = self.client.get(path)
+        self.assertEqual(self.revalidate(path, response).status_code, status.HTTP_304_NOT_MODIFIED)
+        InterviewFeedback.objects.create(interview=interview, strengths='Clear answers')
+        response = self.revalidate(path, response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.candidate.full_name = 'Jane Smith'
+        self.candidate.save()
+        self.assertEqual(self.revalidate(path, response).status_code, status.HTTP_200_OK)
+        
+        listed = self.client.get('/api/interviews/interviews/')
+        self.assertEqual(self.revalidate('/api/interviews/interviews/', listed).status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        path = f'/api/interviews/ai-analysis/{interview.id}/analysis_status/'
+        response = self.client.get(path)
+        self.assertEqual(response.data['status'], interview.ai_analysis_status)
+        cached = self.revalidate(path, response)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        interview.ai_analysis_status = 'completed'
+        interview.transcript = 'Hello'
+        interview.save()
+        changed = self.revalidate(path, response)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data['analysis_results']['transcript'], 'Hello')
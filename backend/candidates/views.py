@@ -2,23 +2,26 @@
 Views for candidate management
 """
 import logging
-from datetime import timedelta
-from django.utils import timezone
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Min
+from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.conf import settings
 import os
 import json
+import uuid
 
-from .models import Candidate, CandidateTag, CandidateActivity
+from .models import (
+    Candidate, CandidateTag, CandidateActivity, CandidateMatch, CandidateSkill, BulkUploadJob, CandidateCounter
+)
 from .serializers import (
     CandidateCreateSerializer,
     CandidateDetailSerializer,
@@ -26,8 +29,18 @@ from .serializers import (
     CandidateUpdateSerializer,
     CandidateTagSerializer,
     CandidateActivitySerializer,
-    CandidateStatsSerializer
+    CandidateStatsSerializer,
+    CandidateMatchSerializer
 )
+from .services import CandidateParsingService, CandidateStatusService
+from .bulk_upload import BulkUploadService, DiskMultiPartParser
+from core.conditional import ConditionalGetMixin
+from scoring.vectors import VECTOR_FIELDS
+from core.pagination import KeysetPagination
+from .duplicate_index import DuplicateIndex
+from .entity_resolution import CandidateMergeService
+from .exports import CSVRenderer, NDJSONRenderer, export_rows, iter_csv, iter_ndjson
+from .filters import CandidateFilter, CandidateSearchFilter
 
 try:
     from .cv_parser import cv_parser
@@ -38,43 +51,81 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing candidates
     """
     queryset = Candidate.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     parser_classes = [MultiPartParser, FormParser, JSONParser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Search runs last so its ranking replaces the default ordering
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, CandidateSearchFilter]
     
-    filterset_fields = ['status', 'added_by']
+    filterset_class = CandidateFilter
     search_fields = ['full_name', 'email', 'phone', 'skills', 'extracted_text']
     ordering_fields = ['created_at', 'updated_at', 'full_name', 'experience_years']
     ordering = ['-created_at']
     
+    # Fields returned by the parse status endpoints
+    parse_status_fields = ['id', 'parse_status', 'parse_error', 'parse_duration_ms', 'parsed_at', 'extraction_confidence']
+    
+    # Columns loaded by the list page, which never needs the CV text or the parsed JSON blobs
+    list_fields = [
+        'id', 'full_name', 'email', 'phone', 'status', 'experience_years', 'skills', 'current_position',
+        'current_company', 'extraction_confidence', 'parse_status', 'created_at', 'updated_at',
+        'added_by__first_name', 'added_by__last_name'
+    ]
+    
+    # Columns written by the export action, and rows fetched per database round trip
+    export_fields = [
+        'id', 'full_name', 'email', 'phone', 'status', 'experience_years', 'skills', 'created_at',
+        'extraction_confidence'
+    ]
+    export_chunk_size = 2000
+    
+    # A logged activity changes the detail response through recent_activities
+    detail_last_modified_fields = ('updated_at', 'activities__created_at')
+    
+    # Actions answered with CandidateDetailSerializer
+    detail_actions = {'retrieve', 'update', 'partial_update'}
+    
+    # Query parameters that leave stats on the precomputed counters
+    unfiltered_stats_params = {'format', 'ordering'}
+    
     def get_queryset(self):
         """Filter candidates to show only those created by the current user"""
-        from django.conf import settings
-        
         # Always filter by user - even in development mode
+        return self.project_queryset(Candidate.objects.filter(added_by=self.request_user()))
+    
+    def request_user(self):
+        """The authenticated user, or in development a shared test user for unauthenticated requests"""
         if self.request.user.is_authenticated:
-            return Candidate.objects.filter(added_by=self.request.user)
-        else:
-            # For unauthenticated requests, create/use a test user
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-            test_user, created = User.objects.get_or_create(
-                email='test@example.com',
-                defaults={
-                    'is_active': True,
-                    'is_staff': False,
-                }
+            return self.request.user
+        
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+        test_user, created = User.objects.get_or_create(
+            email='test@example.com',
+            defaults={
+                'is_active': True,
+                'is_staff': False,
+            }
+        )
+        if created:
+            test_user.set_password('testpass123')
+            test_user.save()
+        return test_user
+    
+    def project_queryset(self, queryset):
+        """Load only the columns the current action reads, with the related rows its serializer uses"""
+        if self.action == 'list':
+            return queryset.select_related('added_by').only(*self.list_fields)
+        if self.action in self.detail_actions:
+            return queryset.select_related('added_by').prefetch_related(
+                CandidateDetailSerializer.recent_activities_prefetch()
             )
-            if created:
-                test_user.set_password('testpass123')
-                test_user.save()
-            
-            return Candidate.objects.filter(added_by=test_user)
+        return queryset
     
     def get_permissions(self):
         """
@@ -93,37 +144,15 @@ class CandidateViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Create candidate with CV parsing and proper user handling"""
-        # Handle user assignment - create test user for development
-        user = self.request.user
-        if not user.is_authenticated:
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-            user, created = User.objects.get_or_create(
-                email='test@example.com',
-                defaults={
-                    'is_active': True,
-                    'is_staff': False,
-                }
-            )
-            if created:
-                user.set_password('testpass123')
-                user.save()
+        user = self.request_user()
         
         candidate = serializer.save(added_by=user)
+        # Rankable straight away; a parse re-vectorizes it with the CV's contents
+        CandidateParsingService.refresh_match_vector(candidate)
         
-        # Parse CV if uploaded
+        # Queue CV parsing so the upload request returns immediately
         if candidate.cv_file and CV_PARSING_AVAILABLE:
-            try:
-                self.parse_and_update_candidate(candidate)
-            except Exception as e:
-                logger.error(f"Error parsing CV for candidate {candidate.id}: {e}")
-                # Create activity log for parsing error
-                CandidateActivity.objects.create(
-                    candidate=candidate,
-                    activity_type='note',
-                    description=f"CV parsing failed: {str(e)}",
-                    user=user
-                )
+            CandidateParsingService.queue_parse(candidate)
         
         # Log creation activity
         CandidateActivity.objects.create(
@@ -133,11 +162,17 @@ class CandidateViewSet(viewsets.ModelViewSet):
             user=user
         )
     
+    def get_serializer_context(self):
+        """Pass search excerpts to the list serializer"""
+        context = super().get_serializer_context()
+        context['search_snippets'] = getattr(self, 'search_snippets', {})
+        return context
+    
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
         if self.action == 'create':
             return CandidateCreateSerializer
-        elif self.action in ['retrieve', 'update', 'partial_update']:
+        elif self.action in self.detail_actions:
             return CandidateDetailSerializer
         else:
             return CandidateListSerializer
@@ -147,6 +182,10 @@ class CandidateViewSet(viewsets.ModelViewSet):
         old_status = serializer.instance.status
         candidate = serializer.save()
         
+        # Keep job rankings in step with edited skills or experience
+        if VECTOR_FIELDS & set(serializer.validated_data):
+            CandidateParsingService.refresh_match_vector(candidate)
+        
         # Log status change
         if old_status != candidate.status:
             CandidateActivity.objects.create(
@@ -155,90 +194,15 @@ class CandidateViewSet(viewsets.ModelViewSet):
                 description=f"Status changed from {old_status} to {candidate.status}",
                 user=self.request.user
             )
+            # Let the response read the new activity instead of the prefetched ones
+            vars(candidate).pop(CandidateDetailSerializer.RECENT_ACTIVITIES_ATTR, None)
     
     def parse_and_update_candidate(self, candidate):
         """Parse CV and update candidate information"""
         if not candidate.cv_file or not CV_PARSING_AVAILABLE:
             return
         
-        try:
-            # Read CV file
-            cv_file_path = candidate.cv_file.path
-            with open(cv_file_path, 'rb') as f:
-                file_content = f.read()
-            
-            # Parse CV
-            parsed_data = cv_parser.parse_cv(candidate.cv_file.name, file_content)
-            
-            # Update candidate with parsed data
-            update_fields = []
-            
-            if parsed_data.get('full_name') and not candidate.full_name:
-                candidate.full_name = parsed_data['full_name']
-                update_fields.append('full_name')
-            
-            if parsed_data.get('email') and not candidate.email:
-                candidate.email = parsed_data['email']
-                update_fields.append('email')
-            
-            if parsed_data.get('phone') and not candidate.phone:
-                candidate.phone = parsed_data['phone']
-                update_fields.append('phone')
-            
-            if parsed_data.get('linkedin_url'):
-                candidate.linkedin_url = parsed_data['linkedin_url']
-                update_fields.append('linkedin_url')
-            
-            if parsed_data.get('github_url'):
-                candidate.github_url = parsed_data['github_url']
-                update_fields.append('github_url')
-            
-            if parsed_data.get('summary'):
-                candidate.summary = parsed_data['summary']
-                update_fields.append('summary')
-            
-            if parsed_data.get('skills'):
-                candidate.skills = parsed_data['skills']
-                update_fields.append('skills')
-            
-            if parsed_data.get('experience_years') is not None:
-                candidate.experience_years = parsed_data['experience_years']
-                update_fields.append('experience_years')
-            
-            if parsed_data.get('education'):
-                candidate.education = parsed_data['education']
-                update_fields.append('education')
-            
-            if parsed_data.get('work_experience'):
-                candidate.work_experience = parsed_data['work_experience']
-                update_fields.append('work_experience')
-            
-            if parsed_data.get('certifications'):
-                candidate.certifications = parsed_data['certifications']
-                update_fields.append('certifications')
-            
-            if parsed_data.get('languages'):
-                candidate.languages = parsed_data['languages']
-                update_fields.append('languages')
-            
-            candidate.extracted_text = parsed_data.get('extracted_text', '')
-            candidate.extraction_confidence = parsed_data.get('extraction_confidence', 0.0)
-            update_fields.extend(['extracted_text', 'extraction_confidence'])
-            
-            if update_fields:
-                candidate.save(update_fields=update_fields + ['updated_at'])
-                
-                # Log parsing success
-                CandidateActivity.objects.create(
-                    candidate=candidate,
-                    activity_type='note',
-                    description=f"CV parsed successfully. Confidence: {candidate.extraction_confidence:.2f}. Updated fields: {', '.join(update_fields)}",
-                    user=candidate.added_by
-                )
-            
-        except Exception as e:
-            logger.error(f"Error parsing CV for candidate {candidate.id}: {e}")
-            raise
+        CandidateParsingService.parse_candidate(candidate)
     
     @action(detail=True, methods=['get'])
     def download_cv(self, request, pk=None):
@@ -415,44 +379,267 @@ class CandidateViewSet(viewsets.ModelViewSet):
         serializer = CandidateActivitySerializer(activities, many=True)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['get'])
+    def parse_status(self, request, pk=None):
+        """Get the CV parsing status for a candidate"""
+        candidate = self.get_object()
+        data = {field: getattr(candidate, field) for field in self.parse_status_fields}
+        if candidate.parse_status == 'parsed':
+            data['possible_duplicates'] = self._duplicates_of(candidate)
+        return Response(data)
+    
+    @action(detail=True, methods=['get'])
+    def duplicates(self, request, pk=None):
+        """Get candidates whose CV text is nearly identical to this candidate's"""
+        candidate = self.get_object()
+        try:
+            threshold = float(request.query_params.get('threshold', DuplicateIndex.default_threshold()))
+        except ValueError:
+            return Response(
+                {'error': 'threshold must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({'results': self._duplicates_of(candidate, threshold)})
+    
+    def _resolution_queryset(self):
+        """Candidates the user may merge: all of them for staff, otherwise their own"""
+        if self.request.user.is_staff:
+            return Candidate.objects.all()
+        return self.get_queryset()
+    
+    @action(detail=False, methods=['get'])
+    def match_suggestions(self, request):
+        """Get candidate pairs that entity resolution scored as the same person"""
+        match_status = request.query_params.get('status', 'pending')
+        if match_status not in dict(CandidateMatch.STATUS_CHOICES):
+            return Response(
+                {'error': 'Invalid status'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        scope = self._resolution_queryset().values('pk')
+        if match_status == 'merged':
+            # The duplicate's side of a merged pair is cleared when it is deleted
+            matches = CandidateMatch.objects.filter(
+                Q(candidate_a__in=scope, candidate_b__in=scope)
+                | Q(candidate_a__in=scope, candidate_b__isnull=True)
+                | Q(candidate_a__isnull=True, candidate_b__in=scope),
+                status=match_status
+            )
+        else:
+            matches = CandidateMatch.objects.filter(status=match_status, candidate_a__in=scope, candidate_b__in=scope)
+        matches = matches.select_related('candidate_a__added_by', 'candidate_b__added_by')
+        page = self.paginate_queryset(matches)
+        if page is not None:
+            return self.get_paginated_response(CandidateMatchSerializer(page, many=True).data)
+        return Response(CandidateMatchSerializer(matches, many=True).data)
+    
+    @action(detail=False, methods=['post'])
+    def dismiss_match(self, request):
+        """Mark a suggested pair as not being the same person"""
+        scope = self._resolution_queryset().values('pk')
+        try:
+            updated = CandidateMatch.objects.filter(
+                id=request.data.get('match_id'), candidate_a__in=scope, candidate_b__in=scope
+            ).update(status='dismissed')
+        except (ValueError, TypeError):
+            updated = 0
+        
+        if not updated:
+            return Response(
+                {'error': 'Match not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'message': 'Match dismissed'})
+    
+    @action(detail=True, methods=['post'])
+    def merge(self, request, pk=None):
+        """Merge duplicate candidates into this one, moving their activities, tags and interviews"""
+        queryset = self._resolution_queryset()
+        primary = get_object_or_404(queryset, pk=pk)
+        duplicate_ids = request.data.get('duplicate_ids', [])
+        
+        if not duplicate_ids:
+            return Response(
+                {'error': 'No duplicates selected'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            duplicates = list(queryset.filter(id__in=duplicate_ids).exclude(pk=primary.pk))
+        except ValidationError:
+            return Response(
+                {'error': 'Invalid candidate ID'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(duplicates) != len(set(map(str, duplicate_ids)) - {str(primary.pk)}):
+            return Response(
+                {'error': 'Some candidates were not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        CandidateMergeService.merge(primary, duplicates, request.user if request.user.is_authenticated else None)
+        return Response(CandidateDetailSerializer(primary, context=self.get_serializer_context()).data)
+    
+    def _duplicates_of(self, candidate, threshold=None):
+        matches = DuplicateIndex.find_for(candidate, self.get_queryset(), threshold)
+        found = self.get_queryset().in_bulk([candidate_id for candidate_id, _score in matches])
+        return [
+            {
+                'id': candidate_id,
+                'full_name': found[candidate_id].display_name,
+                'email': found[candidate_id].email,
+                'similarity': score,
+            }
+            for candidate_id, score in matches if candidate_id in found
+        ]
+    
+    @action(detail=False, methods=['get'])
+    def slowest_parses(self, request):
+        """Get the candidates whose CVs took longest to parse, with per-stage timings"""
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        slowest = self.get_queryset().filter(parse_duration_ms__isnull=False).order_by('-parse_duration_ms')
+        results = list(slowest.values(
+            'id', 'full_name', 'cv_filename', 'parse_duration_ms', 'parse_timings', 'parsed_at'
+        )[:limit])
+        return Response({'results': results})
+    
+    @action(detail=False, methods=['get'])
+    def skill_facets(self, request):
+        """Get the number of candidates with each skill among the current filter results"""
+        try:
+            limit = min(int(request.query_params.get('limit', 50)), 500)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        candidates = self.filter_queryset(self.get_queryset())
+        facets = (
+            CandidateSkill.objects.filter(candidate__in=candidates.values('pk'))
+            .values('key')
+            .annotate(name=Min('name'), count=Count('candidate'))
+            .order_by('-count', 'key')[:limit]
+        )
+        return Response({'results': [{'skill': facet['name'], 'count': facet['count']} for facet in facets]})
+    
+    @action(detail=False, methods=['get', 'post'])
+    def parse_statuses(self, request):
+        """Get CV parsing status for many candidates at once"""
+        if request.method == 'POST':
+            candidate_ids = request.data.get('candidate_ids', [])
+        else:
+            candidate_ids = [i for i in request.query_params.get('ids', '').split(',') if i]
+        
+        if not candidate_ids:
+            return Response(
+                {'error': 'No candidates selected'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            statuses = list(self.get_queryset().filter(id__in=candidate_ids).values(*self.parse_status_fields))
+        except ValidationError:
+            return Response(
+                {'error': 'Invalid candidate ID'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({'results': statuses})
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get candidate statistics"""
-        queryset = self.filter_queryset(self.get_queryset())
+        """
+        Get candidate statistics.
+        
+        Unfiltered stats are read from the precomputed CandidateCounter rows;
+        filters or a search fall back to counting the matching candidates.
+        """
+        if not set(request.query_params) - self.unfiltered_stats_params:
+            serializer = CandidateStatsSerializer(CandidateCounter.stats(self.request_user()))
+            return Response(serializer.data)
         
-        # Status distribution
-        status_stats = queryset.values('status').annotate(count=Count('id'))
+        queryset = self.filter_queryset(self.get_queryset())
         
-        # Total counts
-        total_candidates = queryset.count()
+        # Status distribution; clear the list ordering so it does not split the groups
+        status_stats = queryset.order_by().values('status').annotate(count=Count('id'))
         
-        # Recent activity
-        recent_candidates = queryset.filter(
-            created_at__gte=timezone.now() - timedelta(days=30)
-        ).count()
+        # All counts in one pass over the candidates
+        totals = queryset.aggregate(
+            total_candidates=Count('id'),
+            recent_candidates=Count('id', filter=Q(created_at__date__gte=CandidateCounter.recent_since())),
+            with_cv=Count('id', filter=~Q(cv_file='')),
+            parsed=Count('id', filter=Q(extraction_confidence__gt=0)),
+            high_confidence=Count('id', filter=Q(extraction_confidence__gte=0.7)),
+        )
         
         stats = {
-            'total_candidates': total_candidates,
-            'recent_candidates': recent_candidates,
+            'total_candidates': totals['total_candidates'],
+            'recent_candidates': totals['recent_candidates'],
             'status_distribution': {item['status']: item['count'] for item in status_stats},
             'parsing_stats': {
-                'with_cv': queryset.exclude(cv_file='').count(),
-                'parsed': queryset.filter(extraction_confidence__gt=0).count(),
-                'high_confidence': queryset.filter(extraction_confidence__gte=0.7).count(),
+                'with_cv': totals['with_cv'],
+                'parsed': totals['parsed'],
+                'high_confidence': totals['high_confidence'],
             }
         }
         
         serializer = CandidateStatsSerializer(stats)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'], parser_classes=[DiskMultiPartParser])
+    def bulk_upload(self, request):
+        """
+        Upload many CVs, as several ``files`` parts and/or zip archives, in one
+        request. Returns a job id right away; the CVs are parsed by workers.
+        """
+        uploads = request.FILES.getlist('files')
+        if not uploads:
+            return Response(
+                {'error': 'No files uploaded'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        file_count = BulkUploadService.count_files(uploads)
+        if file_count > BulkUploadService.max_files():
+            return Response(
+                {'error': f'A bulk upload can contain at most {BulkUploadService.max_files()} files, got {file_count}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        job = BulkUploadService.create_job(uploads, user=self.request_user())
+        return Response(BulkUploadService.summary(job), status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'], url_path=r'bulk_upload/(?P<job_id>[0-9a-f-]{36})')
+    def bulk_upload_status(self, request, job_id=None):
+        """Get the progress and per-file results of a bulk upload, queueing files the broker missed again"""
+        job = get_object_or_404(BulkUploadJob, id=job_id, created_by=self.request_user())
+        BulkUploadService.redispatch(job.items.all())
+        return Response(BulkUploadService.summary(job))
+    
     @action(detail=False, methods=['post'])
     def bulk_update_status(self, request):
-        """Bulk update candidate status"""
+        """
+        Bulk update candidate status.
+        
+        Candidates are chosen by ``candidate_ids``, or with ``all_matching``
+        by the same query parameters (filters and search) as the list.
+        """
         candidate_ids = request.data.get('candidate_ids', [])
+        all_matching = request.data.get('all_matching') in (True, 'true', '1')
         new_status = request.data.get('status')
         note = request.data.get('note', '').strip()
         
-        if not candidate_ids:
+        if not candidate_ids and not all_matching:
             return Response(
                 {'error': 'No candidates selected'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -464,57 +651,60 @@ class CandidateViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update candidates
-        candidates = Candidate.objects.filter(id__in=candidate_ids)
-        updated_count = 0
+        if all_matching:
+            queryset = self.filter_queryset(self.get_queryset())
+            candidate_ids = None
+        else:
+            try:
+                candidate_ids = list({uuid.UUID(str(candidate_id)) for candidate_id in candidate_ids})
+            except (TypeError, ValueError):
+                return Response(
+                    {'error': 'Invalid candidate id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = self.get_queryset()
         
-        for candidate in candidates:
-            old_status = candidate.status
-            candidate.status = new_status
-            candidate.save(update_fields=['status', 'updated_at'])
-            
-            # Log activity
-            description = f"Bulk status change from {old_status} to {new_status}"
-            if note:
-                description += f". Note: {note}"
-            
-            CandidateActivity.objects.create(
-                candidate=candidate,
-                activity_type='status_changed',
-                description=description,
-                user=request.user
-            )
-            updated_count += 1
+        result = CandidateStatusService.bulk_update_status(
+            queryset, new_status, user=request.user if request.user.is_authenticated else None,
+            note=note, candidate_ids=candidate_ids
+        )
         
         return Response({
-            'message': f'Updated status for {updated_count} candidates',
-            'updated_count': updated_count
+            'message': f"Updated status for {result['updated_count']} candidates",
+            **result
         })
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'],
+            renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [CSVRenderer, NDJSONRenderer])
     def export(self, request):
-        """Export candidates data"""
+        """
+        Export candidates data.
+        
+        CSV (``Accept: text/csv`` or ``?format=csv``) and NDJSON
+        (``application/x-ndjson`` or ``?format=ndjson``) are streamed straight
+        from a database iterator; JSON is built in memory as before.
+        """
         queryset = self.filter_queryset(self.get_queryset())
+        rows = export_rows(queryset, self.export_fields, self.export_chunk_size)
         
-        # Simple CSV export data
-        candidates_data = []
-        for candidate in queryset:
-            candidates_data.append({
-                'id': candidate.id,
-                'full_name': candidate.full_name,
-                'email': candidate.email,
-                'phone': candidate.phone,
-                'status': candidate.status,
-                'experience_years': candidate.experience_years,
-                'skills': ', '.join(candidate.skills) if candidate.skills else '',
-                'created_at': candidate.created_at.isoformat(),
-                'extraction_confidence': candidate.extraction_confidence
+        export_format = request.accepted_renderer.format
+        if export_format == CSVRenderer.format:
+            response = StreamingHttpResponse(iter_csv(rows, self.export_fields), content_type='text/csv; charset=utf-8')
+        elif export_format == NDJSONRenderer.format:
+            response = StreamingHttpResponse(iter_ndjson(rows), content_type='application/x-ndjson; charset=utf-8')
+        else:
+            candidates_data = []
+            for row in rows:
+                row['skills'] = ', '.join(row['skills'])
+                candidates_data.append(row)
+            
+            return Response({
+                'candidates': candidates_data,
+                'total_count': len(candidates_data)
             })
         
-        return Response({
-            'candidates': candidates_data,
-            'total_count': len(candidates_data)
-        })
+        response['Content-Disposition'] = f'attachment; filename="candidates.{export_format}"'
+        return response
     
     @action(detail=True, methods=['get'])
     def confidence_breakdown(self, request, pk=None):
@@ -617,6 +807,7 @@ class CandidateActivityViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = CandidateActivity.objects.all()
     serializer_class = CandidateActivitySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['candidate', 'activity_type', 'user']
     ordering = ['-created_at']
@@ -625,7 +816,7 @@ class CandidateActivityViewSet(viewsets.ReadOnlyModelViewSet):
         """Filter activities for candidates created by current user"""
         return CandidateActivity.objects.filter(
             candidate__added_by=self.request.user
-        )
+        ).select_related('user')
 
 # Utility views for CV parsing status
 def cv_parsing_status(request):
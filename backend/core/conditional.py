@@ -0,0 +1,112 @@
+"""
+Conditional GET (ETag / Last-Modified) support shared by the API apps
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def resource_etag(request, *parts) -> str:
+    """
+    Weak ETag for a representation of the given version parts. The path,
+    query string, user and rendered format are mixed in, so two pages,
+    two users or a JSON and a CSV rendering never share a validator.
+    """
+    renderer = getattr(request, 'accepted_renderer', None)
+    user = getattr(request, 'user', None)
+    key = '|'.join(str(part) for part in (
+        request.get_full_path(), getattr(user, 'pk', None), getattr(renderer, 'format', ''), *parts
+    ))
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+def not_modified(request, etag, last_modified=None):
+    """A 304 response when the request's validators still match, otherwise None"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """Attach ETag and Last-Modified, and make clients revalidate before reusing the response"""
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified validators for ``list`` and ``retrieve``.
+
+    Before anything is serialized the view reads a version of what it is
+    about to return: for a list, MAX(updated_at) and COUNT(*) of the
+    filtered queryset, which also changes when rows are deleted or leave
+    the filter (KeysetPagination narrows this to the requested page); for
+    a detail, MAX of ``detail_last_modified_fields`` for
+    that one row, so related rows shown with the object (an activity
+    logged against a candidate, say) count as a change too. When the
+    client's ``If-None-Match`` or ``If-Modified-Since`` still matches, the
+    view answers 304 with no body.
+
+    Only object-level permissions are skipped on a 304, so this suits
+    viewsets whose get_queryset already limits what a user can see.
+    """
+
+    last_modified_field = 'updated_at'
+    detail_last_modified_fields = ('updated_at',)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        version = self.list_version(queryset)
+        etag = resource_etag(request, *(version[key] for key in sorted(version)))
+        response = not_modified(request, etag, version['last_modified'])
+        if response is not None:
+            return response
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+        return set_validators(response, etag, version['last_modified'])
+
+    def retrieve(self, request, *args, **kwargs):
+        last_modified = self.object_last_modified()
+        if last_modified is None:
+            # Missing or malformed lookups get the usual 404 from get_object
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = resource_etag(request, last_modified)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+
+    def list_version(self, queryset):
+        """Aggregates of the listed rows that change with the response, last_modified among them"""
+        paginator = self.paginator
+        if hasattr(paginator, 'page_version'):
+            return paginator.page_version(queryset, self.request, self.last_modified_field)
+        return queryset.aggregate(last_modified=Max(self.last_modified_field), count=Count('pk'))
+
+    def object_last_modified(self):
+        """Latest change to the requested object and the related rows in detail_last_modified_fields"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            versions = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).aggregate(*(Max(field) for field in self.detail_last_modified_fields))
+        except (TypeError, ValueError, ValidationError):
+            return None
+        return max((value for value in versions.values() if value is not None), default=None)
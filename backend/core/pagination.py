@@ -0,0 +1,145 @@
+"""
+Pagination classes shared by the API apps
+"""
+import base64
+import json
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connection
+from django.db.models import Count, Max, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with opt-in keyset (seek) pagination.
+
+    Requests without ``?cursor=`` page exactly like PageNumberPagination.
+    Passing ``?cursor=`` (empty for the first page) switches to newest-first
+    pages on (created_at, id): each page continues from the last row of the
+    previous one with an indexed range condition, so there is no COUNT(*) and
+    no OFFSET and a deep page costs the same as the first. The ordering is
+    fixed in this mode and ``?ordering=`` is ignored.
+
+    ``?total=approximate`` adds a row count: the planner's estimate on
+    PostgreSQL, elsewhere an exact count stopped at ``approximate_count_cap``.
+    """
+
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+    keyset_fields = ('created_at', 'id')
+    approximate_count_cap = 10000
+    known_count = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        created_field, id_field = self.keyset_fields
+
+        queryset = queryset.order_by(f'-{created_field}', f'-{id_field}')
+        self.total = None
+        if request.query_params.get(self.total_query_param) == 'approximate':
+            self.total = self.approximate_count(queryset)
+
+        rows = list(self.after_cursor(queryset, request)[:page_size + 1])
+        self.page_rows = rows[:page_size]
+        self.next_cursor = self.encode_cursor(self.page_rows[-1]) if len(rows) > page_size else None
+        return self.page_rows
+
+    def after_cursor(self, queryset, request):
+        """queryset narrowed to the rows after the request's cursor, if it has one"""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return queryset
+        created_field, id_field = self.keyset_fields
+        created_at, row_id = self.decode_cursor(cursor, queryset.model)
+        return queryset.filter(
+            Q(**{f'{created_field}__lt': created_at})
+            | Q(**{created_field: created_at, f'{id_field}__lt': row_id})
+        )
+
+    def page_version(self, queryset, request, last_modified_field='updated_at'):
+        """
+        Values that change whenever the page this request asks for would,
+        read without loading or serializing the rows. Page-number requests
+        take MAX(last_modified_field) and COUNT(*) of the whole queryset and
+        hand the count on to the paginator, so the list still counts once.
+        Keyset requests read only the (id, last modified) pairs of their page
+        window, keeping that mode free of COUNT and OFFSET.
+        """
+        if self.cursor_query_param not in request.query_params:
+            version = queryset.aggregate(last_modified=Max(last_modified_field), count=Count('pk'))
+            self.known_count = version['count']
+            return version
+
+        created_field, id_field = self.keyset_fields
+        window = self.after_cursor(queryset.order_by(f'-{created_field}', f'-{id_field}'), request)
+        rows = list(window[:self.get_page_size(request) + 1].values_list(id_field, last_modified_field))
+        return {
+            'last_modified': max((modified for _row_id, modified in rows if modified), default=None),
+            'rows': rows,
+        }
+
+    def django_paginator_class(self, object_list, per_page):
+        """Django's paginator, reusing the row count page_version already read"""
+        paginator = DjangoPaginator(object_list, per_page)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        payload = {'next': self.get_next_link(), 'results': data}
+        if self.total is not None:
+            payload['count'], payload['count_is_exact'] = self.total
+        return Response(payload)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def encode_cursor(self, row) -> str:
+        values = [row[field] if isinstance(row, dict) else getattr(row, field) for field in self.keyset_fields]
+        payload = json.dumps([values[0].isoformat(), str(values[1])])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str, model):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            created_at = parse_datetime(created_at)
+            row_id = model._meta.get_field(self.keyset_fields[1]).to_python(row_id)
+        except Exception:
+            raise NotFound("Invalid cursor")
+        if created_at is None:
+            raise NotFound("Invalid cursor")
+        return created_at, row_id
+
+    def approximate_count(self, queryset):
+        """(count, is_exact) without scanning more than a bounded number of rows"""
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows']), False
+
+        count = queryset[:self.approximate_count_cap + 1].count()
+        if count > self.approximate_count_cap:
+            return self.approximate_count_cap, False
+        return count, True
@@ -210,6 +210,51 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 FILE_UPLOAD_PERMISSIONS = 0o644
 
+# Parse uploaded CVs in a Celery worker instead of inside the request
+CV_PARSING_ASYNC = config('CV_PARSING_ASYNC', default=True, cast=bool)
+
+# Extract PDF/DOCX text in a pool of child processes with per-document limits
+CV_EXTRACTION_SANDBOX = config('CV_EXTRACTION_SANDBOX', default=True, cast=bool)
+CV_EXTRACTION_WORKERS = config('CV_EXTRACTION_WORKERS', default=2, cast=int)
+CV_EXTRACTION_TIMEOUT = config('CV_EXTRACTION_TIMEOUT', default=30, cast=int)  # seconds
+CV_EXTRACTION_MEMORY_LIMIT_MB = config('CV_EXTRACTION_MEMORY_LIMIT_MB', default=512, cast=int)
+
+# How often each process checks the skill taxonomy version for edits
+CV_SKILL_TAXONOMY_CHECK_SECONDS = config('CV_SKILL_TAXONOMY_CHECK_SECONDS', default=5, cast=int)
+
+# Store per-stage parse timings on the candidate (Candidate.parse_timings)
+CV_PARSE_PERSIST_TIMINGS = config('CV_PARSE_PERSIST_TIMINGS', default=False, cast=bool)
+
+# Flag parsed CVs whose text is at least this similar (estimated Jaccard) to another candidate's
+CV_DUPLICATE_DETECTION = config('CV_DUPLICATE_DETECTION', default=True, cast=bool)
+CV_DUPLICATE_THRESHOLD = config('CV_DUPLICATE_THRESHOLD', default=0.8, cast=float)
+
+# Entity resolution: pair score needed to suggest a merge, and the country assumed for national phone numbers
+CANDIDATE_MATCH_THRESHOLD = config('CANDIDATE_MATCH_THRESHOLD', default=0.7, cast=float)
+CANDIDATE_PHONE_COUNTRY_CODE = config('CANDIDATE_PHONE_COUNTRY_CODE', default='1')
+
+# Candidate full-text search: 'auto' (FTS5 on SQLite, tsvector on PostgreSQL), 'sqlite_fts', 'postgres' or 'none'
+CANDIDATE_SEARCH_BACKEND = config('CANDIDATE_SEARCH_BACKEND', default='auto')
+CANDIDATE_SEARCH_MAX_RESULTS = config('CANDIDATE_SEARCH_MAX_RESULTS', default=500, cast=int)
+
+# Most CVs (files or zip archive members) accepted by one bulk upload request
+CV_BULK_UPLOAD_MAX_FILES = config('CV_BULK_UPLOAD_MAX_FILES', default=1000, cast=int)
+
+# Candidate ranking: how often each process checks for re-vectorized candidates,
+# and how many changed rows it patches in before reloading the whole matrix
+SCORING_INDEX_CHECK_SECONDS = config('SCORING_INDEX_CHECK_SECONDS', default=5, cast=int)
+SCORING_INDEX_COMPACT_ROWS = config('SCORING_INDEX_COMPACT_ROWS', default=5000, cast=int)
+
+# CV Parse Result Cache
+CV_PARSE_CACHE_ENABLED = config('CV_PARSE_CACHE_ENABLED', default=True, cast=bool)
+CV_PARSE_CACHE_BACKEND = config('CV_PARSE_CACHE_BACKEND', default='db')  # 'db' or 'filesystem'
+CV_PARSE_CACHE_DIR = config('CV_PARSE_CACHE_DIR', default=os.path.join(BASE_DIR, 'cv_parse_cache'))
+CV_PARSE_CACHE_MAX_ENTRIES = config('CV_PARSE_CACHE_MAX_ENTRIES', default=10000, cast=int)
+CV_PARSE_CACHE_MAX_BYTES = config('CV_PARSE_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int)  # 512MB
+# Limits are checked on every Nth store; a hit rewrites its LRU time only once it is this old
+CV_PARSE_CACHE_EVICT_EVERY = config('CV_PARSE_CACHE_EVICT_EVERY', default=50, cast=int)
+CV_PARSE_CACHE_TOUCH_SECONDS = config('CV_PARSE_CACHE_TOUCH_SECONDS', default=300, cast=int)
+
 # Video Upload Settings
 MAX_VIDEO_FILE_SIZE = 500 * 1024 * 1024  # 500MB
 ALLOWED_VIDEO_FORMATS = [
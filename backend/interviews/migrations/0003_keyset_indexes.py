@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-17 02:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0011_keyset_indexes'),
+        ('interviews', '0002_interview_ai_analysis_status_interview_ai_keywords_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['created_at', 'id'], name='interviews__created_2ae266_idx'),
+        ),
+    ]
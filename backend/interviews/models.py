@@ -128,6 +128,7 @@ class Interview(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['interviewer']),
             models.Index(fields=['candidate']),
+            models.Index(fields=['created_at', 'id']),
         ]
     
     def __str__(self):
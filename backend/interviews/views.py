@@ -5,6 +5,7 @@ import logging
 from datetime import datetime, timedelta, date, time
 from django.utils import timezone
 from django.db.models import Q, Count, Avg
+from django.db.models.functions import TruncMonth
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
@@ -24,15 +25,18 @@ from .serializers import (
     InterviewStatsSerializer, AvailableSlotSerializer
 )
 from candidates.models import Candidate
+from core.conditional import ConditionalGetMixin, not_modified, resource_etag, set_validators
+from core.pagination import KeysetPagination
 
 logger = logging.getLogger(__name__)
 
-class InterviewViewSet(viewsets.ModelViewSet):
+class InterviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing interviews
     """
     queryset = Interview.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     filterset_fields = ['status', 'interviewer', 'candidate', 'interview_type', 'priority', 'meeting_type']
@@ -40,6 +44,9 @@ class InterviewViewSet(viewsets.ModelViewSet):
     ordering_fields = ['scheduled_date', 'created_at', 'priority']
     ordering = ['scheduled_date']
     
+    # Feedback and the candidate are saved on their own rows but shown in the interview details
+    detail_last_modified_fields = ('updated_at', 'detailed_feedback__updated_at', 'candidate__updated_at')
+    
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
         if self.action == 'list':
@@ -171,34 +178,35 @@ class InterviewViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get interview statistics"""
-        queryset = self.get_queryset()
-        
-        # Basic counts
-        total_interviews = queryset.count()
-        upcoming_interviews = queryset.filter(
-            scheduled_date__gte=timezone.now(),
-            status__in=['scheduled', 'confirmed']
-        ).count()
-        
-        today = timezone.now().date()
-        today_interviews = queryset.filter(scheduled_date__date=today).count()
-        
-        overdue_interviews = queryset.filter(
-            scheduled_date__lt=timezone.now(),
-            status__in=['scheduled', 'confirmed']
-        ).count()
-        
-        completed_interviews = queryset.filter(status='completed').count()
-        cancelled_interviews = queryset.filter(status='cancelled').count()
+        # The permission filter joins additional interviewers; count each interview once
+        queryset = Interview.objects.filter(pk__in=self.get_queryset().values('pk'))
+        now = timezone.now()
+        pending = Q(status__in=['scheduled', 'confirmed'])
+        
+        # Basic counts in one pass
+        counts = queryset.aggregate(
+            total_interviews=Count('id'),
+            upcoming_interviews=Count('id', filter=pending & Q(scheduled_date__gte=now)),
+            today_interviews=Count('id', filter=Q(scheduled_date__date=now.date())),
+            overdue_interviews=Count('id', filter=pending & Q(scheduled_date__lt=now)),
+            completed_interviews=Count('id', filter=Q(status='completed')),
+            cancelled_interviews=Count('id', filter=Q(status='cancelled')),
+        )
+        total_interviews = counts['total_interviews']
+        upcoming_interviews = counts['upcoming_interviews']
+        today_interviews = counts['today_interviews']
+        overdue_interviews = counts['overdue_interviews']
+        completed_interviews = counts['completed_interviews']
+        cancelled_interviews = counts['cancelled_interviews']
         
         # Status distribution
-        status_stats = queryset.values('status').annotate(count=Count('id'))
+        status_stats = queryset.order_by().values('status').annotate(count=Count('id'))
         status_distribution = {item['status']: item['count'] for item in status_stats}
         
         # Interviewer workload
         interviewer_stats = queryset.filter(
-            scheduled_date__gte=timezone.now()
-        ).values(
+            scheduled_date__gte=now
+        ).order_by().values(
             'interviewer__first_name', 'interviewer__last_name'
         ).annotate(count=Count('id'))
         
@@ -207,19 +215,23 @@ class InterviewViewSet(viewsets.ModelViewSet):
             name = f"{item['interviewer__first_name']} {item['interviewer__last_name']}"
             interviewer_workload[name] = item['count']
         
-        # Monthly trends (last 6 months)
-        monthly_trends = {}
-        for i in range(6):
-            month_start = (timezone.now().replace(day=1) - timedelta(days=i*30)).replace(day=1)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            month_count = queryset.filter(
-                scheduled_date__gte=month_start,
-                scheduled_date__lte=month_end
-            ).count()
-            
-            month_name = month_start.strftime('%B %Y')
-            monthly_trends[month_name] = month_count
+        # Monthly trends (last 6 calendar months) from one grouped query
+        month_starts = []
+        month_start = timezone.localtime(now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(6):
+            month_starts.append(month_start)
+            month_start = (month_start - timedelta(days=1)).replace(day=1)
+        
+        month_counts = {
+            item['month'].date(): item['count']
+            for item in queryset.filter(scheduled_date__gte=month_starts[-1])
+            .annotate(month=TruncMonth('scheduled_date')).order_by()
+            .values('month').annotate(count=Count('id'))
+        }
+        monthly_trends = {
+            month_start.strftime('%B %Y'): month_counts.get(month_start.date(), 0)
+            for month_start in month_starts
+        }
         
         stats = {
             'total_interviews': total_interviews,
@@ -610,7 +622,8 @@ class InterviewAIAnalysisViewSet(viewsets.ViewSet):
     def analysis_status(self, request, pk=None):
         """Get AI analysis status"""
         try:
-            interview = Interview.objects.get(pk=pk)
+            # Only what the permission check and validators need; the transcript waits for a changed status
+            interview = Interview.objects.only('id', 'interviewer', 'updated_at').get(pk=pk)
         except Interview.DoesNotExist:
             return Response(
                 {'error': 'Interview not found'},
@@ -626,6 +639,12 @@ class InterviewAIAnalysisViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        etag = resource_etag(request, interview.updated_at)
+        response = not_modified(request, etag, interview.updated_at)
+        if response is not None:
+            return response
+        interview = get_object_or_404(Interview, pk=pk)
+        
         analysis_data = {
             'interview_id': str(interview.id),
             'status': interview.ai_analysis_status,
@@ -648,7 +667,7 @@ class InterviewAIAnalysisViewSet(viewsets.ViewSet):
                 'transcript': interview.transcript
             }
         
-        return Response(analysis_data)
+        return set_validators(Response(analysis_data), etag, interview.updated_at)
     
     @action(detail=True, methods=['post'])
     def reanalyze(self, request, pk=None):
@@ -1,3 +1,20 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import JobRequirement, ScoringTerm
+
+
+@admin.register(JobRequirement)
+class JobRequirementAdmin(admin.ModelAdmin):
+    """Admin interface for JobRequirement model"""
+    list_display = ['title', 'min_experience_years', 'is_active', 'created_by', 'created_at']
+    list_filter = ['is_active', 'created_at']
+    search_fields = ['title', 'description']
+    readonly_fields = ['id', 'created_at', 'updated_at']
+
+
+@admin.register(ScoringTerm)
+class ScoringTermAdmin(admin.ModelAdmin):
+    """Admin interface for ScoringTerm model"""
+    list_display = ['key', 'document_count']
+    search_fields = ['key']
+    ordering = ['-document_count']
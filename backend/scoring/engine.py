@@ -0,0 +1,218 @@
+"""
+In-memory candidate matrix that ranks candidates for a job with one sparse matrix-vector product
+"""
+import logging
+import threading
+import time
+from typing import List, Tuple
+
+from django.conf import settings
+
+from .models import CandidateVector, ScoringIndexVersion
+from .vectors import EXPERIENCE_WEIGHT, CandidateVectorService, unpack
+
+try:
+    import numpy as np
+    from scipy import sparse
+    SCORING_ENGINE_AVAILABLE = True
+except ImportError:
+    np = None
+    sparse = None
+    SCORING_ENGINE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Ranked candidates are (candidate id, score), best first
+Ranking = List[Tuple[object, float]]
+
+# Owner of discarded rows, which never match an owner_id
+DISCARDED_OWNER = -1
+
+class MatchingIndex:
+    """
+    Every CandidateVector as rows of one CSR matrix, with the owner and
+    experience of each row in parallel arrays.
+
+    The matrix is loaded once per process. After that, the scoring version
+    is read at most once every SCORING_INDEX_CHECK_SECONDS, and only the
+    vectors written since are fetched by their sequence: rows of
+    re-vectorized or new candidates go to a small overlay matrix whose
+    scores replace theirs. Once the overlay passes SCORING_INDEX_COMPACT_ROWS,
+    or after a full rebuild, the matrix is loaded again. Deleting a candidate
+    does not bump the version, so callers that find a ranked candidate gone
+    discard() its row and rank again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self.sequence = None
+        self.candidate_ids = []
+        self.row_of = {}
+        self.matrix = None
+        self.owners = None
+        self.experience = None
+        self.overlay_rows = {}
+        self.overlay = None
+        self.overlay_positions = None
+
+    @property
+    def size(self) -> int:
+        return len(self.candidate_ids)
+
+    def rank(self, job, owner_id=None, limit: int = 20) -> Ranking:
+        """The ``limit`` best scoring candidates for job, only among owner_id's when given"""
+        # Held throughout so a refresh from another thread cannot swap the arrays mid-ranking
+        with self._lock:
+            self._refresh()
+            if not self.size:
+                return []
+
+            query = CandidateVectorService.job_query(job, self.size)
+            scores = self.scores(query)
+            if owner_id is not None:
+                scores[self.owners != owner_id] = -np.inf
+            else:
+                scores[self.owners == DISCARDED_OWNER] = -np.inf
+
+            limit = min(limit, self.size)
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [
+                (self.candidate_ids[row], round(float(scores[row]), 4))
+                for row in top if np.isfinite(scores[row])
+            ]
+
+    def scores(self, query):
+        """Score of every row: the matrix-vector product plus the experience part"""
+        columns = max(self.matrix.shape[1], self.overlay.shape[1] if self.overlay is not None else 0,
+                      max(query.term_weights, default=-1) + 1)
+        vector = np.zeros(columns, dtype=np.float32)
+        if query.term_weights:
+            vector[np.fromiter(query.term_weights.keys(), dtype=np.int64)] = np.fromiter(
+                query.term_weights.values(), dtype=np.float32
+            )
+
+        scores = np.zeros(self.size, dtype=np.float32)
+        scores[:self.matrix.shape[0]] = self.matrix @ vector[:self.matrix.shape[1]]
+        if self.overlay is not None:
+            scores[self.overlay_positions] = self.overlay @ vector[:self.overlay.shape[1]]
+
+        if query.min_experience_years:
+            scores += EXPERIENCE_WEIGHT * np.minimum(self.experience / query.min_experience_years, 1.0)
+        else:
+            scores += EXPERIENCE_WEIGHT
+        return scores
+
+    def refresh(self):
+        """Load the matrix, or patch in the vectors written since it was loaded"""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        check_seconds = getattr(settings, 'SCORING_INDEX_CHECK_SECONDS', 5)
+        now = time.monotonic()
+        if self.matrix is not None and now - self._checked_at < check_seconds:
+            return
+
+        version, rebuild_version = ScoringIndexVersion.current()
+        if self.matrix is None or rebuild_version > self.sequence:
+            self.load(version)
+        elif version > self.sequence:
+            self.apply_changes(version)
+        self._checked_at = now
+
+    def discard(self, candidate_ids):
+        """Leave rows of deleted candidates out of rankings until a new vector or a reload replaces them"""
+        with self._lock:
+            for candidate_id in candidate_ids:
+                row = self.row_of.get(candidate_id)
+                if row is not None:
+                    self.owners[row] = DISCARDED_OWNER
+
+    def invalidate(self):
+        """Force a version check on the next rank()"""
+        self._checked_at = 0.0
+
+    def load(self, version: int):
+        start = time.perf_counter()
+        candidate_ids, owners, experience = [], [], []
+        indptr = [0]
+        indices, data = bytearray(), bytearray()
+
+        rows = CandidateVector.objects.values_list(
+            'candidate_id', 'candidate__added_by_id', 'experience_years', 'terms', 'weights', 'sequence'
+        )
+        sequence = version
+        for candidate_id, owner_id, years, terms, weights, row_sequence in rows.iterator(chunk_size=5000):
+            candidate_ids.append(candidate_id)
+            owners.append(owner_id or 0)
+            experience.append(years or 0)
+            indices += terms
+            data += weights
+            indptr.append(len(indices) // 4)
+            sequence = max(sequence, row_sequence)
+
+        index_array = np.frombuffer(bytes(indices), dtype='<u4').astype(np.int32)
+        columns = int(index_array.max()) + 1 if len(index_array) else 0
+        self.matrix = sparse.csr_matrix(
+            (np.frombuffer(bytes(data), dtype='<f4').astype(np.float32), index_array, np.array(indptr, dtype=np.int64)),
+            shape=(len(candidate_ids), columns)
+        )
+        self.candidate_ids = candidate_ids
+        self.row_of = {candidate_id: row for row, candidate_id in enumerate(candidate_ids)}
+        self.owners = np.array(owners, dtype=np.int64)
+        self.experience = np.array(experience, dtype=np.float32)
+        self.overlay_rows = {}
+        self.overlay = None
+        self.overlay_positions = None
+        self.sequence = sequence
+        logger.info(
+            f"Loaded matching index v{version}: {len(candidate_ids)} candidates, {self.matrix.nnz} terms "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+    def apply_changes(self, version: int):
+        """Move the vectors written after self.sequence into the overlay"""
+        changed = list(
+            CandidateVector.objects.filter(sequence__gt=self.sequence).values_list(
+                'candidate_id', 'candidate__added_by_id', 'experience_years', 'terms', 'weights', 'sequence'
+            )
+        )
+        compact_rows = getattr(settings, 'SCORING_INDEX_COMPACT_ROWS', 5000)
+        if len(self.overlay_rows) + len(changed) > compact_rows:
+            self.load(version)
+            return
+
+        sequence = version
+        new_ids = [candidate_id for candidate_id, *_rest in changed if candidate_id not in self.row_of]
+        if new_ids:
+            self.row_of.update((candidate_id, self.size + offset) for offset, candidate_id in enumerate(new_ids))
+            self.candidate_ids = self.candidate_ids + new_ids
+            self.owners = np.concatenate([self.owners, np.zeros(len(new_ids), dtype=np.int64)])
+            self.experience = np.concatenate([self.experience, np.zeros(len(new_ids), dtype=np.float32)])
+
+        for candidate_id, owner_id, years, terms, weights, row_sequence in changed:
+            row = self.row_of[candidate_id]
+            self.owners[row] = owner_id or 0
+            self.experience[row] = years or 0
+            self.overlay_rows[candidate_id] = (unpack(terms, 'I'), unpack(weights, 'f'))
+            sequence = max(sequence, row_sequence)
+
+        positions, indptr, indices, data = [], [0], [], []
+        for candidate_id, (terms, weights) in self.overlay_rows.items():
+            positions.append(self.row_of[candidate_id])
+            indices.extend(terms)
+            data.extend(weights)
+            indptr.append(len(indices))
+        columns = max(indices, default=-1) + 1
+        self.overlay = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(positions), columns)
+        )
+        self.overlay_positions = np.array(positions, dtype=np.int64)
+        self.sequence = sequence
+
+
+# Matrix shared by the requests of this process
+matching_index = MatchingIndex()
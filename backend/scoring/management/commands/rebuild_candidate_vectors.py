@@ -0,0 +1,27 @@
+"""
+Recompute every candidate's match vector and the term document counts
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from scoring.models import ScoringTerm
+from scoring.vectors import CandidateVectorService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the candidate vectors used to rank candidates for jobs, resetting document counts "
+        "that drifted as candidates were deleted; running processes reload their matrix afterwards"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Candidates vectorized per batch")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = CandidateVectorService.rebuild(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Vectorized {written} candidates over {ScoringTerm.objects.count()} terms in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:19
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+from scoring.vectors import rebuild_vectors
+
+
+def vectorize_candidates(apps, schema_editor):
+    rebuild_vectors(
+        apps.get_model('candidates', 'Candidate'),
+        apps.get_model('scoring', 'ScoringTerm'),
+        apps.get_model('scoring', 'CandidateVector'),
+        apps.get_model('scoring', 'ScoringIndexVersion'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('candidates', '0013_candidate_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateVector',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='match_vector', serialize=False, to='candidates.candidate')),
+                ('terms', models.BinaryField(help_text='Packed unsigned 32-bit ScoringTerm ids')),
+                ('weights', models.BinaryField(help_text='Packed 32-bit float weights, one per term')),
+                ('experience_years', models.IntegerField(blank=True, null=True)),
+                ('sequence', models.PositiveBigIntegerField(db_index=True, help_text='ScoringIndexVersion that wrote this vector')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScoringIndexVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('rebuild_version', models.PositiveBigIntegerField(default=0, help_text='Version of the last full rebuild')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScoringTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text="'skill:<name>' or 'word:<token>', lowercase", max_length=120, unique=True)),
+                ('document_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobRequirement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('required_skills', models.JSONField(blank=True, default=list)),
+                ('preferred_skills', models.JSONField(blank=True, default=list)),
+                ('min_experience_years', models.PositiveIntegerField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_requirements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.RunPython(vectorize_candidates, migrations.RunPython.noop),
+    ]
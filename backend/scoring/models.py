@@ -1,3 +1,84 @@
-from django.db import models
+"""
+Job requirements and the cached candidate vectors used to rank candidates against them
+"""
+import uuid
 
-# Create your models here.
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.db.models import F
+
+from candidates.models import Candidate
+
+User = get_user_model()
+
+class JobRequirement(models.Model):
+    """An open role that candidates are ranked against"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    required_skills = models.JSONField(default=list, blank=True)
+    preferred_skills = models.JSONField(default=list, blank=True)
+    min_experience_years = models.PositiveIntegerField(default=0)
+    is_active = models.BooleanField(default=True)
+
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_requirements')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.title
+
+class ScoringTerm(models.Model):
+    """A skill or CV word, and how many candidate vectors contain it"""
+    key = models.CharField(max_length=120, unique=True, help_text="'skill:<name>' or 'word:<token>', lowercase")
+    document_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} ({self.document_count})"
+
+class CandidateVector(models.Model):
+    """Sparse term weights of a candidate's skills and CV text, cached for the matching engine"""
+    candidate = models.OneToOneField(Candidate, on_delete=models.CASCADE, primary_key=True, related_name='match_vector')
+    terms = models.BinaryField(help_text="Packed unsigned 32-bit ScoringTerm ids")
+    weights = models.BinaryField(help_text="Packed 32-bit float weights, one per term")
+    experience_years = models.IntegerField(null=True, blank=True)
+    sequence = models.PositiveBigIntegerField(db_index=True, help_text="ScoringIndexVersion that wrote this vector")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Vector of {self.candidate_id}"
+
+def bump_scoring_version(version_model, rebuild: bool = False) -> int:
+    """
+    Move the ScoringIndexVersion row to the next version and return it; the
+    row stays locked until the caller commits. Takes the model class so the
+    initial migration can call it with its historical model.
+    """
+    with transaction.atomic():
+        changes = {'version': F('version') + 1}
+        if rebuild:
+            changes['rebuild_version'] = F('version') + 1
+        if not version_model.objects.filter(pk=1).update(**changes):
+            version_model.objects.create(pk=1, version=1, rebuild_version=1 if rebuild else 0)
+        return version_model.objects.filter(pk=1).values_list('version', flat=True).get()
+
+class ScoringIndexVersion(models.Model):
+    """Single-row counter bumped whenever candidate vectors are written"""
+    version = models.PositiveBigIntegerField(default=0)
+    rebuild_version = models.PositiveBigIntegerField(default=0, help_text="Version of the last full rebuild")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def current(cls):
+        """(version, rebuild_version)"""
+        return cls.objects.filter(pk=1).values_list('version', 'rebuild_version').first() or (0, 0)
+
+    @classmethod
+    def bump(cls, rebuild: bool = False) -> int:
+        return bump_scoring_version(cls, rebuild)
+
+    def __str__(self):
+        return f"Scoring index v{self.version}"
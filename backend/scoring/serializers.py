@@ -0,0 +1,20 @@
+"""
+Serializers for job requirements and candidate rankings
+"""
+from rest_framework import serializers
+
+from .models import JobRequirement
+
+class JobRequirementSerializer(serializers.ModelSerializer):
+    """Serializer for JobRequirement model"""
+    required_skills = serializers.ListField(child=serializers.CharField(max_length=100), required=False)
+    preferred_skills = serializers.ListField(child=serializers.CharField(max_length=100), required=False)
+    created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
+    
+    class Meta:
+        model = JobRequirement
+        fields = [
+            'id', 'title', 'description', 'required_skills', 'preferred_skills', 'min_experience_years',
+            'is_active', 'created_by_name', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
@@ -1,3 +1,211 @@
-from django.test import TestCase
+"""
+Tests for job requirements, candidate vectors and ranking
+"""
+from io import StringIO
+from unittest import skipIf, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from candidates.models import Candidate
+
+from .engine import SCORING_ENGINE_AVAILABLE, MatchingIndex
+from .models import CandidateVector, JobRequirement, ScoringIndexVersion, ScoringTerm
+from .vectors import MAX_TEXT_TERMS, CandidateVectorService, candidate_terms, unpack
+
+User = get_user_model()
+
+
+class CandidateVectorTest(TestCase):
+    """Test that candidate vectors and document counts follow candidate changes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+
+    def document_counts(self):
+        return dict(ScoringTerm.objects.filter(document_count__gt=0).values_list('key', 'document_count'))
+
+    def test_candidate_terms(self):
+        """Test that skill and text parts are unit length and the text part is capped"""
+        words = ' '.join(f'word{i} ' * (i % 5 + 1) for i in range(200))
+        terms = candidate_terms(['Python', 'python', 'Django'], f'Built APIs with Django. {words}')
+
+        skills = {key: weight for key, weight in terms.items() if key.startswith('skill:')}
+        text = {key: weight for key, weight in terms.items() if key.startswith('word:')}
+        self.assertEqual(set(skills), {'skill:python', 'skill:django'})
+        self.assertAlmostEqual(sum(weight ** 2 for weight in skills.values()), 1.0)
+        self.assertAlmostEqual(sum(weight ** 2 for weight in text.values()), 1.0)
+        self.assertEqual(len(text), MAX_TEXT_TERMS)
+        self.assertNotIn('word:with', text)
+        self.assertEqual(candidate_terms([], ''), {})
+
+    def test_refresh_moves_only_changed_document_counts(self):
+        """Test that re-vectorizing a candidate adjusts the counts of added and dropped terms"""
+        first = Candidate.objects.create(full_name='Jane Doe', skills=['Python', 'Django'], added_by=self.user)
+        second = Candidate.objects.create(full_name='John Smith', skills=['Python'], added_by=self.user)
+        CandidateVectorService.refresh([first, second])
+        self.assertEqual(self.document_counts(), {'skill:python': 2, 'skill:django': 1})
+
+        first.skills = ['Python', 'Kubernetes']
+        first.extracted_text = 'Kubernetes operators'
+        CandidateVectorService.refresh([first])
+        self.assertEqual(self.document_counts(), {
+            'skill:python': 2, 'skill:kubernetes': 1, 'word:kubernetes': 1, 'word:operators': 1
+        })
+
+        vector = CandidateVector.objects.get(candidate=first)
+        self.assertEqual(len(unpack(vector.terms, 'I')), len(unpack(vector.weights, 'f')))
+        self.assertEqual(vector.sequence, ScoringIndexVersion.current()[0])
+        self.assertEqual(CandidateVector.objects.count(), 2)
+
+    def test_rebuild_recounts(self):
+        """Test that the rebuild command recomputes every vector and resets drifted counts"""
+        candidate = Candidate.objects.create(full_name='Jane Doe', skills=['Python'], added_by=self.user)
+        CandidateVectorService.refresh([candidate])
+        ScoringTerm.objects.update(document_count=7)
+
+        out = StringIO()
+        call_command('rebuild_candidate_vectors', stdout=out)
+
+        self.assertIn('Vectorized 1 candidates', out.getvalue())
+        self.assertEqual(self.document_counts(), {'skill:python': 1})
+        version, rebuild_version = ScoringIndexVersion.current()
+        self.assertEqual(version, rebuild_version)
+
+    def test_edits_refresh_vector(self):
+        """Test that editing a candidate's experience through the API re-vectorizes it"""
+        candidate = Candidate.objects.create(full_name='Jane Doe', skills=['Python'], added_by=self.user)
+        self.client.force_login(self.user)
+
+        response = self.client.patch(
+            f'/api/candidates/{candidate.id}/', {'experience_years': 12}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(CandidateVector.objects.get(candidate=candidate).experience_years, 12)
+        self.assertEqual(self.document_counts(), {'skill:python': 1})
+
+        version = ScoringIndexVersion.current()
+        self.client.patch(f'/api/candidates/{candidate.id}/', {'notes': 'Strong'}, content_type='application/json')
+        self.assertEqual(ScoringIndexVersion.current(), version)
+
+    def test_created_and_imported_candidates_get_vectors(self):
+        """Test that candidates created without a CV or by import_cvs are vectorized straight away"""
+        import tempfile
+        from pathlib import Path
+
+        self.client.force_login(self.user)
+        response = self.client.post('/api/candidates/', {
+            'full_name': 'Jane Doe', 'email': 'jane@example.com', 'skills': ['Python'], 'experience_years': 4,
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(CandidateVector.objects.get(candidate_id=response.data['id']).experience_years, 4)
+
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, 'john.txt').write_text(
+                "John Smith\njohn.smith@example.com\nSkills: Django, PostgreSQL\n"
+            )
+            call_command(
+                'import_cvs', directory, '--user', self.user.email, '--workers', '1', '--no-store',
+                stdout=StringIO(), stderr=StringIO()
+            )
+        imported = Candidate.objects.get(email='john.smith@example.com')
+        self.assertTrue(CandidateVector.objects.filter(candidate=imported).exists())
+        self.assertIn('skill:django', self.document_counts())
+
+
+class JobRankingTest(APITestCase):
+    """Test job requirements and ranking candidates against them"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', email='recruiter@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        profiles = [
+            ('Backend Senior', ['Python', 'Django', 'PostgreSQL'], 8, 'Built Django REST APIs on PostgreSQL'),
+            ('Backend Junior', ['Python', 'Flask'], 1, 'Wrote Flask services in Python'),
+            ('Frontend', ['React', 'TypeScript'], 6, 'Shipped React dashboards in TypeScript'),
+        ]
+        self.candidates = {}
+        for name, skills, years, text in profiles:
+            self.candidates[name] = Candidate.objects.create(
+                full_name=name, email=f"{name.replace(' ', '.').lower()}@example.com", skills=skills,
+                experience_years=years, extracted_text=text, added_by=self.user
+            )
+        CandidateVectorService.refresh(self.candidates.values())
+
+        response = self.client.post('/api/scoring/jobs/', {
+            'title': 'Senior Django Developer', 'description': 'REST APIs on PostgreSQL',
+            'required_skills': ['Python', 'Django'], 'preferred_skills': ['PostgreSQL'], 'min_experience_years': 5,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.job = JobRequirement.objects.get(pk=response.data['id'])
+        self.rank_url = f'/api/scoring/jobs/{self.job.id}/rank/'
+
+    @skipIf(SCORING_ENGINE_AVAILABLE, "numpy and scipy are installed")
+    def test_rank_unavailable_without_numpy(self):
+        """Test that ranking reports the missing dependencies"""
+        response = self.client.get(self.rank_url)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_jobs_are_per_user(self):
+        """Test that jobs are listed only to the user who created them"""
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get('/api/scoring/jobs/').data['results'], [])
+        self.assertEqual(self.client.get(self.rank_url).status_code,
+                         status.HTTP_404_NOT_FOUND if SCORING_ENGINE_AVAILABLE else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    @skipUnless(SCORING_ENGINE_AVAILABLE, "numpy and scipy are not installed")
+    @override_settings(SCORING_INDEX_CHECK_SECONDS=0)
+    def test_rank_orders_by_fit_and_follows_reparses(self):
+        """Test that ranking prefers the best fit, stays within the user's candidates and sees re-vectorized ones"""
+        from . import views
+
+        views.matching_index = index = MatchingIndex()
+        try:
+            other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+            outsider = Candidate.objects.create(
+                full_name='Outsider', skills=['Python', 'Django', 'PostgreSQL'], experience_years=10,
+                extracted_text='Django REST APIs on PostgreSQL', added_by=other
+            )
+            CandidateVectorService.refresh([outsider])
+
+            response = self.client.get(self.rank_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names = [result['full_name'] for result in response.data['results']]
+            self.assertEqual(names, ['Backend Senior', 'Backend Junior', 'Frontend'])
+            self.assertEqual(response.data['results'][0]['matched_skills'], ['Python', 'Django', 'PostgreSQL'])
+            self.assertLessEqual(response.data['results'][0]['score'], 1.0)
+            self.assertEqual(response.data['candidates_indexed'], 4)
+
+            junior = self.candidates['Backend Junior']
+            junior.skills = ['Python', 'Django', 'PostgreSQL']
+            junior.experience_years = 9
+            junior.extracted_text = 'Built Django REST APIs on PostgreSQL for years'
+            CandidateVectorService.refresh([junior])
+            newcomer = Candidate.objects.create(full_name='Newcomer', skills=['Django'], added_by=self.user)
+            CandidateVectorService.refresh([newcomer])
+
+            response = self.client.get(self.rank_url, {'limit': 2})
+            self.assertEqual(len(index.overlay_rows), 2)
+            self.assertEqual(
+                {result['full_name'] for result in response.data['results']}, {'Backend Senior', 'Backend Junior'}
+            )
+
+            self.candidates['Frontend'].delete()
+            names = [result['full_name'] for result in self.client.get(self.rank_url, {'limit': 10}).data['results']]
+            self.assertEqual(len(names), 3)
+            self.assertNotIn('Frontend', names)
+
+            # Deleted rows outscoring live ones are discarded rather than shortening the page
+            self.candidates['Backend Senior'].delete()
+            self.candidates['Backend Junior'].delete()
+            names = [result['full_name'] for result in self.client.get(self.rank_url, {'limit': 1}).data['results']]
+            self.assertEqual(names, ['Newcomer'])
+
+            self.assertEqual(self.client.get(self.rank_url, {'limit': 0}).status_code, status.HTTP_400_BAD_REQUEST)
+        finally:
+            views.matching_index = MatchingIndex()
@@ -1,6 +1,10 @@
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
 from . import views
 
+router = DefaultRouter()
+router.register(r'jobs', views.JobRequirementViewSet, basename='jobrequirement')
+
 urlpatterns = [
-    # Scoring endpoints will be added here
+    path('', include(router.urls)),
 ]
@@ -0,0 +1,278 @@
+"""
+Sparse skill and TF-IDF term vectors of candidates and job requirements
+"""
+import logging
+import math
+import re
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple
+
+from django.db import transaction
+from django.db.models import F
+
+from candidates.models import skill_names
+
+from .models import CandidateVector, ScoringIndexVersion, ScoringTerm, bump_scoring_version
+
+logger = logging.getLogger(__name__)
+
+# Share of the score from skills, CV text and experience; a perfect match scores 1
+SKILL_WEIGHT = 0.6
+TEXT_WEIGHT = 0.25
+EXPERIENCE_WEIGHT = 0.15
+
+# Weight of a preferred skill in the job vector relative to a required one
+PREFERRED_SKILL_WEIGHT = 0.5
+
+# Most frequent CV words kept per candidate, which bounds the matrix size
+MAX_TEXT_TERMS = 64
+
+# Values per IN (...) lookup, well under SQLite's variable limit
+CHUNK_SIZE = 500
+
+# Candidate fields a vector is built from
+VECTOR_FIELDS = {'skills', 'extracted_text', 'experience_years'}
+
+SKILL_PREFIX = 'skill:'
+WORD_PREFIX = 'word:'
+
+# Keeps tokens such as c++ and c#
+WORD_PATTERN = re.compile(r'[a-z][a-z0-9+#]*')
+
+STOP_WORDS = frozenset("""
+    a an and are as at be been but by for from has have i in is it its my of on or our over that the
+    their this to was we were will with you your
+""".split())
+
+
+class JobQuery(NamedTuple):
+    """ScoringTerm id -> weight of a job, plus the experience it asks for"""
+    term_weights: Dict[int, float]
+    min_experience_years: int
+
+
+def skill_terms(skills) -> Dict[str, float]:
+    return {f'{SKILL_PREFIX}{key}': 1.0 for key in skill_names(skills)}
+
+
+def text_terms(text: str, limit: int = MAX_TEXT_TERMS) -> Dict[str, float]:
+    """Sublinear term frequencies (1 + log count) of the ``limit`` most frequent words of text"""
+    counts = Counter(
+        word[:100] for word in WORD_PATTERN.findall((text or '').lower())
+        if len(word) > 1 and word not in STOP_WORDS
+    )
+    return {f'{WORD_PREFIX}{word}': 1.0 + math.log(count) for word, count in counts.most_common(limit)}
+
+
+def normalized(weights: Dict[str, float], scale: float = 1.0) -> Dict[str, float]:
+    """weights scaled to Euclidean length ``scale``"""
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {key: weight * scale / norm for key, weight in weights.items()}
+
+
+def candidate_terms(skills, text: str) -> Dict[str, float]:
+    """
+    A candidate's unit-length skill part and unit-length text part. IDF is
+    applied on the job side only, so a vector never goes stale when other
+    candidates change the document frequencies.
+    """
+    return {**normalized(skill_terms(skills)), **normalized(text_terms(text))}
+
+
+def pack(values, typecode: str) -> bytes:
+    """Little-endian bytes of values as an array of typecode ('I' ids or 'f' weights)"""
+    packed = array(typecode, values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack(data: bytes, typecode: str) -> array:
+    values = array(typecode)
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def chunks(values, size: int = CHUNK_SIZE) -> Iterable[List]:
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def idf(document_count: int, document_total: int) -> float:
+    """Smoothed inverse document frequency, never below 1"""
+    return math.log((document_total + 1) / (document_count + 1)) + 1.0
+
+
+def rebuild_vectors(candidate_model, term_model, vector_model, version_model, batch_size: int = 1000) -> int:
+    """
+    Replace every vector and document count with ones computed from the
+    current candidates, in one transaction. Takes the model classes so the
+    initial migration can run it on its historical models. Returns the
+    number of vectors written.
+    """
+    with transaction.atomic():
+        vector_model.objects.all().delete()
+        term_model.objects.all().delete()
+        sequence = bump_scoring_version(version_model, rebuild=True)
+
+        term_ids: Dict[str, int] = {}
+        document_counts = Counter()
+        written = 0
+        batch = []
+
+        def flush():
+            new_keys = sorted({key for _candidate_id, weights, _years in batch for key in weights} - term_ids.keys())
+            for term in term_model.objects.bulk_create([term_model(key=key) for key in new_keys], batch_size=batch_size):
+                term_ids[term.key] = term.pk
+            vector_model.objects.bulk_create([
+                vector_model(
+                    candidate_id=candidate_id,
+                    terms=pack((term_ids[key] for key in weights), 'I'),
+                    weights=pack(weights.values(), 'f'),
+                    experience_years=years,
+                    sequence=sequence,
+                )
+                for candidate_id, weights, years in batch
+            ], batch_size=batch_size)
+            for _candidate_id, weights, _years in batch:
+                document_counts.update(weights.keys())
+
+        rows = candidate_model.objects.values_list('id', 'skills', 'extracted_text', 'experience_years')
+        for candidate_id, skills, text, years in rows.iterator(chunk_size=batch_size):
+            batch.append((candidate_id, candidate_terms(skills, text), years))
+            if len(batch) >= batch_size:
+                flush()
+                written += len(batch)
+                batch = []
+        if batch:
+            flush()
+            written += len(batch)
+
+        term_model.objects.bulk_update(
+            [term_model(pk=term_ids[key], key=key, document_count=count) for key, count in document_counts.items()],
+            ['document_count'], batch_size=batch_size
+        )
+    return written
+
+
+class CandidateVectorService:
+    """Keep CandidateVector and ScoringTerm in step with candidates and turn jobs into query vectors"""
+
+    @classmethod
+    def refresh(cls, candidates: Iterable) -> int:
+        """
+        Recompute the vectors of candidates, for instance after a reparse,
+        moving the document counts of only the terms that were added or
+        dropped. Matching indexes pick the new vectors up by their sequence.
+        """
+        computed = {
+            candidate.pk: (candidate_terms(candidate.skills, candidate.extracted_text), candidate.experience_years)
+            for candidate in candidates
+        }
+        if not computed:
+            return 0
+
+        with transaction.atomic():
+            sequence = ScoringIndexVersion.bump()
+
+            old_term_ids = {}
+            for ids in chunks(computed):
+                old_term_ids.update(
+                    (candidate_id, set(unpack(terms, 'I')))
+                    for candidate_id, terms in CandidateVector.objects.filter(candidate_id__in=ids)
+                    .values_list('candidate_id', 'terms')
+                )
+            key_of = {}
+            for ids in chunks(set().union(*old_term_ids.values())):
+                key_of.update(ScoringTerm.objects.filter(pk__in=ids).values_list('pk', 'key'))
+
+            new_keys = sorted({key for weights, _years in computed.values() for key in weights})
+            ScoringTerm.objects.bulk_create([ScoringTerm(key=key) for key in new_keys], ignore_conflicts=True)
+            term_ids = {}
+            for keys in chunks(new_keys):
+                term_ids.update(ScoringTerm.objects.filter(key__in=keys).values_list('key', 'pk'))
+
+            deltas = Counter()
+            for candidate_id, (weights, _years) in computed.items():
+                before = {key_of[term_id] for term_id in old_term_ids.get(candidate_id, ()) if term_id in key_of}
+                deltas.update(weights.keys() - before)
+                deltas.subtract(before - weights.keys())
+            cls._apply_document_deltas(deltas)
+
+            for ids in chunks(old_term_ids):
+                CandidateVector.objects.filter(candidate_id__in=ids).delete()
+            CandidateVector.objects.bulk_create([
+                CandidateVector(
+                    candidate_id=candidate_id,
+                    terms=pack((term_ids[key] for key in weights), 'I'),
+                    weights=pack(weights.values(), 'f'),
+                    experience_years=years,
+                    sequence=sequence,
+                )
+                for candidate_id, (weights, years) in computed.items()
+            ], batch_size=CHUNK_SIZE)
+        return len(computed)
+
+    @staticmethod
+    def _apply_document_deltas(deltas: Counter):
+        """One UPDATE per distinct delta rather than one per term"""
+        keys_by_delta = {}
+        for key, delta in deltas.items():
+            if delta:
+                keys_by_delta.setdefault(delta, []).append(key)
+        for delta, keys in keys_by_delta.items():
+            for chunk in chunks(keys):
+                ScoringTerm.objects.filter(key__in=chunk).update(document_count=F('document_count') + delta)
+
+    @classmethod
+    def rebuild(cls, batch_size: int = 1000) -> int:
+        """Recompute every candidate vector and document count from scratch"""
+        from candidates.models import Candidate
+
+        written = rebuild_vectors(Candidate, ScoringTerm, CandidateVector, ScoringIndexVersion, batch_size)
+        logger.info(f"Rebuilt {written} candidate vectors")
+        return written
+
+    @staticmethod
+    def job_query(job, document_total: int) -> JobQuery:
+        """
+        TF-IDF query vector of a job over the candidate vocabulary. Required
+        skills weigh twice as much as preferred ones, rarer skills and words
+        weigh more, and the skill and text parts are scaled to SKILL_WEIGHT
+        and TEXT_WEIGHT. Terms no candidate has still count towards the
+        norms, so nobody scores a perfect match on a job they half fit.
+        """
+        skills = {key: PREFERRED_SKILL_WEIGHT for key in skill_terms(job.preferred_skills)}
+        skills.update(skill_terms(job.required_skills))
+        skill_text = ' '.join(name for name in {
+            **skill_names(job.preferred_skills), **skill_names(job.required_skills)
+        }.values())
+        words = text_terms(f"{job.title}\n{job.description}\n{skill_text}")
+
+        terms = {}
+        for keys in chunks(list(skills) + list(words)):
+            terms.update(
+                (key, (term_id, document_count))
+                for key, term_id, document_count in ScoringTerm.objects.filter(key__in=keys)
+                .values_list('key', 'pk', 'document_count')
+            )
+
+        def weighted(weights, scale):
+            return normalized({
+                key: weight * idf(terms[key][1] if key in terms else 0, document_total)
+                for key, weight in weights.items()
+            }, scale)
+
+        term_weights = {}
+        for part in (weighted(skills, SKILL_WEIGHT), weighted(words, TEXT_WEIGHT)):
+            for key, weight in part.items():
+                if key in terms:
+                    term_weights[terms[key][0]] = weight
+        return JobQuery(term_weights, job.min_experience_years)
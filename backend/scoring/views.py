@@ -1,3 +1,96 @@
-from django.shortcuts import render
+"""
+Views for job requirements and candidate ranking
+"""
+import logging
+import time
 
-# Create your views here.
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from candidates.models import Candidate, skill_names
+
+from .engine import SCORING_ENGINE_AVAILABLE, matching_index
+from .models import JobRequirement
+from .serializers import JobRequirementSerializer
+
+logger = logging.getLogger(__name__)
+
+class JobRequirementViewSet(viewsets.ModelViewSet):
+    """ViewSet for managing job requirements and ranking candidates against them"""
+    serializer_class = JobRequirementSerializer
+    permission_classes = [IsAuthenticated]
+
+    # Most candidates returned by one ranking
+    max_rank_limit = 100
+
+    def get_queryset(self):
+        """Jobs created by the current user"""
+        return JobRequirement.objects.filter(created_by=self.request.user).select_related('created_by')
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    def ranked_candidates(self, job, limit):
+        """
+        The ranking and its candidates by id. Rows of candidates deleted
+        since the matrix was loaded are discarded from it and the job is
+        ranked again, so they never take the place of a live candidate.
+        """
+        while True:
+            ranking = matching_index.rank(job, owner_id=self.request.user.pk, limit=limit)
+            candidates = Candidate.objects.filter(added_by=self.request.user).only(
+                'id', 'full_name', 'first_name', 'last_name', 'email', 'status', 'skills', 'experience_years'
+            ).in_bulk([candidate_id for candidate_id, _score in ranking])
+            deleted = [candidate_id for candidate_id, _score in ranking if candidate_id not in candidates]
+            if not deleted:
+                return ranking, candidates
+            matching_index.discard(deleted)
+
+    @action(detail=True, methods=['get'])
+    def rank(self, request, pk=None):
+        """The current user's candidates that best match this job, best first"""
+        if not SCORING_ENGINE_AVAILABLE:
+            return Response(
+                {'error': 'Candidate ranking is not available. Install numpy and scipy.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        job = self.get_object()
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.max_rank_limit:
+            return Response(
+                {'error': f'limit must be between 1 and {self.max_rank_limit}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        start = time.perf_counter()
+        ranking, candidates = self.ranked_candidates(job, limit)
+        duration_ms = int((time.perf_counter() - start) * 1000)
+
+        job_skills = {**skill_names(job.preferred_skills), **skill_names(job.required_skills)}
+
+        results = []
+        for candidate_id, score in ranking:
+            candidate = candidates[candidate_id]
+            results.append({
+                'candidate_id': str(candidate.id),
+                'full_name': candidate.display_name,
+                'email': candidate.email,
+                'status': candidate.status,
+                'experience_years': candidate.experience_years,
+                'score': score,
+                'matched_skills': [job_skills[key] for key in skill_names(candidate.skills) if key in job_skills],
+            })
+
+        logger.info(f"Ranked {matching_index.size} candidates for job {job.id} in {duration_ms}ms")
+        return Response({
+            'job_id': str(job.id),
+            'candidates_indexed': matching_index.size,
+            'duration_ms': duration_ms,
+            'results': results,
+        })